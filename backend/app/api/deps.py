@@ -1,10 +1,11 @@
 """API dependencies for authentication and database sessions."""
 
+from dataclasses import dataclass
 from typing import Optional
-from fastapi import Depends, HTTPException, status, Query
+from fastapi import Depends, HTTPException, status, Query, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
-from app.core.database import get_db
+from app.core.database import get_db, get_readonly_db
 from app.core.security import AuthService
 from app.models.user import User
 from app.services.user_service import UserService
@@ -26,6 +27,7 @@ security = HTTPBearer()
 
 
 def get_current_user(
+    request: Request,
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
 ) -> User:
@@ -60,6 +62,9 @@ def get_current_user(
                 detail="Inactive user"
             )
         
+        # Keep the verified claims around so handlers don't decode the token again
+        request.state.jwt_payload = payload
+        
         return user
         
     except ValueError:
@@ -80,11 +85,31 @@ def get_current_active_user(
     return current_user
 
 
+@dataclass(slots=True)
+class Pagination:
+    """Offset pagination parameters for list endpoints."""
+    skip: int
+    limit: int
+
+
+def get_pagination(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=100)
+) -> Pagination:
+    """Get pagination parameters from the query string."""
+    return Pagination(skip, limit)
+
+
 def get_user_service(db: Session = Depends(get_db)) -> UserService:
     """Get user service instance."""
     return UserService(db)
 
 
+def get_readonly_user_service(db: Session = Depends(get_readonly_db)) -> UserService:
+    """Get user service instance bound to a read-only session."""
+    return UserService(db)
+
+
 def get_resume_service(db: Session = Depends(get_db), storage_service: StorageService = Depends(get_storage)):
     """Get resume service instance."""
     from app.services.resume_service import ResumeService
@@ -141,24 +166,27 @@ def get_current_user_from_token(
 
 
 def get_user_from_token_or_header(
-    request,
+    request: Request,
     token: Optional[str] = Query(None),
     db: Session = Depends(get_db)
 ) -> User:
     """Get user from token query parameter or authorization header."""
-    from fastapi import Request
+    user = getattr(request.state, "user", None)
+    if user is not None:
+        return user
     
-    # First check for token in query parameter
-    if token:
-        return get_current_user_from_token(token, db)
+    # The query parameter wins (browser previews can't set headers), then the header
+    if not token:
+        authorization = request.headers.get("authorization")
+        if authorization and authorization.startswith("Bearer "):
+            token = authorization[7:]
     
-    # Then check authorization header
-    authorization = request.headers.get("authorization")
-    if authorization and authorization.startswith("Bearer "):
-        token_from_header = authorization.split(" ")[1]
-        return get_current_user_from_token(token_from_header, db)
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Authentication required"
+        )
     
-    raise HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Authentication required"
-    )
+    user = get_current_user_from_token(token, db)
+    request.state.user = user
+    return user
@@ -2,7 +2,10 @@
 
 import logging
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.models.user import User
@@ -11,12 +14,16 @@ from app.schemas.application import (
     ApplicationListResponse, ApplicationStats
 )
 from app.services.application_service import ApplicationService
-from app.api.deps import get_current_active_user, get_application_service, get_pdf_service
+from app.services.resume_service import ResumeService
+from app.api.deps import get_current_active_user, get_application_service, get_resume_service, get_pdf_service
 from app.core.exceptions import ApplicationNotFoundError, ValidationError, UnauthorizedError
 
 
 logger = logging.getLogger(__name__)
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Built once so list endpoints validate whole pages in a single pydantic-core call
+_APPLICATION_LIST_ADAPTER = TypeAdapter(List[ApplicationResponse])
 
 
 @router.post("", response_model=ApplicationResponse, status_code=status.HTTP_201_CREATED)
@@ -27,19 +34,21 @@ async def create_application(
 ):
     """Create a new job application."""
     try:
-        application = application_service.create_application(
+        # Resume and cover letter customizations are awaited together, not one after the other
+        application = await application_service.acreate_application(
             user_id=current_user.id,
             application_data=application_create
         )
-        return ApplicationResponse.from_orm(application)
+        # Validation may lazy-load the cover letter version, so keep it off the event loop
+        return await run_in_threadpool(ApplicationResponse.model_validate, application)
         
     except ValidationError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
-    except Exception as e:
-        logger.error(f"Failed to create application for user {current_user.id}: {e}")
+    except Exception:
+        logger.exception("Failed to create application for user %s", current_user.id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create application"
@@ -47,31 +56,36 @@ async def create_application(
 
 
 @router.get("", response_model=ApplicationListResponse)
-async def list_applications(
+def list_applications(
     status_filter: Optional[str] = Query(None, alias="status", description="Filter by status"),
     page: int = Query(1, ge=1, description="Page number"),
     per_page: int = Query(20, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; overrides page"),
     current_user: User = Depends(get_current_active_user),
     application_service: ApplicationService = Depends(get_application_service)
 ):
     """List all applications for the current user with pagination."""
     try:
-        applications, total = application_service.list_user_applications(
+        applications, total, next_cursor = application_service.list_user_applications(
             user_id=current_user.id,
             status=status_filter,
             page=page,
-            per_page=per_page
+            per_page=per_page,
+            cursor=cursor
         )
         
         return ApplicationListResponse(
-            applications=[ApplicationResponse.from_orm(app) for app in applications],
+            applications=_APPLICATION_LIST_ADAPTER.validate_python(applications, from_attributes=True),
             total=total,
             page=page,
-            per_page=per_page
+            per_page=per_page,
+            next_cursor=next_cursor
         )
         
-    except Exception as e:
-        logger.error(f"Failed to list applications for user {current_user.id}: {e}")
+    except ValidationError:
+        raise
+    except Exception:
+        logger.exception("Failed to list applications for user %s", current_user.id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to list applications"
@@ -79,7 +93,7 @@ async def list_applications(
 
 
 @router.get("/stats", response_model=ApplicationStats)
-async def get_application_stats(
+def get_application_stats(
     current_user: User = Depends(get_current_active_user),
     application_service: ApplicationService = Depends(get_application_service)
 ):
@@ -88,8 +102,8 @@ async def get_application_stats(
         stats = application_service.get_application_stats(current_user.id)
         return stats
         
-    except Exception as e:
-        logger.error(f"Failed to get application stats for user {current_user.id}: {e}")
+    except Exception:
+        logger.exception("Failed to get application stats for user %s", current_user.id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to get application statistics"
@@ -97,7 +111,7 @@ async def get_application_stats(
 
 
 @router.get("/search", response_model=ApplicationListResponse)
-async def search_applications(
+def search_applications(
     q: str = Query(..., description="Search query for company or position"),
     page: int = Query(1, ge=1, description="Page number"),
     per_page: int = Query(20, ge=1, le=100, description="Items per page"),
@@ -114,14 +128,14 @@ async def search_applications(
         )
         
         return ApplicationListResponse(
-            applications=[ApplicationResponse.from_orm(app) for app in applications],
+            applications=_APPLICATION_LIST_ADAPTER.validate_python(applications, from_attributes=True),
             total=total,
             page=page,
             per_page=per_page
         )
         
-    except Exception as e:
-        logger.error(f"Failed to search applications for user {current_user.id}: {e}")
+    except Exception:
+        logger.exception("Failed to search applications for user %s", current_user.id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to search applications"
@@ -129,7 +143,7 @@ async def search_applications(
 
 
 @router.get("/recent", response_model=List[ApplicationResponse])
-async def get_recent_applications(
+def get_recent_applications(
     limit: int = Query(10, ge=1, le=50, description="Number of recent applications"),
     current_user: User = Depends(get_current_active_user),
     application_service: ApplicationService = Depends(get_application_service)
@@ -141,10 +155,10 @@ async def get_recent_applications(
             limit=limit
         )
         
-        return [ApplicationResponse.from_orm(app) for app in applications]
+        return _APPLICATION_LIST_ADAPTER.validate_python(applications, from_attributes=True)
         
-    except Exception as e:
-        logger.error(f"Failed to get recent applications for user {current_user.id}: {e}")
+    except Exception:
+        logger.exception("Failed to get recent applications for user %s", current_user.id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to get recent applications"
@@ -152,7 +166,7 @@ async def get_recent_applications(
 
 
 @router.get("/company/{company}", response_model=List[ApplicationResponse])
-async def get_applications_by_company(
+def get_applications_by_company(
     company: str,
     current_user: User = Depends(get_current_active_user),
     application_service: ApplicationService = Depends(get_application_service)
@@ -164,10 +178,10 @@ async def get_applications_by_company(
             company=company
         )
         
-        return [ApplicationResponse.from_orm(app) for app in applications]
+        return _APPLICATION_LIST_ADAPTER.validate_python(applications, from_attributes=True)
         
-    except Exception as e:
-        logger.error(f"Failed to get applications for company {company}: {e}")
+    except Exception:
+        logger.exception("Failed to get applications for company %s", company)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to get applications for company"
@@ -175,7 +189,7 @@ async def get_applications_by_company(
 
 
 @router.get("/{application_id}", response_model=ApplicationResponse)
-async def get_application(
+def get_application(
     application_id: int,
     current_user: User = Depends(get_current_active_user),
     application_service: ApplicationService = Depends(get_application_service)
@@ -186,15 +200,15 @@ async def get_application(
             user_id=current_user.id,
             application_id=application_id
         )
-        return ApplicationResponse.from_orm(application)
+        return ApplicationResponse.model_validate(application)
         
     except ApplicationNotFoundError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e)
         )
-    except Exception as e:
-        logger.error(f"Failed to get application {application_id}: {e}")
+    except Exception:
+        logger.exception("Failed to get application %s", application_id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to get application"
@@ -202,7 +216,7 @@ async def get_application(
 
 
 @router.put("/{application_id}", response_model=ApplicationResponse)
-async def update_application(
+def update_application(
     application_id: int,
     application_update: ApplicationUpdate,
     current_user: User = Depends(get_current_active_user),
@@ -222,7 +236,7 @@ async def update_application(
                 detail="Application not found"
             )
         
-        return ApplicationResponse.from_orm(application)
+        return ApplicationResponse.model_validate(application)
         
     except ApplicationNotFoundError as e:
         raise HTTPException(
@@ -234,8 +248,8 @@ async def update_application(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
-    except Exception as e:
-        logger.error(f"Failed to update application {application_id}: {e}")
+    except Exception:
+        logger.exception("Failed to update application %s", application_id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to update application"
@@ -243,7 +257,7 @@ async def update_application(
 
 
 @router.patch("/{application_id}/status")
-async def update_application_status(
+def update_application_status(
     application_id: int,
     status_update: dict,  # Should contain 'status' field
     current_user: User = Depends(get_current_active_user),
@@ -275,8 +289,8 @@ async def update_application_status(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
-    except Exception as e:
-        logger.error(f"Failed to update application status {application_id}: {e}")
+    except Exception:
+        logger.exception("Failed to update application status %s", application_id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to update application status"
@@ -284,7 +298,7 @@ async def update_application_status(
 
 
 @router.get("/{application_id}/deletion-preview")
-async def get_application_deletion_preview(
+def get_application_deletion_preview(
     application_id: int,
     current_user: User = Depends(get_current_active_user),
     application_service: ApplicationService = Depends(get_application_service)
@@ -311,8 +325,8 @@ async def get_application_deletion_preview(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
-    except Exception as e:
-        logger.error(f"Failed to get deletion preview: {e}")
+    except Exception:
+        logger.exception("Failed to get deletion preview")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to get deletion preview"
@@ -320,7 +334,7 @@ async def get_application_deletion_preview(
 
 
 @router.delete("/{application_id}")
-async def delete_application(
+def delete_application(
     application_id: int,
     dry_run: bool = Query(False, description="Preview deletion without executing"),
     current_user: User = Depends(get_current_active_user),
@@ -372,8 +386,8 @@ async def delete_application(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
-    except Exception as e:
-        logger.error(f"Failed to delete application {application_id}: {e}")
+    except Exception:
+        logger.exception("Failed to delete application %s", application_id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to delete application"
@@ -381,16 +395,16 @@ async def delete_application(
 
 
 @router.get("/{application_id}/resume/download")
-async def download_application_resume(
+def download_application_resume(
     application_id: int,
     template: str = Query("modern", description="PDF template to use"),
     current_user: User = Depends(get_current_active_user),
     application_service: ApplicationService = Depends(get_application_service),
+    resume_service: ResumeService = Depends(get_resume_service),
     pdf_service: 'PDFService' = Depends(get_pdf_service)
 ):
     from app.services.pdf_service import PDFService
     """Download the resume used for a specific application as PDF."""
-    from app.services.resume_service import ResumeService
     from app.services.pdf_service import pdf_service
     from fastapi.responses import StreamingResponse
     import io
@@ -402,8 +416,6 @@ async def download_application_resume(
             application_id=application_id
         )
         
-        resume_service = ResumeService()
-        
         # Determine which version to download (customized if available, otherwise original)
         version_id = application.customized_resume_version_id or application.resume_version_id
         
@@ -442,8 +454,8 @@ async def download_application_resume(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e)
         )
-    except Exception as e:
-        logger.error(f"Failed to download resume for application {application_id}: {e}")
+    except Exception:
+        logger.exception("Failed to download resume for application %s", application_id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to download resume"
@@ -464,8 +476,8 @@ async def get_status_options():
         
         return {"statuses": statuses}
         
-    except Exception as e:
-        logger.error(f"Failed to get status options: {e}")
+    except Exception:
+        logger.exception("Failed to get status options")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to get status options"
@@ -474,7 +486,7 @@ async def get_status_options():
 
 # Bulk operations
 @router.post("/bulk/status")
-async def bulk_update_status(
+def bulk_update_status(
     request: dict,  # Should contain 'application_ids' and 'status'
     current_user: User = Depends(get_current_active_user),
     application_service: ApplicationService = Depends(get_application_service)
@@ -520,8 +532,8 @@ async def bulk_update_status(
         
     except HTTPException:
         raise
-    except Exception as e:
-        logger.error(f"Failed to bulk update application status: {e}")
+    except Exception:
+        logger.exception("Failed to bulk update application status")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to bulk update application status"
@@ -529,7 +541,7 @@ async def bulk_update_status(
 
 
 @router.delete("/bulk")
-async def bulk_delete_applications(
+def bulk_delete_applications(
     request: dict,  # Should contain 'application_ids' and optional 'dry_run'
     current_user: User = Depends(get_current_active_user),
     application_service: ApplicationService = Depends(get_application_service)
@@ -576,15 +588,15 @@ async def bulk_delete_applications(
         
     except HTTPException:
         raise
-    except Exception as e:
-        logger.error(f"Failed to bulk delete applications: {e}")
+    except Exception:
+        logger.exception("Failed to bulk delete applications")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to bulk delete applications"
         )
 
 @router.get("/{application_id}/cover-letter/download")
-async def download_application_cover_letter(
+def download_application_cover_letter(
     application_id: int,
     template: str = Query("modern", description="PDF template to use"),
     current_user: User = Depends(get_current_active_user),
@@ -653,7 +665,7 @@ async def download_application_cover_letter(
 
 
 @router.post("/{application_id}/cover-letter", response_model=ApplicationResponse)
-async def attach_cover_letter(
+def attach_cover_letter(
     application_id: int,
     cover_letter_version_id: int,
     current_user: User = Depends(get_current_active_user),
@@ -666,34 +678,37 @@ async def attach_cover_letter(
             application_id=application_id,
             cover_letter_version_id=cover_letter_version_id
         )
-        return ApplicationResponse.from_orm(application)
+        return ApplicationResponse.model_validate(application)
     except (ApplicationNotFoundError, ValidationError) as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
-    except Exception as e:
-        logger.error(f"Failed to attach cover letter to application {application_id}: {e}")
+    except Exception:
+        logger.exception("Failed to attach cover letter to application %s", application_id)
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to attach cover letter")
 
 @router.put("/{application_id}/cover-letter", response_model=ApplicationResponse)
-async def customize_cover_letter(
+def customize_cover_letter(
     application_id: int,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_active_user),
     application_service: ApplicationService = Depends(get_application_service)
 ):
     """Customize the cover letter for an application."""
     try:
+        # The storage copy of the new version is written after the response is sent
         application = application_service.customize_cover_letter_for_application(
             user_id=current_user.id,
-            application_id=application_id
+            application_id=application_id,
+            background_tasks=background_tasks
         )
-        return ApplicationResponse.from_orm(application)
+        return ApplicationResponse.model_validate(application)
     except (ApplicationNotFoundError, ValidationError) as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
-    except Exception as e:
-        logger.error(f"Failed to customize cover letter for application {application_id}: {e}")
+    except Exception:
+        logger.exception("Failed to customize cover letter for application %s", application_id)
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to customize cover letter")
 
 @router.delete("/{application_id}/cover-letter", response_model=ApplicationResponse)
-async def remove_cover_letter(
+def remove_cover_letter(
     application_id: int,
     current_user: User = Depends(get_current_active_user),
     application_service: ApplicationService = Depends(get_application_service)
@@ -704,9 +719,9 @@ async def remove_cover_letter(
             user_id=current_user.id,
             application_id=application_id
         )
-        return ApplicationResponse.from_orm(application)
+        return ApplicationResponse.model_validate(application)
     except ApplicationNotFoundError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
-    except Exception as e:
-        logger.error(f"Failed to remove cover letter from application {application_id}: {e}")
+    except Exception:
+        logger.exception("Failed to remove cover letter from application %s", application_id)
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to remove cover letter")
\ No newline at end of file
@@ -2,15 +2,17 @@
 
 import logging
 from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi.security import HTTPAuthorizationCredentials
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from app.core.database import get_db
-from app.core.security import AuthService, audit_logger, FileValidator, rate_limiter
+from app.core.security import AuthService, audit_logger, FileValidator, rate_limiter, token_blacklist
 from app.core.middleware import get_client_ip, rate_limit_dependency
-from app.schemas.user import UserCreate, UserLogin, Token, UserResponse, RefreshTokenRequest
+from app.schemas.user import UserCreate, UserLogin, Token, RefreshTokenRequest, user_to_response
 from app.services.user_service import UserService
-from app.core.exceptions import ValidationError
+from app.core.exceptions import RateLimitError, ValidationError
 from app.models.user import User
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user, security
 from app.config.settings import settings
 
 
@@ -18,6 +20,17 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
+def _token_response(tokens: dict, user: User) -> Token:
+    """Build the auth response, serializing the user exactly once."""
+    return Token.model_construct(
+        access_token=tokens["access_token"],
+        refresh_token=tokens["refresh_token"],
+        token_type="bearer",
+        expires_in=tokens["expires_in"],
+        user=user_to_response(user)
+    )
+
+
 @router.post("/register", response_model=Token, status_code=status.HTTP_201_CREATED)
 async def register(
     user_create: UserCreate,
@@ -32,15 +45,13 @@ async def register(
         # Additional rate limiting for registration
         reg_key = f"register:{client_ip}"
         if not rate_limiter.is_allowed(reg_key, 3, 3600):  # 3 registrations per hour
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail="Registration rate limit exceeded"
-            )
+            raise RateLimitError("Registration rate limit exceeded")
         
         user_service = UserService(db)
         
         # Create user
-        user = user_service.create_user(
+        user = await run_in_threadpool(
+            user_service.create_user,
             username=user_create.username,
             email=user_create.email,
             password=user_create.password
@@ -58,13 +69,7 @@ async def register(
             f"New user registered: {user_create.username}"
         )
         
-        return Token(
-            access_token=tokens["access_token"],
-            refresh_token=tokens["refresh_token"],
-            token_type="bearer",
-            expires_in=tokens["expires_in"],
-            user=UserResponse.from_orm(user)
-        )
+        return _token_response(tokens, user)
         
     except ValidationError as e:
         audit_logger.log_auth_attempt(user_create.username, False, client_ip)
@@ -72,8 +77,10 @@ async def register(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
-    except Exception as e:
-        logger.error(f"Registration failed: {e}")
+    except RateLimitError:
+        raise
+    except Exception:
+        logger.exception("Registration failed")
         audit_logger.log_auth_attempt(user_create.username, False, client_ip)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -91,11 +98,21 @@ async def login(
     """Login user and return JWT token pair with audit logging."""
     client_ip = get_client_ip(request)
     
+    # Reject malformed passwords before spending a hash verification on them
+    if not AuthService.is_password_well_formed(user_login.password):
+        audit_logger.log_auth_attempt(user_login.email, False, client_ip)
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid email or password",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
     try:
         user_service = UserService(db)
         
         # Authenticate user
-        user = user_service.authenticate_user(
+        user = await run_in_threadpool(
+            user_service.authenticate_user,
             email=user_login.email,
             password=user_login.password
         )
@@ -115,18 +132,12 @@ async def login(
         # Log successful login
         audit_logger.log_auth_attempt(user.username, True, client_ip)
         
-        return Token(
-            access_token=tokens["access_token"],
-            refresh_token=tokens["refresh_token"],
-            token_type="bearer",
-            expires_in=tokens["expires_in"],
-            user=UserResponse.from_orm(user)
-        )
+        return _token_response(tokens, user)
         
     except HTTPException:
         raise
-    except Exception as e:
-        logger.error(f"Login failed for user {user_login.email}: {e}")
+    except Exception:
+        logger.exception("Login failed for user %s", user_login.email)
         audit_logger.log_auth_attempt(user_login.email, False, client_ip)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -146,7 +157,9 @@ async def refresh_token(
     
     try:
         # Refresh the access token
-        new_tokens = AuthService.refresh_access_token(refresh_request.refresh_token, db)
+        new_tokens = await run_in_threadpool(
+            AuthService.refresh_access_token, refresh_request.refresh_token, db
+        )
         
         if not new_tokens:
             audit_logger.log_sensitive_operation(
@@ -171,8 +184,8 @@ async def refresh_token(
         
     except HTTPException:
         raise
-    except Exception as e:
-        logger.error(f"Token refresh failed: {e}")
+    except Exception:
+        logger.exception("Token refresh failed")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Token refresh failed"
@@ -180,31 +193,32 @@ async def refresh_token(
 
 
 @router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
-async def logout(
+def logout(
     request: Request,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    credentials: HTTPAuthorizationCredentials = Depends(security)
 ):
     """Logout user and revoke tokens."""
     client_ip = get_client_ip(request)
     
     try:
-        # Extract token from authorization header
-        authorization = request.headers.get("authorization")
-        if authorization and authorization.startswith("Bearer "):
-            token = authorization.split(" ")[1]
-            
-            # Revoke the token
-            AuthService.revoke_token(token)
-            
-            # Log logout
-            audit_logger.log_sensitive_operation(
-                current_user.id, 
-                "user_logout", 
-                f"User logged out from {client_ip}"
-            )
+        # Revoke the token using the claims verified by the auth dependency
+        payload = request.state.jwt_payload
+        if payload.get("jti"):
+            AuthService.revoke_token_by_jti(payload["jti"], payload["exp"])
+        else:
+            # Tokens issued before jti claims are revoked by their raw value
+            token_blacklist.add_token(credentials.credentials, payload["exp"])
+        
+        # Log logout
+        audit_logger.log_sensitive_operation(
+            current_user.id, 
+            "user_logout", 
+            f"User logged out from {client_ip}"
+        )
         
-    except Exception as e:
-        logger.error(f"Logout failed: {e}")
+    except Exception:
+        logger.exception("Logout failed")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Logout failed"
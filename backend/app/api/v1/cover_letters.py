@@ -1,13 +1,19 @@
 """Cover letter management API endpoints - Refactored to match Resume pattern."""
 
 import logging
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+import threading
+import orjson
+from typing import Iterator, List, Optional, Tuple
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from pydantic import TypeAdapter
+from cachetools import TTLCache
 from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.models.user import User
 from app.schemas.cover_letter import (
-    CoverLetterCreate, CoverLetterUpdate, CoverLetterResponse, 
+    CoverLetterCreate, CoverLetterUpdate, CoverLetterResponse, CoverLetterSummaryResponse,
     CoverLetterTemplateResponse, CoverLetterGenerateRequest, 
     CoverLetterVersionResponse, CoverLetterVersionCreate,
     CoverLetterListResponse, CoverLetterDetailResponse,
@@ -15,18 +21,30 @@ from app.schemas.cover_letter import (
 )
 from app.services.cover_letter_service import CoverLetterService
 from app.services.resume_service import ResumeService
-from app.api.deps import get_current_active_user, get_pdf_service
+from app.api.deps import get_current_active_user, get_pdf_service, get_pagination, Pagination
 from app.services.pdf_service import PDFService
 from app.core.exceptions import ValidationError, CoverLetterNotFoundError, ResumeNotFoundError
 
 
 logger = logging.getLogger(__name__)
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
+# Built once so list endpoints validate whole pages in a single pydantic-core call
+_TEMPLATE_LIST_ADAPTER = TypeAdapter(List[CoverLetterTemplateResponse])
+_CL_LIST_ADAPTER = TypeAdapter(List[CoverLetterSummaryResponse])
+_CL_VERSION_LIST_ADAPTER = TypeAdapter(List[CoverLetterVersionResponse])
 
-def get_cover_letter_service(db: Session = Depends(get_db)) -> CoverLetterService:
+# Serialized template pages keyed by (etag, skip, limit); a new ETag makes old entries unreachable
+_templates_body_cache: TTLCache = TTLCache(maxsize=64, ttl=300)
+_templates_body_lock = threading.Lock()
+
+
+def get_cover_letter_service(
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db)
+) -> CoverLetterService:
     """Dependency for cover letter service."""
-    return CoverLetterService(db)
+    return CoverLetterService(db, background_tasks=background_tasks)
 
 
 def get_resume_service_dep(db: Session = Depends(get_db)) -> ResumeService:
@@ -34,22 +52,59 @@ def get_resume_service_dep(db: Session = Depends(get_db)) -> ResumeService:
     return ResumeService(db)
 
 
+def cl_context(
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+) -> Tuple[User, CoverLetterService, ResumeService]:
+    """Resolve the user and both services for generation endpoints in one dependency."""
+    return current_user, CoverLetterService(db, background_tasks=background_tasks), ResumeService(db)
+
+
+def _sse_event(event: str, data) -> bytes:
+    """Encode one Server-Sent Events frame with a JSON payload."""
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """Check whether the request's If-None-Match header covers the given ETag."""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    return if_none_match.strip() == "*" or etag in (tag.strip() for tag in if_none_match.split(","))
+
+
 # ======================================
 # Template Endpoints
 # ======================================
 
-@router.get("/templates", response_model=List[CoverLetterTemplateResponse])
-async def list_templates(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(10, ge=1, le=100),
+@router.get("/templates", response_model=None,
+            responses={200: {"model": List[CoverLetterTemplateResponse]}})
+def list_templates(
+    request: Request,
+    pagination: Pagination = Depends(get_pagination),
     cover_letter_service: CoverLetterService = Depends(get_cover_letter_service)
 ):
     """Get all available cover letter templates."""
     try:
-        templates, _ = cover_letter_service.list_templates(skip, limit)
-        return [CoverLetterTemplateResponse.from_orm(t) for t in templates]
-    except Exception as e:
-        logger.error(f"Failed to list templates: {e}")
+        etag = cover_letter_service.get_templates_etag()
+        if _etag_matches(request, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        
+        key = (etag, pagination.skip, pagination.limit)
+        with _templates_body_lock:
+            body = _templates_body_cache.get(key)
+        if body is None:
+            templates, _ = cover_letter_service.list_templates(pagination.skip, pagination.limit)
+            items = _TEMPLATE_LIST_ADAPTER.validate_python(templates, from_attributes=True)
+            body = _TEMPLATE_LIST_ADAPTER.dump_json(items)
+            # list_templates returns an empty page on errors, so only real pages are kept
+            if templates:
+                with _templates_body_lock:
+                    _templates_body_cache[key] = body
+        return Response(content=body, media_type="application/json", headers={"ETag": etag})
+    except Exception:
+        logger.exception("Failed to list templates")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to list templates"
@@ -57,18 +112,25 @@ async def list_templates(
 
 
 @router.get("/templates/{template_id}", response_model=CoverLetterTemplateResponse)
-async def get_template(
+def get_template(
     template_id: int,
+    request: Request,
+    response: Response,
     cover_letter_service: CoverLetterService = Depends(get_cover_letter_service)
 ):
     """Get a specific cover letter template."""
     try:
+        etag = cover_letter_service.get_templates_etag()
+        if _etag_matches(request, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        
         template = cover_letter_service.get_template(template_id)
+        response.headers["ETag"] = etag
         return CoverLetterTemplateResponse.from_orm(template)
     except ValidationError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
-    except Exception as e:
-        logger.error(f"Failed to get template {template_id}: {e}")
+    except Exception:
+        logger.exception("Failed to get template %s", template_id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to get template"
@@ -80,7 +142,7 @@ async def get_template(
 # ======================================
 
 @router.post("", response_model=CoverLetterDetailResponse, status_code=status.HTTP_201_CREATED)
-async def create_cover_letter(
+def create_cover_letter(
     request: CoverLetterCreate,
     current_user: User = Depends(get_current_active_user),
     service: CoverLetterService = Depends(get_cover_letter_service)
@@ -96,29 +158,31 @@ async def create_cover_letter(
         versions = service.list_versions(current_user.id, cover_letter.id)
         
         response = CoverLetterDetailResponse.from_orm(cover_letter)
-        response.versions = [CoverLetterVersionResponse.from_orm(v) for v in versions]
+        response.versions = _CL_VERSION_LIST_ADAPTER.validate_python(versions, from_attributes=True)
         return response
     except ValidationError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
-    except Exception as e:
-        logger.error(f"Failed to create cover letter: {e}")
+    except Exception:
+        logger.exception("Failed to create cover letter")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create cover letter"
         )
 
 
-@router.get("", response_model=List[CoverLetterResponse])
-async def list_cover_letters(
+@router.get("", response_model=None,
+            responses={200: {"model": List[CoverLetterSummaryResponse]}})
+def list_cover_letters(
     current_user: User = Depends(get_current_active_user),
     service: CoverLetterService = Depends(get_cover_letter_service)
 ):
     """List all cover letters for the current user."""
     try:
-        cover_letters = service.list_user_cover_letters(current_user.id)
-        return [CoverLetterResponse.from_orm(cl) for cl in cover_letters]
-    except Exception as e:
-        logger.error(f"Failed to list cover letters for user {current_user.id}: {e}")
+        rows = service.list_user_cover_letters_summary(current_user.id)
+        items = _CL_LIST_ADAPTER.validate_python(rows, from_attributes=True)
+        return ORJSONResponse(_CL_LIST_ADAPTER.dump_python(items, mode="json"))
+    except Exception:
+        logger.exception("Failed to list cover letters for user %s", current_user.id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to list cover letters"
@@ -126,25 +190,24 @@ async def list_cover_letters(
 
 
 @router.get("/{cover_letter_id}", response_model=CoverLetterDetailResponse)
-async def get_cover_letter(
+def get_cover_letter(
     cover_letter_id: int,
     current_user: User = Depends(get_current_active_user),
     service: CoverLetterService = Depends(get_cover_letter_service)
 ):
     """Get a specific cover letter with all its versions."""
     try:
-        cover_letter = service.get_cover_letter(current_user.id, cover_letter_id)
-        versions = service.list_versions(current_user.id, cover_letter_id)
+        cover_letter, versions = service.get_cover_letter_with_versions(current_user.id, cover_letter_id)
         
         response = CoverLetterDetailResponse.from_orm(cover_letter)
-        response.versions = [CoverLetterVersionResponse.from_orm(v) for v in versions]
+        response.versions = _CL_VERSION_LIST_ADAPTER.validate_python(versions, from_attributes=True)
         return response
     except CoverLetterNotFoundError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e.detail))
     except ValidationError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
-    except Exception as e:
-        logger.error(f"Failed to get cover letter {cover_letter_id}: {e}")
+    except Exception:
+        logger.exception("Failed to get cover letter %s", cover_letter_id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to get cover letter"
@@ -152,7 +215,7 @@ async def get_cover_letter(
 
 
 @router.put("/{cover_letter_id}", response_model=CoverLetterResponse)
-async def update_cover_letter(
+def update_cover_letter(
     cover_letter_id: int,
     request: CoverLetterUpdate,
     current_user: User = Depends(get_current_active_user),
@@ -171,8 +234,8 @@ async def update_cover_letter(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e.detail))
     except ValidationError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
-    except Exception as e:
-        logger.error(f"Failed to update cover letter {cover_letter_id}: {e}")
+    except Exception:
+        logger.exception("Failed to update cover letter %s", cover_letter_id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to update cover letter"
@@ -180,7 +243,7 @@ async def update_cover_letter(
 
 
 @router.delete("/{cover_letter_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_cover_letter(
+def delete_cover_letter(
     cover_letter_id: int,
     current_user: User = Depends(get_current_active_user),
     service: CoverLetterService = Depends(get_cover_letter_service)
@@ -195,8 +258,8 @@ async def delete_cover_letter(
             status_code=status.HTTP_409_CONFLICT,
             detail=str(e)
         )
-    except Exception as e:
-        logger.error(f"Failed to delete cover letter {cover_letter_id}: {e}")
+    except Exception:
+        logger.exception("Failed to delete cover letter %s", cover_letter_id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to delete cover letter"
@@ -209,7 +272,7 @@ async def delete_cover_letter(
 
 @router.post("/{cover_letter_id}/versions", response_model=CoverLetterVersionResponse, 
             status_code=status.HTTP_201_CREATED)
-async def create_version(
+def create_version(
     cover_letter_id: int,
     request: CoverLetterVersionCreate,
     current_user: User = Depends(get_current_active_user),
@@ -227,8 +290,8 @@ async def create_version(
         return CoverLetterVersionResponse.from_orm(version)
     except ValidationError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
-    except Exception as e:
-        logger.error(f"Failed to create version: {e}")
+    except Exception:
+        logger.exception("Failed to create version")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create version"
@@ -236,7 +299,7 @@ async def create_version(
 
 
 @router.get("/{cover_letter_id}/versions", response_model=List[CoverLetterVersionResponse])
-async def list_versions(
+def list_versions(
     cover_letter_id: int,
     current_user: User = Depends(get_current_active_user),
     service: CoverLetterService = Depends(get_cover_letter_service)
@@ -244,11 +307,11 @@ async def list_versions(
     """List all versions for a cover letter."""
     try:
         versions = service.list_versions(current_user.id, cover_letter_id)
-        return [CoverLetterVersionResponse.from_orm(v) for v in versions]
+        return _CL_VERSION_LIST_ADAPTER.validate_python(versions, from_attributes=True)
     except ValidationError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
-    except Exception as e:
-        logger.error(f"Failed to list versions: {e}")
+    except Exception:
+        logger.exception("Failed to list versions")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to list versions"
@@ -256,7 +319,7 @@ async def list_versions(
 
 
 @router.get("/{cover_letter_id}/versions/{version_id}", response_model=CoverLetterVersionResponse)
-async def get_version(
+def get_version(
     cover_letter_id: int,
     version_id: int,
     current_user: User = Depends(get_current_active_user),
@@ -270,8 +333,8 @@ async def get_version(
         return CoverLetterVersionResponse.from_orm(version)
     except ValidationError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
-    except Exception as e:
-        logger.error(f"Failed to get version {version_id}: {e}")
+    except Exception:
+        logger.exception("Failed to get version %s", version_id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to get version"
@@ -279,7 +342,7 @@ async def get_version(
 
 
 @router.put("/{cover_letter_id}/versions/{version_id}", response_model=CoverLetterVersionResponse)
-async def update_version(
+def update_version(
     cover_letter_id: int,
     version_id: int,
     request: CoverLetterVersionCreate,
@@ -299,8 +362,8 @@ async def update_version(
         return CoverLetterVersionResponse.from_orm(version)
     except ValidationError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
-    except Exception as e:
-        logger.error(f"Failed to update version {version_id}: {e}")
+    except Exception:
+        logger.exception("Failed to update version %s", version_id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to update version"
@@ -308,7 +371,7 @@ async def update_version(
 
 
 @router.delete("/{cover_letter_id}/versions/{version_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_version(
+def delete_version(
     cover_letter_id: int,
     version_id: int,
     current_user: User = Depends(get_current_active_user),
@@ -322,8 +385,8 @@ async def delete_version(
             status_code=status.HTTP_409_CONFLICT,
             detail=str(e)
         )
-    except Exception as e:
-        logger.error(f"Failed to delete version {version_id}: {e}")
+    except Exception:
+        logger.exception("Failed to delete version %s", version_id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to delete version"
@@ -331,7 +394,7 @@ async def delete_version(
 
 
 @router.get("/{cover_letter_id}/versions/{version_id}/download")
-async def download_cover_letter_version(
+def download_cover_letter_version(
     cover_letter_id: int,
     version_id: int,
     template: str = Query("modern", description="PDF template to use"),
@@ -371,10 +434,8 @@ async def download_cover_letter_version(
         )
     except CoverLetterNotFoundError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e.detail))
-    except Exception as e:
-        logger.error(
-            f"Failed to download cover letter version {version_id}: {e}"
-        )
+    except Exception:
+        logger.exception("Failed to download cover letter version %s", version_id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to download cover letter version",
@@ -388,26 +449,26 @@ async def download_cover_letter_version(
 @router.post("/preview-generate", response_model=CoverLetterPreviewResponse)
 async def preview_generate_cover_letter(
     request: CoverLetterGenerateRequest,
-    current_user: User = Depends(get_current_active_user),
-    cl_service: CoverLetterService = Depends(get_cover_letter_service),
-    resume_service: ResumeService = Depends(get_resume_service_dep)
+    ctx: Tuple[User, CoverLetterService, ResumeService] = Depends(cl_context)
 ):
     """Generate a cover letter preview using AI without saving."""
+    current_user, cl_service, resume_service = ctx
     try:
         # Get resume content
         if not request.resume_id:
             raise ValidationError("resume_id is required")
         
-        resume = resume_service.get_resume(current_user.id, request.resume_id)
-        versions = resume_service.list_resume_versions(current_user.id, request.resume_id)
+        latest_version = await run_in_threadpool(
+            resume_service.get_latest_version, current_user.id, request.resume_id
+        )
         
-        if not versions:
+        if not latest_version:
             raise ValidationError("No resume versions found")
         
-        resume_content = versions[0].markdown_content
+        resume_content = latest_version.markdown_content
         
-        # Generate content only
-        generated_content = cl_service.generate_content(
+        # Generate content only; the AI call is awaited so the worker is free meanwhile
+        generated_content = await cl_service.agenerate_content(
             resume_content=resume_content,
             job_description=request.job_description,
             company=request.company,
@@ -421,8 +482,8 @@ async def preview_generate_cover_letter(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except ResumeNotFoundError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e.detail))
-    except Exception as e:
-        logger.error(f"Failed to generate cover letter preview: {e}")
+    except Exception:
+        logger.exception("Failed to generate cover letter preview")
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="Failed to generate cover letter preview"
@@ -431,11 +492,9 @@ async def preview_generate_cover_letter(
 
 @router.post("/generate", response_model=CoverLetterDetailResponse, 
             status_code=status.HTTP_201_CREATED)
-async def generate_cover_letter(
+def generate_cover_letter(
     request: CoverLetterGenerateRequest,
-    current_user: User = Depends(get_current_active_user),
-    cl_service: CoverLetterService = Depends(get_cover_letter_service),
-    resume_service: ResumeService = Depends(get_resume_service_dep)
+    ctx: Tuple[User, CoverLetterService, ResumeService] = Depends(cl_context)
 ):
     """Generate and save a new cover letter using AI.
     
@@ -449,18 +508,18 @@ async def generate_cover_letter(
     Optional:
     - template_id: Template to guide generation
     """
+    current_user, cl_service, resume_service = ctx
     try:
         # Get resume content
         if not request.resume_id:
             raise ValidationError("resume_id is required")
         
-        resume = resume_service.get_resume(current_user.id, request.resume_id)
-        versions = resume_service.list_resume_versions(current_user.id, request.resume_id)
+        latest_version = resume_service.get_latest_version(current_user.id, request.resume_id)
         
-        if not versions:
+        if not latest_version:
             raise ValidationError("No resume versions found")
         
-        resume_content = versions[0].markdown_content
+        resume_content = latest_version.markdown_content
         
         # Generate and save
         cover_letter = cl_service.generate_and_save(
@@ -479,17 +538,89 @@ async def generate_cover_letter(
         versions_list = cl_service.list_versions(current_user.id, cover_letter.id)
         
         response = CoverLetterDetailResponse.from_orm(cover_letter)
-        response.versions = [CoverLetterVersionResponse.from_orm(v) for v in versions_list]
+        response.versions = _CL_VERSION_LIST_ADAPTER.validate_python(versions_list, from_attributes=True)
         return response
     except ValidationError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except ResumeNotFoundError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e.detail))
-    except Exception as e:
-        logger.error(f"Failed to generate cover letter: {e}")
+    except Exception:
+        logger.exception("Failed to generate cover letter")
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="Failed to generate cover letter"
         )
 
 
+@router.post("/generate/stream", response_class=StreamingResponse,
+             responses={200: {"content": {"text/event-stream": {}}}})
+def generate_cover_letter_stream(
+    request: CoverLetterGenerateRequest,
+    ctx: Tuple[User, CoverLetterService, ResumeService] = Depends(cl_context)
+):
+    """Generate a new cover letter using AI, streaming it as Server-Sent Events.
+    
+    Emits `chunk` events with `{"content": ...}` as text arrives, then a single
+    `done` event with the saved cover letter (same shape as POST /generate),
+    or an `error` event if generation fails part-way.
+    """
+    current_user, cl_service, resume_service = ctx
+    try:
+        if not request.resume_id:
+            raise ValidationError("resume_id is required")
+        
+        latest_version = resume_service.get_latest_version(current_user.id, request.resume_id)
+        
+        if not latest_version:
+            raise ValidationError("No resume versions found")
+        
+        resume_content = latest_version.markdown_content
+    except ValidationError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except ResumeNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e.detail))
+    
+    user_id = current_user.id
+    
+    def events() -> Iterator[bytes]:
+        parts = []
+        # The body streams after the request's dependencies have finished, so
+        # generation and the save use a session of their own, closed on exit
+        with CoverLetterService(storage_service=cl_service.storage_service) as stream_service:
+            try:
+                for chunk in stream_service.stream_generated_content(
+                    resume_content,
+                    request.job_description,
+                    request.company,
+                    request.position,
+                    template_id=request.template_id,
+                    base_cover_letter_content=request.base_cover_letter_content,
+                    additional_instructions=request.additional_instructions
+                ):
+                    parts.append(chunk)
+                    yield _sse_event("chunk", {"content": chunk})
+                
+                content = "".join(parts).strip()
+                if not content:
+                    raise ValidationError("Empty response from AI service")
+                
+                # Persist only once the whole letter has arrived
+                cover_letter = stream_service.save_generated(
+                    user_id, request.title, content, request.job_description
+                )
+                versions_list = stream_service.list_versions(user_id, cover_letter.id)
+                
+                response = CoverLetterDetailResponse.from_orm(cover_letter)
+                response.versions = _CL_VERSION_LIST_ADAPTER.validate_python(versions_list, from_attributes=True)
+                yield _sse_event("done", response.model_dump(mode="json"))
+            except Exception:
+                logger.exception("Failed to stream cover letter generation")
+                yield _sse_event("error", {"detail": "Failed to generate cover letter"})
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
@@ -1,51 +1,86 @@
 """Health check and utility endpoints."""
 
-from fastapi import APIRouter
-from datetime import datetime
+import time
+from functools import lru_cache
+from typing import Optional
+import orjson
+from fastapi import APIRouter, Response
+from datetime import datetime, timezone
 from app.core.database import engine
+from app.core.security import audit_logger
 from sqlalchemy import text
 
 router = APIRouter()
 
+# Probe storms within one bucket share a single database round-trip
+HEALTH_CHECK_BUCKET_SECONDS = 5
 
-@router.get("/health")
-async def health_check():
-    """Health check endpoint."""
+_STATUS_BODY = {
+    "service": "resumator-api",
+    "version": "1.0.0",
+    "status": "running",
+    "endpoints": {
+        "auth": "/api/v1/auth",
+        "users": "/api/v1/users",
+        "resumes": "/api/v1/resumes",
+        "applications": "/api/v1/applications"
+    }
+}
+
+
+@lru_cache(maxsize=1)
+def _timestamp(second: int) -> str:
+    """Format a UTC timestamp once per wall-clock second."""
+    return datetime.fromtimestamp(second, tz=timezone.utc).replace(tzinfo=None).isoformat()
+
+
+@lru_cache(maxsize=1)
+def _status_bytes(second: int) -> bytes:
+    """Serialize the status body once per wall-clock second."""
+    return orjson.dumps({**_STATUS_BODY, "timestamp": _timestamp(second)})
+
+
+@lru_cache(maxsize=1)
+def _check_database(bucket: int) -> Optional[str]:
+    """Ping the database via the pool once per time bucket; return an error or None."""
     try:
-        # Test database connection
         with engine.connect() as connection:
             connection.execute(text("SELECT 1"))
-        
-        return {
-            "status": "healthy",
-            "timestamp": datetime.utcnow(),
-            "service": "resumator-api",
-            "version": "1.0.0",
-            "database": "connected"
-        }
+        return None
     except Exception as e:
+        return str(e)
+
+
+@router.get("/health")
+def health_check():
+    """Health check endpoint."""
+    error = _check_database(int(time.monotonic() // HEALTH_CHECK_BUCKET_SECONDS))
+    timestamp = _timestamp(time.time_ns() // 1_000_000_000)
+    if error is None:
         return {
-            "status": "unhealthy",
-            "timestamp": datetime.utcnow(),
+            "status": "healthy",
+            "timestamp": timestamp,
             "service": "resumator-api",
             "version": "1.0.0",
-            "database": "disconnected",
-            "error": str(e)
+            "database": "connected",
+            "audit_events_dropped": audit_logger.dropped
         }
+    
+    return {
+        "status": "unhealthy",
+        "timestamp": timestamp,
+        "service": "resumator-api",
+        "version": "1.0.0",
+        "database": "disconnected",
+        "audit_events_dropped": audit_logger.dropped,
+        "error": error
+    }
 
 
 @router.get("/status")
 async def status():
     """Service status endpoint."""
-    return {
-        "service": "resumator-api",
-        "version": "1.0.0",
-        "status": "running",
-        "timestamp": datetime.utcnow(),
-        "endpoints": {
-            "auth": "/api/v1/auth",
-            "users": "/api/v1/users",
-            "resumes": "/api/v1/resumes",
-            "applications": "/api/v1/applications"
-        }
-    }
+    return Response(
+        content=_status_bytes(time.time_ns() // 1_000_000_000),
+        media_type="application/json"
+    )
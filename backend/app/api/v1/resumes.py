@@ -3,9 +3,8 @@
 import logging
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Response, Query
-from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
-from app.core.database import get_db
+from fastapi.responses import StreamingResponse, ORJSONResponse
+from pydantic import TypeAdapter
 from app.models.user import User
 from app.schemas.resume import (
     ResumeCreate, ResumeUpdate, ResumeResponse, ResumeVersionResponse, 
@@ -13,17 +12,21 @@ from app.schemas.resume import (
     ResumePDFRequest, CoverLetterRequest, CoverLetterResponse
 )
 from app.services.resume_service import ResumeService
-from app.api.deps import get_current_active_user, get_resume_service, get_current_user_from_token, get_pdf_service
+from app.api.deps import get_current_active_user, get_resume_service, get_user_from_token_or_header, get_pdf_service
 from app.core.exceptions import ResumeNotFoundError, ValidationError, AIServiceError
-import io
+from app.services.pdf_service import iter_pdf_chunks, render_resume_pdf_cached
 
 
 logger = logging.getLogger(__name__)
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Built once so list endpoints validate whole pages in a single pydantic-core call
+_RESUME_LIST_ADAPTER = TypeAdapter(List[ResumeResponse])
+_RESUME_VERSION_LIST_ADAPTER = TypeAdapter(List[ResumeVersionResponse])
 
 
 @router.post("", response_model=ResumeResponse, status_code=status.HTTP_201_CREATED)
-async def create_resume(
+def create_resume(
     resume_create: ResumeCreate,
     current_user: User = Depends(get_current_active_user),
     resume_service: ResumeService = Depends(get_resume_service)
@@ -43,8 +46,8 @@ async def create_resume(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
-    except Exception as e:
-        logger.error(f"Failed to create resume for user {current_user.id}: {e}")
+    except Exception:
+        logger.exception("Failed to create resume for user %s", current_user.id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create resume"
@@ -52,7 +55,7 @@ async def create_resume(
 
 
 @router.post("/upload", response_model=dict, status_code=status.HTTP_201_CREATED)
-async def upload_resume(
+def upload_resume(
     resume_create: ResumeCreate,
     current_user: User = Depends(get_current_active_user),
     resume_service: ResumeService = Depends(get_resume_service)
@@ -76,25 +79,26 @@ async def upload_resume(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
-    except Exception as e:
-        logger.error(f"Failed to upload resume for user {current_user.id}: {e}")
+    except Exception:
+        logger.exception("Failed to upload resume for user %s", current_user.id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to upload resume"
         )
 
-@router.get("", response_model=List[ResumeResponse])
-async def list_resumes(
+@router.get("", response_model=None, responses={200: {"model": List[ResumeResponse]}})
+def list_resumes(
     current_user: User = Depends(get_current_active_user),
     resume_service: ResumeService = Depends(get_resume_service)
 ):
     """List all resumes for the current user."""
     try:
         resumes = resume_service.list_user_resumes(current_user.id)
-        return [ResumeResponse.from_orm(resume) for resume in resumes]
+        items = _RESUME_LIST_ADAPTER.validate_python(resumes, from_attributes=True)
+        return ORJSONResponse(_RESUME_LIST_ADAPTER.dump_python(items, mode="json"))
         
-    except Exception as e:
-        logger.error(f"Failed to list resumes for user {current_user.id}: {e}")
+    except Exception:
+        logger.exception("Failed to list resumes for user %s", current_user.id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to list resumes"
@@ -102,7 +106,7 @@ async def list_resumes(
 
 
 @router.get("/{resume_id}", response_model=ResumeResponse)
-async def get_resume(
+def get_resume(
     resume_id: int,
     current_user: User = Depends(get_current_active_user),
     resume_service: ResumeService = Depends(get_resume_service)
@@ -117,8 +121,8 @@ async def get_resume(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e)
         )
-    except Exception as e:
-        logger.error(f"Failed to get resume {resume_id}: {e}")
+    except Exception:
+        logger.exception("Failed to get resume %s", resume_id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to get resume"
@@ -126,7 +130,7 @@ async def get_resume(
 
 
 @router.put("/{resume_id}", response_model=ResumeResponse)
-async def update_resume(
+def update_resume(
     resume_id: int,
     resume_update: ResumeUpdate,
     current_user: User = Depends(get_current_active_user),
@@ -140,9 +144,8 @@ async def update_resume(
         # Update content if provided
         if resume_update.content is not None:
             # Get the latest version
-            versions = resume_service.list_resume_versions(current_user.id, resume_id)
-            if versions:
-                latest_version = versions[0]  # Already sorted by creation date desc
+            latest_version = resume_service.get_latest_version(current_user.id, resume_id)
+            if latest_version:
                 resume_service.update_resume_version(
                     user_id=current_user.id,
                     resume_id=resume_id,
@@ -164,8 +167,8 @@ async def update_resume(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
-    except Exception as e:
-        logger.error(f"Failed to update resume {resume_id}: {e}")
+    except Exception:
+        logger.exception("Failed to update resume %s", resume_id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to update resume"
@@ -173,7 +176,7 @@ async def update_resume(
 
 
 @router.post("/{resume_id}/customize/preview", response_model=ResumeCustomizeResponse)
-async def preview_customization(
+def preview_customization(
     resume_id: int,
     request: ResumeCustomizeRequest,
     current_user: User = Depends(get_current_active_user),
@@ -210,8 +213,8 @@ async def preview_customization(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
-    except Exception as e:
-        logger.error(f"Failed to preview customization for resume {resume_id}: {e}")
+    except Exception:
+        logger.exception("Failed to preview customization for resume %s", resume_id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to preview customization"
@@ -219,7 +222,7 @@ async def preview_customization(
 
 
 @router.post("/{resume_id}/customize/save", response_model=ResumeCustomizeResponse)
-async def save_customization(
+def save_customization(
     resume_id: int,
     request: ResumeCustomizeRequest,
     current_user: User = Depends(get_current_active_user),
@@ -240,8 +243,7 @@ async def save_customization(
         )
         
         # Get the newly created version info
-        versions = resume_service.list_resume_versions(current_user.id, resume_id)
-        latest_version = versions[0] if versions else None
+        latest_version = resume_service.get_latest_version(current_user.id, resume_id)
         
         return ResumeCustomizeResponse(
             customized_markdown=customized_markdown,
@@ -259,8 +261,8 @@ async def save_customization(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
-    except Exception as e:
-        logger.error(f"Failed to save customization for resume {resume_id}: {e}")
+    except Exception:
+        logger.exception("Failed to save customization for resume %s", resume_id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to save customization"
@@ -268,7 +270,7 @@ async def save_customization(
 
 
 @router.post("/{resume_id}/customize", response_model=ResumeCustomizeResponse)
-async def customize_resume(
+def customize_resume(
     resume_id: int,
     request: ResumeCustomizeRequest,
     current_user: User = Depends(get_current_active_user),
@@ -288,8 +290,7 @@ async def customize_resume(
         )
         
         # Get the latest version info
-        versions = resume_service.list_resume_versions(current_user.id, resume_id)
-        latest_version = versions[0] if versions else None
+        latest_version = resume_service.get_latest_version(current_user.id, resume_id)
         
         return ResumeCustomizeResponse(
             customized_markdown=customized_markdown,
@@ -312,16 +313,17 @@ async def customize_resume(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
-    except Exception as e:
-        logger.error(f"Failed to customize resume {resume_id}: {e}")
+    except Exception:
+        logger.exception("Failed to customize resume %s", resume_id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to customize resume"
         )
 
 
-@router.get("/{resume_id}/versions", response_model=List[ResumeVersionResponse])
-async def list_resume_versions(
+@router.get("/{resume_id}/versions", response_model=None,
+            responses={200: {"model": List[ResumeVersionResponse]}})
+def list_resume_versions(
     resume_id: int,
     current_user: User = Depends(get_current_active_user),
     resume_service: ResumeService = Depends(get_resume_service)
@@ -329,15 +331,16 @@ async def list_resume_versions(
     """List all versions of a resume."""
     try:
         versions = resume_service.list_resume_versions(current_user.id, resume_id)
-        return [ResumeVersionResponse.from_orm(version) for version in versions]
+        items = _RESUME_VERSION_LIST_ADAPTER.validate_python(versions, from_attributes=True)
+        return ORJSONResponse(_RESUME_VERSION_LIST_ADAPTER.dump_python(items, mode="json"))
         
     except ResumeNotFoundError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e)
         )
-    except Exception as e:
-        logger.error(f"Failed to list resume versions for {resume_id}: {e}")
+    except Exception:
+        logger.exception("Failed to list resume versions for %s", resume_id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to list resume versions"
@@ -345,7 +348,7 @@ async def list_resume_versions(
 
 
 @router.get("/{resume_id}/versions/{version_id}")
-async def get_resume_version(
+def get_resume_version(
     resume_id: int,
     version_id: int,
     current_user: User = Depends(get_current_active_user),
@@ -374,8 +377,8 @@ async def get_resume_version(
         
     except HTTPException:
         raise
-    except Exception as e:
-        logger.error(f"Failed to get resume version {version_id}: {e}")
+    except Exception:
+        logger.exception("Failed to get resume version %s", version_id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to get resume version"
@@ -383,7 +386,7 @@ async def get_resume_version(
 
 
 @router.put("/{resume_id}/versions/{version_id}")
-async def update_resume_version(
+def update_resume_version(
     resume_id: int,
     version_id: int,
     request: dict,  # Should contain 'markdown' field
@@ -415,8 +418,8 @@ async def update_resume_version(
         
     except HTTPException:
         raise
-    except Exception as e:
-        logger.error(f"Failed to update resume version {version_id}: {e}")
+    except Exception:
+        logger.exception("Failed to update resume version %s", version_id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to update resume version"
@@ -424,7 +427,7 @@ async def update_resume_version(
 
 
 @router.get("/{resume_id}/download")
-async def download_resume_pdf(
+def download_resume_pdf(
     resume_id: int,
     template: str = "modern",
     version_id: Optional[int] = None,
@@ -441,8 +444,7 @@ async def download_resume_pdf(
             )
         else:
             # Get latest version
-            versions = resume_service.list_resume_versions(current_user.id, resume_id)
-            version = versions[0] if versions else None
+            version = resume_service.get_latest_version(current_user.id, resume_id)
         
         if not version:
             raise HTTPException(
@@ -451,23 +453,24 @@ async def download_resume_pdf(
             )
         
         # Generate PDF
-        pdf_bytes = pdf_service.generate_resume_pdf(
-            version.markdown_content, template
+        pdf_bytes = render_resume_pdf_cached(
+            pdf_service, version.markdown_content, template
         )
         
         # Create streaming response
         return StreamingResponse(
-            io.BytesIO(pdf_bytes),
+            iter_pdf_chunks(pdf_bytes),
             media_type="application/pdf",
             headers={
-                "Content-Disposition": f"attachment; filename=resume_{template}_{version.version}.pdf"
+                "Content-Disposition": f"attachment; filename=resume_{template}_{version.version}.pdf",
+                "Content-Length": str(len(pdf_bytes))
             }
         )
         
     except HTTPException:
         raise
-    except Exception as e:
-        logger.error(f"Failed to generate PDF for resume {resume_id}: {e}")
+    except Exception:
+        logger.exception("Failed to generate PDF for resume %s", resume_id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to generate PDF"
@@ -475,39 +478,16 @@ async def download_resume_pdf(
 
 
 @router.get("/{resume_id}/preview")
-async def preview_resume_pdf(
-    request,
+def preview_resume_pdf(
     resume_id: int,
     template: str = "modern",
     version_id: Optional[int] = None,
-    token: Optional[str] = Query(None),
-    db: Session = Depends(get_db),
+    current_user: User = Depends(get_user_from_token_or_header),
     resume_service: ResumeService = Depends(get_resume_service),
     pdf_service: 'PDFService' = Depends(get_pdf_service)
 ):
-    from app.services.pdf_service import PDFService
     """Preview resume as PDF in browser."""
-    from fastapi import Request
-    
     try:
-        # Get current user from token or header
-        current_user = None
-        
-        if token:
-            current_user = get_current_user_from_token(token, db)
-        else:
-            # Try to get from authorization header
-            authorization = request.headers.get("authorization")
-            if authorization and authorization.startswith("Bearer "):
-                token_from_header = authorization.split(" ")[1]
-                current_user = get_current_user_from_token(token_from_header, db)
-        
-        if not current_user:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Authentication required"
-            )
-        
         # Get resume version
         if version_id:
             version = resume_service.get_resume_version(
@@ -515,8 +495,7 @@ async def preview_resume_pdf(
             )
         else:
             # Get latest version
-            versions = resume_service.list_resume_versions(current_user.id, resume_id)
-            version = versions[0] if versions else None
+            version = resume_service.get_latest_version(current_user.id, resume_id)
         
         if not version:
             raise HTTPException(
@@ -525,23 +504,24 @@ async def preview_resume_pdf(
             )
         
         # Generate PDF
-        pdf_bytes = pdf_service.generate_resume_pdf(
-            version.markdown_content, template
+        pdf_bytes = render_resume_pdf_cached(
+            pdf_service, version.markdown_content, template
         )
         
         # Create streaming response for inline viewing
         return StreamingResponse(
-            io.BytesIO(pdf_bytes),
+            iter_pdf_chunks(pdf_bytes),
             media_type="application/pdf",
             headers={
-                "Content-Disposition": f"inline; filename=resume_{template}_{version.version}.pdf"
+                "Content-Disposition": f"inline; filename=resume_{template}_{version.version}.pdf",
+                "Content-Length": str(len(pdf_bytes))
             }
         )
         
     except HTTPException:
         raise
-    except Exception as e:
-        logger.error(f"Failed to preview PDF for resume {resume_id}: {e}")
+    except Exception:
+        logger.exception("Failed to preview PDF for resume %s", resume_id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to preview PDF"
@@ -549,7 +529,7 @@ async def preview_resume_pdf(
 
 
 @router.post("/{resume_id}/cover-letter", response_model=CoverLetterResponse)
-async def generate_cover_letter(
+def generate_cover_letter(
     resume_id: int,
     request: CoverLetterRequest,
     current_user: User = Depends(get_current_active_user),
@@ -583,8 +563,8 @@ async def generate_cover_letter(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
-    except Exception as e:
-        logger.error(f"Failed to generate cover letter: {e}")
+    except Exception:
+        logger.exception("Failed to generate cover letter")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to generate cover letter"
@@ -592,7 +572,7 @@ async def generate_cover_letter(
 
 
 @router.delete("/{resume_id}/versions/{version_id}")
-async def delete_resume_version(
+def delete_resume_version(
     resume_id: int,
     version_id: int,
     current_user: User = Depends(get_current_active_user),
@@ -622,8 +602,8 @@ async def delete_resume_version(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
-    except Exception as e:
-        logger.error(f"Failed to delete resume version {version_id}: {e}")
+    except Exception:
+        logger.exception("Failed to delete resume version %s", version_id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to delete resume version"
@@ -631,7 +611,7 @@ async def delete_resume_version(
 
 
 @router.get("/{resume_id}/dependencies")
-async def check_resume_dependencies(
+def check_resume_dependencies(
     resume_id: int,
     current_user: User = Depends(get_current_active_user),
     resume_service: ResumeService = Depends(get_resume_service)
@@ -659,8 +639,8 @@ async def check_resume_dependencies(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
-    except Exception as e:
-        logger.error(f"Failed to check resume dependencies: {e}")
+    except Exception:
+        logger.exception("Failed to check resume dependencies")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to check dependencies"
@@ -668,7 +648,7 @@ async def check_resume_dependencies(
 
 
 @router.get("/{resume_id}/versions/{version_id}/dependencies")
-async def check_version_dependencies(
+def check_version_dependencies(
     resume_id: int,
     version_id: int,
     current_user: User = Depends(get_current_active_user),
@@ -697,8 +677,8 @@ async def check_version_dependencies(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
-    except Exception as e:
-        logger.error(f"Failed to check version dependencies: {e}")
+    except Exception:
+        logger.exception("Failed to check version dependencies")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to check dependencies"
@@ -706,7 +686,7 @@ async def check_version_dependencies(
 
 
 @router.post("/{resume_id}/reassign")
-async def reassign_applications(
+def reassign_applications(
     resume_id: int,
     request: dict,  # Should contain 'target_resume_id' and optional 'target_version_id'
     current_user: User = Depends(get_current_active_user),
@@ -742,8 +722,8 @@ async def reassign_applications(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e)
         )
-    except Exception as e:
-        logger.error(f"Failed to reassign applications: {e}")
+    except Exception:
+        logger.exception("Failed to reassign applications")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to reassign applications"
@@ -751,7 +731,7 @@ async def reassign_applications(
 
 
 @router.delete("/{resume_id}")
-async def delete_resume(
+def delete_resume(
     resume_id: int,
     force: bool = Query(False, description="Force delete with all dependent applications"),
     current_user: User = Depends(get_current_active_user),
@@ -808,8 +788,8 @@ async def delete_resume(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e)
         )
-    except Exception as e:
-        logger.error(f"Failed to delete resume {resume_id}: {e}")
+    except Exception:
+        logger.exception("Failed to delete resume %s", resume_id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to delete resume"
@@ -817,7 +797,7 @@ async def delete_resume(
 
 
 @router.get("/{resume_id}/html", response_model=dict)
-async def get_resume_html(
+def get_resume_html(
     resume_id: int,
     template: str = "modern",
     version_id: Optional[int] = None,
@@ -835,8 +815,7 @@ async def get_resume_html(
             )
         else:
             # Get latest version
-            versions = resume_service.list_resume_versions(current_user.id, resume_id)
-            version = versions[0] if versions else None
+            version = resume_service.get_latest_version(current_user.id, resume_id)
 
         if not version:
             raise HTTPException(
@@ -853,8 +832,8 @@ async def get_resume_html(
 
     except HTTPException:
         raise
-    except Exception as e:
-        logger.error(f"Failed to generate HTML for resume {resume_id}: {e}")
+    except Exception:
+        logger.exception("Failed to generate HTML for resume %s", resume_id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to generate HTML"
@@ -862,14 +841,14 @@ async def get_resume_html(
 
 
 @router.get("/templates/list")
-async def list_pdf_templates(pdf_service: 'PDFService' = Depends(get_pdf_service)):
+def list_pdf_templates(pdf_service: 'PDFService' = Depends(get_pdf_service)):
     from app.services.pdf_service import PDFService
     try:
         templates = pdf_service.get_available_templates()
         return {"templates": templates}
 
-    except Exception as e:
-        logger.error(f"Failed to list PDF templates: {e}")
+    except Exception:
+        logger.exception("Failed to list PDF templates")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to list PDF templates"
@@ -1,30 +1,42 @@
 """User management API endpoints."""
 
 import logging
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.core.database import get_db
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from pydantic import TypeAdapter
 from app.models.user import User
-from app.schemas.user import UserResponse, UserUpdate
-from app.services.user_service import UserService
-from app.api.deps import get_current_active_user, get_user_service
+from app.schemas.user import UserResponse, UserUpdate, user_to_response
+from app.services.user_service import UserService, user_stats_cache
+from app.api.deps import get_current_active_user, get_readonly_user_service, get_user_service
 from app.core.exceptions import ValidationError
 
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+_USER_ADAPTER = TypeAdapter(UserResponse)
+
+
+def _user_json(user: User) -> bytes:
+    """Serialize a user straight to JSON bytes with the cached adapter."""
+    return _USER_ADAPTER.dump_json(user_to_response(user))
+
+
+def _user_profile_response(user: User) -> Response:
+    """Serve a user's profile JSON from the row the auth dependency already loaded."""
+    return Response(content=_user_json(user), media_type="application/json")
+
 
 @router.get("/me", response_model=UserResponse)
-async def get_current_user_info(
+def get_current_user_info(
     current_user: User = Depends(get_current_active_user)
 ):
     """Get current user information."""
-    return UserResponse.from_orm(current_user)
+    return _user_profile_response(current_user)
 
 
 @router.put("/me", response_model=UserResponse)
-async def update_current_user(
+def update_current_user(
     user_update: UserUpdate,
     current_user: User = Depends(get_current_active_user),
     user_service: UserService = Depends(get_user_service)
@@ -38,15 +50,15 @@ async def update_current_user(
                 detail="User not found"
             )
         
-        return UserResponse.from_orm(updated_user)
+        return _user_profile_response(updated_user)
         
     except ValidationError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
-    except Exception as e:
-        logger.error(f"Failed to update user {current_user.id}: {e}")
+    except Exception:
+        logger.exception("Failed to update user %s", current_user.id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to update user"
@@ -54,7 +66,7 @@ async def update_current_user(
 
 
 @router.delete("/me")
-async def delete_current_user(
+def delete_current_user(
     current_user: User = Depends(get_current_active_user),
     user_service: UserService = Depends(get_user_service)
 ):
@@ -69,8 +81,8 @@ async def delete_current_user(
         
         return {"message": "User account deleted successfully"}
         
-    except Exception as e:
-        logger.error(f"Failed to delete user {current_user.id}: {e}")
+    except Exception:
+        logger.exception("Failed to delete user %s", current_user.id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to delete user account"
@@ -78,7 +90,7 @@ async def delete_current_user(
 
 
 @router.post("/me/deactivate")
-async def deactivate_current_user(
+def deactivate_current_user(
     current_user: User = Depends(get_current_active_user),
     user_service: UserService = Depends(get_user_service)
 ):
@@ -93,8 +105,8 @@ async def deactivate_current_user(
         
         return {"message": "User account deactivated successfully"}
         
-    except Exception as e:
-        logger.error(f"Failed to deactivate user {current_user.id}: {e}")
+    except Exception:
+        logger.exception("Failed to deactivate user %s", current_user.id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to deactivate user account"
@@ -102,47 +114,45 @@ async def deactivate_current_user(
 
 
 @router.get("/profile", response_model=UserResponse)
-async def get_user_profile(
+def get_user_profile(
     current_user: User = Depends(get_current_active_user)
 ):
     """Get detailed user profile information."""
     # You can extend this to include additional profile data
-    return UserResponse.from_orm(current_user)
+    return _user_profile_response(current_user)
 
 
 @router.get("/stats")
-async def get_user_stats(
+def get_user_stats(
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    user_service: UserService = Depends(get_readonly_user_service)
 ):
     """Get user statistics (resumes, applications, etc.)."""
+    payload = user_stats_cache.get(current_user.id)
+    if payload is not None:
+        return Response(content=payload, media_type="application/json")
+    
     try:
-        from app.services.application_service import ApplicationService
-        
-        # Get application stats
-        app_service = ApplicationService(db)
-        app_stats = app_service.get_application_stats(current_user.id)
-        
-        # Get resume count
-        from app.models.resume import Resume
-        resume_count = db.query(Resume).filter(Resume.user_id == current_user.id).count()
+        stats = user_service.get_user_stats(current_user.id)
         
-        return {
+        payload = orjson.dumps({
             "user_id": current_user.id,
             "username": current_user.username,
             "member_since": current_user.created_at,
-            "resumes": resume_count,
+            "resumes": stats["resumes"],
             "applications": {
-                "total": app_stats.total,
-                "applied": app_stats.applied,
-                "interviewing": app_stats.interviewing,
-                "rejected": app_stats.rejected,
-                "offers": app_stats.offers
+                "total": stats["total"],
+                "applied": stats["applied"],
+                "interviewing": stats["interviewing"],
+                "rejected": stats["rejected"],
+                "offers": stats["offer"]
             }
-        }
+        })
+        user_stats_cache.set(current_user.id, payload)
+        return Response(content=payload, media_type="application/json")
         
-    except Exception as e:
-        logger.error(f"Failed to get user stats for {current_user.id}: {e}")
+    except Exception:
+        logger.exception("Failed to get user stats for %s", current_user.id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to get user statistics"
@@ -2,8 +2,20 @@
 
 import os
 import json
-from typing import Optional
-from pydantic_settings import BaseSettings
+from types import SimpleNamespace
+from typing import Annotated, List, Optional
+from pydantic import Field, field_validator
+from pydantic_settings import BaseSettings, NoDecode
+
+
+DEFAULT_ALLOWED_ORIGINS = (
+    "http://localhost:3000",  # React dev server
+    "http://localhost:5173",  # Vite dev server
+    "https://localhost:3000", # Production HTTPS
+    "https://localhost:5173", # Production HTTPS
+    "http://127.0.0.1:3000",  # Alternative localhost
+    "http://127.0.0.1:5173",  # Alternative localhost
+)
 
 
 class Settings(BaseSettings):
@@ -14,18 +26,37 @@ class Settings(BaseSettings):
         "DATABASE_URL",
         "postgresql://resumator:password@db:5432/resumator"
     )
+    # Optional streaming replica for read-only endpoints
+    replica_database_url: Optional[str] = os.getenv("REPLICA_DATABASE_URL")
     postgres_user: Optional[str] = os.getenv("POSTGRES_USER")
     postgres_password: Optional[str] = os.getenv("POSTGRES_PASSWORD")
     postgres_db: Optional[str] = os.getenv("POSTGRES_DB")
+    # Connection pool sizing, per worker process. Each worker may open
+    # pool_size + max_overflow connections; keep that times the worker count
+    # (15 x 4 with gunicorn -w 4) under Postgres max_connections (100 by default)
+    db_pool_size: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    db_max_overflow: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    db_pool_timeout: int = int(os.getenv("DB_POOL_TIMEOUT", "10"))
+    # PgBouncer owns the pool; each worker opens connections on demand
+    use_pgbouncer: bool = os.getenv("USE_PGBOUNCER", "false").lower() == "true"
     
     # Redis
     redis_url: str = os.getenv("REDIS_URL", "redis://redis:6379/0")
+    # Connections per worker process, split between the sync and event-loop pools
+    redis_max_connections: int = int(os.getenv("REDIS_MAX_CONNECTIONS", "64"))
+    redis_health_check_interval: int = int(os.getenv("REDIS_HEALTH_CHECK_INTERVAL", "30"))
     
     # Security
     jwt_secret: str = os.getenv("JWT_SECRET", "your-super-secret-jwt-key-change-this-in-production")
     jwt_algorithm: str = "HS256"
     jwt_access_expire_minutes: int = 15  # Shorter access token lifetime
     jwt_refresh_expire_days: int = 30  # Refresh token lifetime
+    # Argon2id cost for new password hashes (memory in KiB; OWASP baseline)
+    argon2_memory_cost: int = int(os.getenv("ARGON2_MEMORY_COST", "19456"))
+    argon2_time_cost: int = int(os.getenv("ARGON2_TIME_COST", "2"))
+    argon2_parallelism: int = int(os.getenv("ARGON2_PARALLELISM", "1"))
+    # Concurrent password hashes per worker process (0 = one per CPU)
+    password_hash_workers: int = int(os.getenv("PASSWORD_HASH_WORKERS", "0"))
     # jwt_expire_minutes: int = int(os.getenv("JWT_EXPIRE_MINUTES", "10080"))  # 7 days default
 
     # AI Service (Groq)
@@ -43,28 +74,39 @@ class Settings(BaseSettings):
     minio_secret_key: Optional[str] = os.getenv("MINIO_SECRET_KEY")
     minio_bucket: str = os.getenv("MINIO_BUCKET", "resumator")
     
+    # Rendered PDFs are cached by content hash
+    pdf_cache_ttl_seconds: int = int(os.getenv("PDF_CACHE_TTL_SECONDS", "86400"))
+    # WeasyPrint render processes per worker process; every gunicorn worker has
+    # its own pool, so the total is this times the worker count (-w 4 in prod)
+    pdf_render_workers: int = int(os.getenv("PDF_RENDER_WORKERS", "2"))
+    # ...and /users/stats aggregates, briefly
+    stats_cache_ttl: int = int(os.getenv("STATS_CACHE_TTL", "30"))
+    
     # App
     app_name: str = os.getenv("APP_NAME", "Resume Customizer")
     app_version: str = "1.0.0"
     debug: bool = os.getenv("DEBUG", "false").lower() == "true"
     
     # CORS - Allow both HTTP and HTTPS for development
-    # Dynamically load from environment variable, or use development defaults
-    allowed_origins: list = json.loads(os.getenv(
-        "ALLOWED_ORIGINS",
-        json.dumps([
-            "http://localhost:3000",  # React dev server
-            "http://localhost:5173",  # Vite dev server
-            "https://localhost:3000", # Production HTTPS
-            "https://localhost:5173", # Production HTTPS
-            "http://127.0.0.1:3000",  # Alternative localhost
-            "http://127.0.0.1:5173",  # Alternative localhost
-        ])
-    ))
+    # ALLOWED_ORIGINS may be a JSON list or a comma-separated string
+    allowed_origins: Annotated[List[str], NoDecode] = Field(
+        default_factory=lambda: list(DEFAULT_ALLOWED_ORIGINS)
+    )
     
     # --- Environment (dev or prod) ---
     environment: str = os.getenv("ENVIRONMENT", "dev")
     
+    @field_validator("allowed_origins", mode="before")
+    @classmethod
+    def _parse_origins(cls, value):
+        """Accept a JSON list or a comma-separated string of origins."""
+        if isinstance(value, str):
+            value = value.strip()
+            if value.startswith("["):
+                return json.loads(value)
+            return [origin.strip() for origin in value.split(",") if origin.strip()]
+        return value
+    
     @property
     def is_development(self) -> bool:
         return self.environment == "dev" or self.debug
@@ -100,3 +142,13 @@ class Settings(BaseSettings):
         extra = "ignore"
 
 settings = Settings()
+
+# Resolved once at import; read on every request by the rate-limiting middleware
+rate_limit_settings = SimpleNamespace(
+    is_development=settings.is_development,
+    read_requests_per_minute=settings.read_requests_per_minute,
+    write_requests_per_minute=settings.write_requests_per_minute,
+    ai_calls_per_hour=settings.ai_calls_per_hour,
+    auth_attempts_per_hour=settings.auth_attempts_per_hour,
+    file_uploads_per_hour=settings.file_uploads_per_hour,
+)
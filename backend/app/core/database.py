@@ -1,10 +1,11 @@
 """Database configuration and session management."""
 
 import os
-from sqlalchemy import create_engine
+from typing import Optional
+from sqlalchemy import create_engine, text
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool, StaticPool
 
 # Check if we're in testing mode BEFORE importing settings
 # This must happen before any database connection attempts
@@ -20,24 +21,77 @@ if TESTING:
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
     )
+    read_engine = engine
 else:
     # Production/development: Use PostgreSQL from settings
     from app.config import settings
     
     print(f"Database URL: {settings.database_url}")
-    engine = create_engine(
-        settings.database_url,
-        pool_pre_ping=True,
-        pool_recycle=300,
+    
+    def _create_engine(url: str):
+        """Build a pooled engine for the primary or a read replica."""
+        if settings.use_pgbouncer:
+            # Connections to PgBouncer are cheap; holding them per worker
+            # would multiply server connections behind the bouncer
+            return create_engine(
+                url,
+                poolclass=NullPool,
+                query_cache_size=1200,
+            )
+        return create_engine(
+            url,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_pre_ping=True,
+            pool_recycle=300,
+            query_cache_size=1200,
+        )
+    
+    engine = _create_engine(settings.database_url)
+    # Read-heavy endpoints go to the replica when one is configured
+    read_engine = (
+        _create_engine(settings.replica_database_url)
+        if settings.replica_database_url
+        else engine
     )
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
 
 # Create Base class for models
 Base = declarative_base()
 
 
+class SessionBacked:
+    """Base for services that use the injected request session, or open their own without one."""
+    
+    db: Optional[Session] = None
+    _owns_db = False
+    
+    def _get_db(self) -> Session:
+        """Get database session."""
+        if self.db is None:
+            # Opened once and reused for every call until close()
+            self.db = SessionLocal()
+            self._owns_db = True
+        return self.db
+    
+    def close(self):
+        """Close the session this service opened; an injected one belongs to its request."""
+        if self._owns_db:
+            self.db.close()
+            self.db = None
+            self._owns_db = False
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+
 def get_db():
     """Dependency to get database session."""
     db = SessionLocal()
@@ -45,3 +99,14 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_readonly_db():
+    """Dependency to get a read-only database session (replica when configured)."""
+    db = ReadSessionLocal()
+    try:
+        if read_engine.dialect.name == "postgresql":
+            db.execute(text("SET TRANSACTION READ ONLY"))
+        yield db
+    finally:
+        db.close()
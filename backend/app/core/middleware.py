@@ -1,112 +1,113 @@
 """Security middleware for FastAPI application."""
 
-import time
+import re
 import logging
-from typing import Callable
-from fastapi import Request, Response, HTTPException, status
-from fastapi.responses import JSONResponse
-from app.core.security import SecurityHeaders, RateLimiter, audit_logger
-from app.config.settings import settings
+from fastapi import Request, Response
+from app.core.security import SecurityHeaders, rate_limiter, begin_token_cache, end_token_cache
+from app.core.exceptions import RateLimitError
+from app.config.settings import rate_limit_settings
 
 logger = logging.getLogger(__name__)
 
+# Path fragments with their own hourly limits: (key prefix, label, limit attribute)
+_AUTH_TIER = ("auth", "Auth", "auth_attempts_per_hour")
+_AI_TIER = ("ai", "AI", "ai_calls_per_hour")
+_UPLOAD_TIER = ("upload", "Upload", "file_uploads_per_hour")
+_ROUTE_TIERS = {
+    "auth/login": _AUTH_TIER,
+    "auth/register": _AUTH_TIER,
+    "customize": _AI_TIER,
+    "cover-letter": _AI_TIER,
+    "upload": _UPLOAD_TIER,
+}
+_ROUTE_RE = re.compile(r"/(auth/login|auth/register|customize|cover-letter|upload)")
+
+# The 429 reply carries no per-request data, so it is rendered once and reused
+_RATE_LIMITED_RESPONSE = Response(
+    content=b'{"detail":"Rate limit exceeded"}',
+    status_code=429,
+    media_type="application/json",
+)
+
+# Probes and static assets never touch Redis for rate limiting
+_RATE_LIMIT_EXEMPT_PREFIXES = ("/health", "/favicon.ico", "/docs", "/redoc", "/openapi.json", "/static/")
+
 
 class SecurityMiddleware:
     """Security middleware for adding headers and rate limiting."""
     
     def __init__(self, app):
         self.app = app
-        self.rate_limiter = RateLimiter()
+        self.rate_limiter = rate_limiter
+        # Static per deployment, so encode them once
+        self._security_headers = [
+            (name.lower().encode("latin-1"), value.encode("latin-1"))
+            for name, value in SecurityHeaders.get_security_headers().items()
+        ]
         
     async def __call__(self, scope, receive, send):
         if scope["type"] != "http":
             await self.app(scope, receive, send)
             return
         
-        request = Request(scope, receive)
-        
         # Rate limiting check
-        client_ip = self._get_client_ip(request)
-        if not self._check_rate_limits(request, client_ip):
-            response = JSONResponse(
-                status_code=429,
-                content={"detail": "Rate limit exceeded"}
-            )
-            await response(scope, receive, send)
-            return
+        if not scope["path"].startswith(_RATE_LIMIT_EXEMPT_PREFIXES):
+            request = Request(scope, receive)
+            client_ip = get_client_ip(request)
+            if not await self._check_rate_limits(request, client_ip):
+                await _RATE_LIMITED_RESPONSE(scope, receive, send)
+                return
         
         # Process request
         async def send_wrapper(message):
             if message["type"] == "http.response.start":
                 # Add security headers
-                headers = message.get("headers", [])
-                security_headers = SecurityHeaders.get_security_headers()
-                
-                for name, value in security_headers.items():
-                    headers.append([name.encode(), value.encode()])
-                
-                message["headers"] = headers
+                message["headers"] = [*message.get("headers", ()), *self._security_headers]
                 
             await send(message)
         
-        await self.app(scope, receive, send_wrapper)
-    
-    def _get_client_ip(self, request: Request) -> str:
-        """Extract client IP address from request."""
-        forwarded = request.headers.get("X-Forwarded-For")
-        if forwarded:
-            return forwarded.split(",")[0].strip()
-        
-        real_ip = request.headers.get("X-Real-IP")
-        if real_ip:
-            return real_ip
-        
-        return request.client.host if request.client else "unknown"
+        memo = begin_token_cache()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            end_token_cache(memo)
     
-    def _check_rate_limits(self, request: Request, client_ip: str) -> bool:
+    async def _check_rate_limits(self, request: Request, client_ip: str) -> bool:
         """Check tiered rate limits based on operation type."""
         path = request.url.path
         method = request.method
         
         # Skip rate limiting in development for easier testing
-        if settings.is_development:
+        if rate_limit_settings.is_development:
             return True
         
         # Different limits for read vs write operations
         if method in ["GET", "HEAD", "OPTIONS"]:
-            limit = settings.read_requests_per_minute
+            limit = rate_limit_settings.read_requests_per_minute
             window = 60
             key_prefix = "read"
         else:
-            limit = settings.write_requests_per_minute
+            limit = rate_limit_settings.write_requests_per_minute
             window = 60
             key_prefix = "write"
         
-        # Apply operation-specific rate limit
-        operation_key = f"{key_prefix}:{client_ip}"
-        if not self.rate_limiter.is_allowed(operation_key, limit, window):
+        if not await self.rate_limiter.ais_allowed(f"{key_prefix}:{client_ip}", limit, window):
             logger.warning(f"Rate limit exceeded for IP: {client_ip}, operation: {key_prefix}, path: {path}")
             return False
         
-        # Special limits for sensitive endpoints only
-        if "/auth/login" in path or "/auth/register" in path:
-            auth_key = f"auth:{client_ip}"
-            if not self.rate_limiter.is_allowed(auth_key, settings.auth_attempts_per_hour, 3600):
-                logger.warning(f"Auth rate limit exceeded for IP: {client_ip}")
-                return False
-        
-        # AI endpoints get separate, more restrictive limits
-        if "/customize" in path or "/cover-letter" in path:
-            ai_key = f"ai:{client_ip}"
-            if not self.rate_limiter.is_allowed(ai_key, settings.ai_calls_per_hour, 3600):
-                logger.warning(f"AI rate limit exceeded for IP: {client_ip}")
-                return False
+        # Extra hourly limits for sensitive endpoints (auth, AI, uploads), counted in one
+        # round trip and only once the operation limit passed, so rejected requests spend no quota
+        tiers = list(dict.fromkeys(_ROUTE_TIERS[bucket] for bucket in _ROUTE_RE.findall(path)))
+        if not tiers:
+            return True
+        allowed = await self.rate_limiter.ais_allowed_many([
+            (f"{prefix}:{client_ip}", getattr(rate_limit_settings, limit_setting), 3600)
+            for prefix, _, limit_setting in tiers
+        ])
         
-        # File upload limits
-        if "/upload" in path:
-            upload_key = f"upload:{client_ip}"
-            if not self.rate_limiter.is_allowed(upload_key, settings.file_uploads_per_hour, 3600):
-                logger.warning(f"Upload rate limit exceeded for IP: {client_ip}")
+        for (_, label, _), tier_allowed in zip(tiers, allowed):
+            if not tier_allowed:
+                logger.warning(f"{label} rate limit exceeded for IP: {client_ip}")
                 return False
         
         return True
@@ -114,28 +115,29 @@ class SecurityMiddleware:
 
 async def rate_limit_dependency(request: Request) -> None:
     """Dependency for additional rate limiting on sensitive endpoints."""
-    client_ip = request.client.host if request.client else "unknown"
+    client_ip = get_client_ip(request)
     
     # AI endpoint specific limits
-    if "/customize" in str(request.url) or "/cover-letter" in str(request.url):
-        rate_limiter = RateLimiter()
+    if any(_ROUTE_TIERS[bucket] is _AI_TIER for bucket in _ROUTE_RE.findall(request.url.path)):
         ai_key = f"ai:{client_ip}"
         
-        if not rate_limiter.is_allowed(ai_key, settings.ai_calls_per_hour):
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail="AI service rate limit exceeded. Please try again later."
-            )
+        if not await rate_limiter.ais_allowed(ai_key, rate_limit_settings.ai_calls_per_hour):
+            raise RateLimitError("AI service rate limit exceeded. Please try again later.")
 
 
 def get_client_ip(request: Request) -> str:
-    """Helper to get client IP from request."""
+    """Helper to get client IP from request, parsed once per request."""
+    client_ip = getattr(request.state, "client_ip", None)
+    if client_ip is not None:
+        return client_ip
+    
     forwarded = request.headers.get("X-Forwarded-For")
     if forwarded:
-        return forwarded.split(",")[0].strip()
-    
-    real_ip = request.headers.get("X-Real-IP")
-    if real_ip:
-        return real_ip
+        client_ip = forwarded.partition(",")[0].strip()
+    else:
+        client_ip = request.headers.get("X-Real-IP") or (
+            request.client.host if request.client else "unknown"
+        )
     
-    return request.client.host if request.client else "unknown"
+    request.state.client_ip = client_ip
+    return client_ip
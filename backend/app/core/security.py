@@ -1,13 +1,29 @@
 """Enhanced security utilities with refresh tokens and rate limiting."""
 
+import os
+import re
 import secrets
+import socket
 import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import QueueHandler, QueueListener
+from contextvars import ContextVar, Token as ContextToken
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
-from jose import JWTError, jwt
+from types import MappingProxyType
+from typing import Optional, Dict, Any, List, Mapping, Tuple, Union
+import jwt
+import orjson
+from jwt import PyJWTError
 from passlib.context import CryptContext
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
 import redis
+import redis.asyncio as aioredis
 import hashlib
+from cachetools import TTLCache
 from sqlalchemy.orm import Session
 from app.config.settings import settings
 
@@ -15,106 +31,471 @@ from app.config.settings import settings
 logger = logging.getLogger(__name__)
 
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["argon2", "bcrypt"], deprecated="auto")
+# Password hashing: new hashes are always Argon2id and verified directly by
+# argon2-cffi; passlib is only consulted for legacy (bcrypt) hashes
+password_hasher = PasswordHasher(
+    memory_cost=settings.argon2_memory_cost,
+    time_cost=settings.argon2_time_cost,
+    parallelism=settings.argon2_parallelism,
+)
+legacy_pwd_context = CryptContext(schemes=["argon2", "bcrypt"], deprecated="auto")
 
-# Redis client for token blacklisting and rate limiting
-try:
-    redis_client = redis.from_url(settings.redis_url)
-    redis_client.ping()
-    logger.info("Redis connected successfully")
-except Exception as e:
-    logger.warning(f"Redis connection failed: {e}")
-    redis_client = None
+# Argon2 is memory-hard; a dedicated bounded pool caps how many hashes
+# (and how much memory) run at once, whichever threads ask for them
+pwd_executor = ThreadPoolExecutor(
+    max_workers=settings.password_hash_workers or os.cpu_count() or 2,
+    thread_name_prefix="argon2",
+)
+
+# TCP keepalive probes stop idle pooled connections from being silently reaped
+_REDIS_KEEPALIVE_OPTIONS = {
+    getattr(socket, name): value
+    for name, value in (("TCP_KEEPIDLE", 60), ("TCP_KEEPINTVL", 10), ("TCP_KEEPCNT", 3))
+    if hasattr(socket, name)
+}
+
+_REDIS_POOL_OPTIONS = dict(
+    health_check_interval=settings.redis_health_check_interval,
+    socket_keepalive=True,
+    socket_keepalive_options=_REDIS_KEEPALIVE_OPTIONS,
+    socket_connect_timeout=2,
+)
+
+# redis_max_connections is the whole per-process budget: the event-loop client
+# (rate-limit middleware only) gets a quarter, the shared sync client the rest
+_ASYNC_REDIS_MAX_CONNECTIONS = max(1, settings.redis_max_connections // 4)
+_SYNC_REDIS_MAX_CONNECTIONS = max(1, settings.redis_max_connections - _ASYNC_REDIS_MAX_CONNECTIONS)
+
+# One explicitly sized pool behind the Redis client shared by every module
+redis_pool = redis.ConnectionPool.from_url(
+    settings.redis_url, max_connections=_SYNC_REDIS_MAX_CONNECTIONS, **_REDIS_POOL_OPTIONS
+)
+
+# Seconds before an unreachable Redis is pinged again
+REDIS_RETRY_INTERVAL = 30
+
+# The shared client is connected on first use (or at startup warm-up), not at import
+_redis_client: Optional[redis.Redis] = None
+_async_redis_client: Optional[aioredis.Redis] = None
+_redis_resolved = False
+_redis_retry_at = 0.0
+_redis_lock = threading.Lock()
+
+
+def get_redis() -> Optional[redis.Redis]:
+    """Shared Redis client for token blacklisting, rate limiting and caches; None while unreachable."""
+    global _redis_client, _redis_resolved, _redis_retry_at
+    if _redis_client is not None:
+        return _redis_client
+    if _redis_resolved and time.monotonic() < _redis_retry_at:
+        return None
+    # The first resolve waits for the ping; later retries are left to one caller
+    if not _redis_lock.acquire(blocking=not _redis_resolved):
+        return None
+    try:
+        if _redis_client is None and (not _redis_resolved or time.monotonic() >= _redis_retry_at):
+            client = redis.Redis(connection_pool=redis_pool)
+            try:
+                client.ping()
+                _redis_client = client
+                logger.info("Redis connected successfully")
+            except Exception as e:
+                logger.warning(f"Redis connection failed: {e}")
+                _redis_retry_at = time.monotonic() + REDIS_RETRY_INTERVAL
+            _redis_resolved = True
+        return _redis_client
+    finally:
+        _redis_lock.release()
+
+
+def get_async_redis() -> Optional[aioredis.Redis]:
+    """Non-blocking client for checks made directly on the event loop (middleware, async deps)."""
+    global _async_redis_client
+    # Never pings here: the first awaited command is the availability check,
+    # and a failure opens the caller's RedisBackoff window
+    if _async_redis_client is None:
+        _async_redis_client = aioredis.Redis(
+            connection_pool=aioredis.ConnectionPool.from_url(
+                settings.redis_url, max_connections=_ASYNC_REDIS_MAX_CONNECTIONS, **_REDIS_POOL_OPTIONS
+            )
+        )
+    return _async_redis_client
+
+
+async def close_async_redis():
+    """Release the event-loop Redis connections on shutdown."""
+    global _async_redis_client
+    if _async_redis_client is not None:
+        await _async_redis_client.aclose()
+        _async_redis_client = None
+
+
+# Default for Redis-backed components: use the shared client, resolved on access
+SHARED_REDIS = object()
+
+
+class RedisBacked:
+    """Base for components that talk to the shared Redis client unless given their own."""
+    
+    _redis = SHARED_REDIS
+    _async_redis = SHARED_REDIS
+    
+    @property
+    def redis(self):
+        return get_redis() if self._redis is SHARED_REDIS else self._redis
+    
+    @redis.setter
+    def redis(self, client):
+        self._redis = client
+    
+    @property
+    def async_redis(self):
+        return get_async_redis() if self._async_redis is SHARED_REDIS else self._async_redis
+    
+    @async_redis.setter
+    def async_redis(self, client):
+        self._async_redis = client
+
+
+# Encoded once rather than on every sign/verify
+_JWT_SECRET = settings.jwt_secret.encode()
+
+
+_SECURITY_HEADERS = MappingProxyType({
+    "X-Content-Type-Options": "nosniff",
+    "X-Frame-Options": "DENY",
+    "X-XSS-Protection": "1; mode=block",
+    "Referrer-Policy": "strict-origin-when-cross-origin",
+    "Permissions-Policy": "microphone=(), camera=(), geolocation=()",
+    "Strict-Transport-Security": "max-age=31536000; includeSubDomains"
+})
 
 
 class SecurityHeaders:
     """Security headers middleware configuration."""
     
     @staticmethod
-    def get_security_headers() -> Dict[str, str]:
-        """Return standard security headers."""
-        return {
-            "X-Content-Type-Options": "nosniff",
-            "X-Frame-Options": "DENY",
-            "X-XSS-Protection": "1; mode=block",
-            "Referrer-Policy": "strict-origin-when-cross-origin",
-            "Permissions-Policy": "microphone=(), camera=(), geolocation=()",
-            "Strict-Transport-Security": "max-age=31536000; includeSubDomains"
-        }
+    def get_security_headers() -> Mapping[str, str]:
+        """Return standard security headers (read-only, shared)."""
+        return _SECURITY_HEADERS
 
 
-class RateLimiter:
+class RedisBackoff:
+    """Skip Redis for an exponentially growing window after a failed command."""
+    
+    MAX_DELAY = 30.0
+    
+    def __init__(self, initial_delay: float = 0.5):
+        self._initial_delay = initial_delay
+        self._delay = 0.0
+        self._down_until = 0.0
+    
+    def available(self) -> bool:
+        """Whether Redis should be tried; the first call after a window acts as the probe."""
+        return time.monotonic() >= self._down_until
+    
+    def failed(self, context: str, error: Exception):
+        """Open (or widen) the window, logging only the first failure of an outage."""
+        if not self._delay:
+            logger.error(f"{context}: {error}; skipping Redis while it recovers")
+        self._delay = min(self.MAX_DELAY, self._delay * 2 or self._initial_delay)
+        self._down_until = time.monotonic() + self._delay
+    
+    def succeeded(self):
+        """Close the window after a successful command."""
+        if self._delay:
+            logger.info("Redis reachable again")
+            self._delay = 0.0
+
+
+class RateLimiter(RedisBacked):
     """Redis-based rate limiter."""
     
-    def __init__(self, redis_client=redis_client):
+    def __init__(self, redis_client=SHARED_REDIS, async_redis_client=SHARED_REDIS):
         self.redis = redis_client
+        self.async_redis = async_redis_client
+        self.backoff = RedisBackoff()
+    
+    @staticmethod
+    def _queue_hits(pipe, checks: List[Tuple[str, int, int]]):
+        """Queue INCR plus first-hit EXPIRE for each bucket."""
+        for key, _, window in checks:
+            pipe.incr(key)
+            pipe.expire(key, window, nx=True)
+    
+    @staticmethod
+    def _verdicts(results: list, checks: List[Tuple[str, int, int]]) -> List[bool]:
+        """Compare each bucket's new count with its limit."""
+        return [count <= limit for count, (_, limit, _) in zip(results[::2], checks)]
     
     def is_allowed(self, key: str, limit: int, window: int = 3600) -> bool:
         """Check if request is allowed based on rate limit."""
-        if not self.redis:
-            return True  # Allow if Redis is not available
+        return self.is_allowed_many([(key, limit, window)])[0]
+    
+    def is_allowed_many(self, checks: List[Tuple[str, int, int]]) -> List[bool]:
+        """Count a hit against several (key, limit, window) buckets in one round trip."""
+        if not self.redis or not checks or not self.backoff.available():
+            return [True] * len(checks)
         
         try:
-            current = self.redis.get(key)
-            if current is None:
-                self.redis.setex(key, window, 1)
-                return True
-            
-            if int(current) >= limit:
-                return False
+            pipe = self.redis.pipeline(transaction=False)
+            self._queue_hits(pipe, checks)
+            results = pipe.execute()
+            self.backoff.succeeded()
+            return self._verdicts(results, checks)
             
-            self.redis.incr(key)
-            return True
+        except Exception as e:
+            self.backoff.failed("Rate limiter error", e)
+            return [True] * len(checks)  # Allow if error occurs
+    
+    async def ais_allowed(self, key: str, limit: int, window: int = 3600) -> bool:
+        """Async is_allowed for callers running on the event loop."""
+        return (await self.ais_allowed_many([(key, limit, window)]))[0]
+    
+    async def ais_allowed_many(self, checks: List[Tuple[str, int, int]]) -> List[bool]:
+        """Async is_allowed_many; awaits the round trip instead of blocking the loop."""
+        if not self.async_redis or not checks or not self.backoff.available():
+            return [True] * len(checks)
+        
+        try:
+            pipe = self.async_redis.pipeline(transaction=False)
+            self._queue_hits(pipe, checks)
+            results = await pipe.execute()
+            self.backoff.succeeded()
+            return self._verdicts(results, checks)
             
         except Exception as e:
-            logger.error(f"Rate limiter error: {e}")
-            return True  # Allow if error occurs
+            self.backoff.failed("Rate limiter error", e)
+            return [True] * len(checks)  # Allow if error occurs
     
     def get_remaining(self, key: str, limit: int) -> int:
         """Get remaining requests for the key."""
-        if not self.redis:
+        if not self.redis or not self.backoff.available():
             return limit
         
         try:
             current = self.redis.get(key)
+            self.backoff.succeeded()
             if current is None:
                 return limit
             return max(0, limit - int(current))
-        except:
+        except Exception as e:
+            self.backoff.failed("Rate limiter error", e)
             return limit
 
 
-class TokenBlacklist:
+def _blacklist_key(token: str) -> str:
+    """Redis key for a revoked raw token (128-bit BLAKE2b digest)."""
+    return f"bl2:{hashlib.blake2b(token.encode(), digest_size=16).hexdigest()}"
+
+
+def _legacy_blacklist_key(token: str) -> str:
+    """Pre-BLAKE2b key; entries expire within the refresh token lifetime."""
+    return f"blacklisted_token:{hashlib.sha256(token.encode()).hexdigest()}"
+
+
+def _seconds_until(expires_at: Union[datetime, int]) -> int:
+    """Seconds left before a naive-UTC datetime or a POSIX ``exp`` claim."""
+    if isinstance(expires_at, datetime):
+        return int((expires_at - datetime.utcnow()).total_seconds())
+    return int(expires_at) - int(time.time())
+
+
+class RevokedJtiFilter:
+    """Bloom filter over revoked token IDs: no false negatives, rare false positives."""
+    
+    SIZE_BITS = 1 << 20  # 128 KiB; ~0.1% false positives at 50k revocations
+    HASHES = 4
+    
+    def __init__(self):
+        self._bits = bytearray(self.SIZE_BITS // 8)
+    
+    def _positions(self, jti: str):
+        digest = hashlib.blake2b(jti.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.SIZE_BITS for i in range(self.HASHES))
+    
+    def add(self, jti: str):
+        for pos in self._positions(jti):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+    
+    def __contains__(self, jti: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(jti))
+
+
+class TokenBlacklist(RedisBacked):
     """Redis-based token blacklist."""
     
-    def __init__(self, redis_client=redis_client):
+    # Seconds a known revocation is answered from process memory without Redis
+    LOCAL_CACHE_TTL = 5
+    # Revocations are broadcast here so every worker's filter learns them at once
+    REVOCATION_CHANNEL = "token_revocations"
+    # The filter is rebuilt from Redis this often so expired revocations age out
+    FILTER_REBUILD_INTERVAL = 600
+    # Longest the feed thread waits on pubsub before checking for shutdown
+    FEED_POLL_INTERVAL = 0.1
+    
+    def __init__(self, redis_client=SHARED_REDIS, local_cache_ttl: int = LOCAL_CACHE_TTL):
         self.redis = redis_client
+        self.backoff = RedisBackoff()
+        self._jti_cache = TTLCache(maxsize=10_000, ttl=local_cache_ttl)
+        self._jti_cache_lock = threading.Lock()
+        # Only trusted while the revocation feed is subscribed and caught up
+        self._jti_filter: Optional[RevokedJtiFilter] = None
+        self._feed_stop = threading.Event()
+        self._feed_thread: Optional[threading.Thread] = None
+    
+    def start_revocation_feed(self):
+        """Follow revocations in a background thread so most lookups skip Redis."""
+        if not self.redis or self._feed_thread is not None:
+            return
+        self._feed_stop.clear()
+        self._feed_thread = threading.Thread(
+            target=self._follow_revocations, name="jti-revocations", daemon=True
+        )
+        self._feed_thread.start()
+    
+    def stop_revocation_feed(self):
+        """Stop following revocations; lookups go back to asking Redis."""
+        self._feed_stop.set()
+        if self._feed_thread is not None:
+            self._feed_thread.join(timeout=5)
+            self._feed_thread = None
+        self._jti_filter = None
+    
+    def _load_revoked_jtis(self) -> RevokedJtiFilter:
+        """Build a filter from every revocation currently stored in Redis."""
+        jti_filter = RevokedJtiFilter()
+        for key in self.redis.scan_iter(match="blacklisted_jti:*", count=1000):
+            jti_filter.add(key.decode().partition(":")[2])
+        return jti_filter
     
-    def add_token(self, token: str, expires_at: datetime):
+    def _follow_revocations(self):
+        delay = 1.0
+        while not self._feed_stop.is_set():
+            pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                # Subscribe before scanning so no revocation falls between the two
+                pubsub.subscribe(self.REVOCATION_CHANNEL)
+                self._jti_filter = self._load_revoked_jtis()
+                rebuild_at = time.monotonic() + self.FILTER_REBUILD_INTERVAL
+                delay = 1.0
+                while not self._feed_stop.is_set():
+                    message = pubsub.get_message(timeout=self.FEED_POLL_INTERVAL)
+                    if message is not None:
+                        self._jti_filter.add(message["data"].decode())
+                    if time.monotonic() >= rebuild_at:
+                        self._jti_filter = self._load_revoked_jtis()
+                        rebuild_at = time.monotonic() + self.FILTER_REBUILD_INTERVAL
+            except Exception as e:
+                # A gap in the feed could miss a revocation, so stop trusting the filter
+                self._jti_filter = None
+                logger.warning(f"Revocation feed interrupted: {e}")
+                self._feed_stop.wait(delay)
+                delay = min(RedisBackoff.MAX_DELAY, delay * 2)
+            finally:
+                pubsub.close()
+    
+    def add_token(self, token: str, expires_at: Union[datetime, int]):
         """Add token to blacklist."""
+        # Revocations skip the backoff window: a lost write would leave the token usable
         if not self.redis:
             return
         
         try:
-            key = f"blacklisted_token:{hashlib.sha256(token.encode()).hexdigest()}"
-            ttl = int((expires_at - datetime.utcnow()).total_seconds())
+            ttl = _seconds_until(expires_at)
             if ttl > 0:
-                self.redis.setex(key, ttl, "1")
+                self.redis.setex(_blacklist_key(token), ttl, "1")
+                self.backoff.succeeded()
         except Exception as e:
-            logger.error(f"Token blacklist error: {e}")
+            self.backoff.failed("Token blacklist error", e)
     
     def is_blacklisted(self, token: str) -> bool:
         """Check if token is blacklisted."""
-        if not self.redis:
+        if not self.redis or not self.backoff.available():
             return False
         
         try:
-            key = f"blacklisted_token:{hashlib.sha256(token.encode()).hexdigest()}"
-            return self.redis.exists(key) > 0
+            # One EXISTS covers both keyspaces until legacy entries have expired
+            found = self.redis.exists(_blacklist_key(token), _legacy_blacklist_key(token)) > 0
+            self.backoff.succeeded()
+            return found
         except Exception as e:
-            logger.error(f"Token blacklist check error: {e}")
+            self.backoff.failed("Token blacklist check error", e)
             return False
+    
+    def add_jti(self, jti: str, expires_at: Union[datetime, int]):
+        """Add a token ID to blacklist."""
+        if not self.redis:
+            return
+        
+        try:
+            ttl = _seconds_until(expires_at)
+            if ttl > 0:
+                with self._jti_cache_lock:
+                    self._jti_cache[jti] = True
+                # Written even inside the backoff window; other workers only learn it from Redis
+                pipe = self.redis.pipeline(transaction=False)
+                pipe.setex(f"blacklisted_jti:{jti}", ttl, "1")
+                pipe.publish(self.REVOCATION_CHANNEL, jti)
+                pipe.execute()
+                self.backoff.succeeded()
+        except Exception as e:
+            self.backoff.failed("Token blacklist error", e)
+    
+    def is_jti_blacklisted(self, jti: str) -> bool:
+        """Check if a token ID is blacklisted."""
+        return self.are_jtis_blacklisted([jti])[0]
+    
+    def are_jtis_blacklisted(self, jtis: List[str]) -> List[bool]:
+        """Check several token IDs, asking Redis only about recent cache misses, in one round trip."""
+        if not self.redis:
+            return [False] * len(jtis)
+        
+        with self._jti_cache_lock:
+            cached = [self._jti_cache.get(jti) for jti in jtis]
+        misses = [jti for jti, hit in zip(jtis, cached) if hit is None]
+        jti_filter = self._jti_filter
+        if jti_filter is not None:
+            # A filter miss is a definite "not revoked"; only possible hits go to Redis
+            misses = [jti for jti in misses if jti in jti_filter]
+        if not misses:
+            return [bool(hit) for hit in cached]
+        if not self.backoff.available():
+            return [bool(hit) for hit in cached]
+        
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for jti in misses:
+                pipe.exists(f"blacklisted_jti:{jti}")
+            found = dict(zip(misses, (count > 0 for count in pipe.execute())))
+            self.backoff.succeeded()
+        except Exception as e:
+            self.backoff.failed("Token blacklist check error", e)
+            return [bool(hit) for hit in cached]
+        
+        # Only revocations are cached; a cached "not revoked" would hide a revocation
+        # the filter already knows about for up to LOCAL_CACHE_TTL
+        with self._jti_cache_lock:
+            self._jti_cache.update((jti, True) for jti, revoked in found.items() if revoked)
+        return [found.get(jti, False) if hit is None else hit for jti, hit in zip(jtis, cached)]
+
+
+# Logged (not rejected) when found in uploads; matched case-insensitively in one pass
+_SUSPICIOUS_PATTERN = "|".join(map(re.escape, (
+    '<script', 'javascript:', 'data:', 'vbscript:',
+    'onload=', 'onerror=', 'onclick=', '&lt;script'
+)))
+_SUSPICIOUS_RE = re.compile(_SUSPICIOUS_PATTERN, re.IGNORECASE)
+_SUSPICIOUS_BYTES_RE = re.compile(_SUSPICIOUS_PATTERN.encode(), re.IGNORECASE)
+# Script tags, javascript: links and on* event handlers, stripped in one scan
+_SANITIZE_RE = re.compile(
+    r'<script[^>]*>.*?</script>'
+    r'|javascript:[^"\']*'
+    r'|\son\w+\s*=\s*["\'][^"\']*["\']',
+    re.IGNORECASE | re.DOTALL,
+)
 
 
 class FileValidator:
@@ -124,10 +505,21 @@ class FileValidator:
     MAX_FILE_SIZE = 2 * 1024 * 1024  # 2MB
     
     @staticmethod
-    def validate_file_content(content: str, filename: str) -> bool:
-        """Validate file content for security issues."""
+    def _is_too_large(content: Union[bytes, str]) -> bool:
+        """Check the UTF-8 size limit, encoding text only when its length can't decide."""
+        limit = FileValidator.MAX_FILE_SIZE
+        if isinstance(content, bytes) or len(content) > limit:
+            return len(content) > limit
+        # A character is 1 to 4 bytes, so only this band needs an exact count
+        if len(content) * 4 <= limit:
+            return False
+        return len(content.encode('utf-8')) > limit
+    
+    @staticmethod
+    def validate_file_content(content: Union[bytes, str], filename: str) -> bool:
+        """Validate file content (raw upload bytes or decoded text) for security issues."""
         # Check file size
-        if len(content.encode('utf-8')) > FileValidator.MAX_FILE_SIZE:
+        if FileValidator._is_too_large(content):
             raise ValueError(f"File too large. Maximum size: {FileValidator.MAX_FILE_SIZE / (1024*1024):.1f}MB")
         
         # Check file extension
@@ -141,80 +533,134 @@ class FileValidator:
             raise ValueError("File content cannot be empty")
         
         # Check for potential malicious patterns
-        suspicious_patterns = [
-            '<script', 'javascript:', 'data:', 'vbscript:', 
-            'onload=', 'onerror=', 'onclick=', '&lt;script'
-        ]
-        
-        content_lower = content.lower()
-        for pattern in suspicious_patterns:
-            if pattern in content_lower:
-                logger.warning(f"Suspicious content detected: {pattern}")
-                # Don't reject, but log for monitoring
+        scanner = _SUSPICIOUS_BYTES_RE if isinstance(content, bytes) else _SUSPICIOUS_RE
+        match = scanner.search(content)
+        if match:
+            # Don't reject, but log for monitoring
+            logger.warning("Suspicious content detected: %r", match.group(0))
         
         return True
     
     @staticmethod
     def sanitize_markdown(content: str) -> str:
         """Sanitize markdown content."""
-        # Remove potential XSS vectors while preserving markdown
-        import re
-        
-        # Remove script tags
-        content = re.sub(r'<script[^>]*>.*?</script>', '', content, flags=re.IGNORECASE | re.DOTALL)
-        
-        # Remove javascript: links
-        content = re.sub(r'javascript:[^"\']*', '', content, flags=re.IGNORECASE)
-        
-        # Remove on* event handlers
-        content = re.sub(r'\son\w+\s*=\s*["\'][^"\']*["\']', '', content, flags=re.IGNORECASE)
-        
+        # Remove potential XSS vectors while preserving markdown; clean content
+        # costs one scan, and rescanning catches vectors a removal stitches together
+        content, removed = _SANITIZE_RE.subn('', content)
+        while removed:
+            content, removed = _SANITIZE_RE.subn('', content)
         return content
 
 
+class AuditJsonFormatter(logging.Formatter):
+    """Render audit records as one JSON object per line."""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        event = {
+            "timestamp": datetime.utcfromtimestamp(record.created).isoformat(),
+            "level": record.levelname,
+            "message": record.getMessage(),
+        }
+        event.update(getattr(record, "audit", {}))
+        return orjson.dumps(event, default=str).decode()
+
+
+class DroppingQueueHandler(QueueHandler):
+    """Hand records to a background listener, dropping (and counting) them when the queue is full."""
+    
+    def __init__(self, capacity: int):
+        super().__init__(queue.Queue(maxsize=capacity))
+        self.dropped = 0
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Audit records carry no %-args; formatting happens on the listener thread
+        return record
+    
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
 class AuditLogger:
     """Audit logging for security events."""
     
+    # Records waiting for the writer; beyond this, new records are dropped rather than blocking
+    QUEUE_CAPACITY = 4096
+    
     def __init__(self):
         self.logger = logging.getLogger("security_audit")
+        self._queue_handler: Optional[DroppingQueueHandler] = None
+        self._listener: Optional[QueueListener] = None
+        if not self.logger.handlers:
+            handler = logging.StreamHandler()
+            handler.setFormatter(AuditJsonFormatter())
+            # Requests only enqueue; a stalled sink delays the listener thread, not auth endpoints
+            self._queue_handler = DroppingQueueHandler(self.QUEUE_CAPACITY)
+            self._listener = QueueListener(self._queue_handler.queue, handler)
+            self.logger.addHandler(self._queue_handler)
+            self.logger.propagate = False
+        self._listener_lock = threading.Lock()
+        self._listening = False
+    
+    @property
+    def dropped(self) -> int:
+        """Number of audit records discarded because the queue was full."""
+        return self._queue_handler.dropped if self._queue_handler else 0
+    
+    def start(self):
+        """Start the writer thread if it is not already running (on startup)."""
+        with self._listener_lock:
+            if self._listener is not None and not self._listening:
+                self._listener.start()
+                self._listening = True
+    
+    def flush(self):
+        """Write out queued records and stop the writer thread (on shutdown)."""
+        with self._listener_lock:
+            if self._listening:
+                self._listener.stop()
+                self._listening = False
     
     def log_auth_attempt(self, username: str, success: bool, ip_address: str = None):
         """Log authentication attempt."""
-        event = {
-            "event": "auth_attempt",
-            "username": username,
-            "success": success,
-            "ip_address": ip_address,
-            "timestamp": datetime.utcnow().isoformat()
-        }
-        
-        if success:
-            self.logger.info(f"Successful login: {event}")
-        else:
-            self.logger.warning(f"Failed login attempt: {event}")
+        level = logging.INFO if success else logging.WARNING
+        if not self.logger.isEnabledFor(level):
+            return
+        self.logger.log(
+            level,
+            "Successful login" if success else "Failed login attempt",
+            extra={"audit": {
+                "event": "auth_attempt",
+                "username": username,
+                "success": success,
+                "ip_address": ip_address,
+            }},
+        )
     
     def log_file_upload(self, user_id: int, filename: str, size: int, ip_address: str = None):
         """Log file upload event."""
-        event = {
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        self.logger.info("File upload", extra={"audit": {
             "event": "file_upload",
             "user_id": user_id,
             "filename": filename,
             "size": size,
             "ip_address": ip_address,
-            "timestamp": datetime.utcnow().isoformat()
-        }
-        self.logger.info(f"File upload: {event}")
+        }})
     
     def log_sensitive_operation(self, user_id: int, operation: str, details: str = None):
         """Log sensitive operations."""
-        event = {
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        self.logger.info("Sensitive operation", extra={"audit": {
             "event": "sensitive_operation",
             "user_id": user_id,
             "operation": operation,
             "details": details,
-            "timestamp": datetime.utcnow().isoformat()
-        }
-        self.logger.info(f"Sensitive operation: {event}")
+        }})
 
 
 # Initialize global instances
@@ -223,9 +669,36 @@ token_blacklist = TokenBlacklist()
 audit_logger = AuditLogger()
 
 
+# Per-request memo of verified token payloads, keyed by the full token string
+_decoded_tokens: ContextVar[Optional[Dict[str, dict]]] = ContextVar("decoded_tokens", default=None)
+
+
+def begin_token_cache() -> ContextToken:
+    """Start an empty decoded-token memo for the current request."""
+    return _decoded_tokens.set({})
+
+
+def end_token_cache(token: ContextToken) -> None:
+    """Drop the current request's decoded-token memo."""
+    _decoded_tokens.reset(token)
+
+
+def _verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password, dispatching to passlib only for non-Argon2 hashes."""
+    if hashed_password.startswith("$argon2"):
+        try:
+            return password_hasher.verify(hashed_password, plain_password)
+        except (VerificationError, InvalidHashError):
+            return False
+    return legacy_pwd_context.verify(plain_password, hashed_password)
+
+
 class AuthService:
     """Enhanced service for handling authentication operations."""
     
+    MAX_PASSWORD_LENGTH = 128
+    _dummy_hash: Optional[str] = None
+    
     @staticmethod
     def generate_secure_token() -> str:
         """Generate a cryptographically secure token."""
@@ -233,37 +706,58 @@ class AuthService:
     
     @staticmethod
     def hash_password(password: str) -> str:
-        """Hash a password using Argon2 (with bcrypt fallback)."""
-        return pwd_context.hash(password)
+        """Hash a password with Argon2id on the bounded password pool."""
+        return pwd_executor.submit(password_hasher.hash, password).result()
     
     @staticmethod
     def verify_password(plain_password: str, hashed_password: str) -> bool:
         """Verify a password against its hash."""
         try:
-            return pwd_context.verify(plain_password, hashed_password)
+            return pwd_executor.submit(_verify_password, plain_password, hashed_password).result()
         except Exception as e:
             logger.error(f"Password verification error: {e}")
             return False
     
+    @staticmethod
+    def password_needs_rehash(hashed_password: str) -> bool:
+        """Whether a stored hash is legacy (bcrypt) or uses outdated Argon2 parameters."""
+        if not hashed_password.startswith("$argon2"):
+            return True
+        try:
+            return password_hasher.check_needs_rehash(hashed_password)
+        except InvalidHashError:
+            return True
+    
+    @staticmethod
+    def is_password_well_formed(password: str) -> bool:
+        """Cheap sanity check run before any expensive hash verification."""
+        return 0 < len(password) <= AuthService.MAX_PASSWORD_LENGTH and "\x00" not in password
+    
+    @staticmethod
+    def verify_dummy_password(plain_password: str) -> bool:
+        """Burn one hash verification so unknown users take as long as known ones."""
+        if AuthService._dummy_hash is None:
+            AuthService._dummy_hash = AuthService.hash_password(secrets.token_urlsafe(16))
+        AuthService.verify_password(plain_password, AuthService._dummy_hash)
+        return False
+    
     @staticmethod
     def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
         """Create a JWT access token with shorter expiry."""
         to_encode = data.copy()
-        
-        if expires_delta:
-            expire = datetime.utcnow() + expires_delta
-        else:
-            expire = datetime.utcnow() + timedelta(minutes=settings.jwt_access_expire_minutes)
+        now = int(time.time())
+        lifetime = expires_delta or timedelta(minutes=settings.jwt_access_expire_minutes)
         
         to_encode.update({
-            "exp": expire,
-            "iat": datetime.utcnow(),
-            "type": "access"
+            "exp": now + int(lifetime.total_seconds()),
+            "iat": now,
+            "type": "access",
+            "jti": AuthService.generate_secure_token()
         })
         
         encoded_jwt = jwt.encode(
             to_encode, 
-            settings.jwt_secret, 
+            _JWT_SECRET, 
             algorithm=settings.jwt_algorithm
         )
         return encoded_jwt
@@ -272,37 +766,49 @@ class AuthService:
     def create_refresh_token(data: dict) -> tuple[str, datetime]:
         """Create a JWT refresh token with longer expiry."""
         to_encode = data.copy()
-        expire = datetime.utcnow() + timedelta(days=settings.jwt_refresh_expire_days)
+        now = int(time.time())
+        expire = now + settings.jwt_refresh_expire_days * 86400
         
         to_encode.update({
             "exp": expire,
-            "iat": datetime.utcnow(),
+            "iat": now,
             "type": "refresh",
             "jti": AuthService.generate_secure_token()  # Unique token ID
         })
         
         encoded_jwt = jwt.encode(
             to_encode, 
-            settings.jwt_secret, 
+            _JWT_SECRET, 
             algorithm=settings.jwt_algorithm
         )
-        return encoded_jwt, expire
+        return encoded_jwt, datetime.utcfromtimestamp(expire)
     
     @staticmethod
     def verify_token(token: str, token_type: str = "access") -> Optional[dict]:
         """Verify and decode a JWT token with blacklist check."""
         try:
+            # Signature checks are memoized per request; blacklist and type are not
+            decoded = _decoded_tokens.get()
+            payload = decoded.get(token) if decoded is not None else None
+            if payload is None:
+                payload = jwt.decode(
+                    token, 
+                    _JWT_SECRET, 
+                    algorithms=[settings.jwt_algorithm]
+                )
+                if decoded is not None:
+                    decoded[token] = payload
+            
             # Check if token is blacklisted
-            if token_blacklist.is_blacklisted(token):
+            jti = payload.get("jti")
+            if jti:
+                blacklisted = token_blacklist.is_jti_blacklisted(jti)
+            else:
+                blacklisted = token_blacklist.is_blacklisted(token)
+            if blacklisted:
                 logger.warning("Attempted to use blacklisted token")
                 return None
             
-            payload = jwt.decode(
-                token, 
-                settings.jwt_secret, 
-                algorithms=[settings.jwt_algorithm]
-            )
-            
             # Verify token type
             if payload.get("type") != token_type:
                 logger.warning(f"Token type mismatch: expected {token_type}, got {payload.get('type')}")
@@ -310,7 +816,7 @@ class AuthService:
             
             return payload
             
-        except JWTError as e:
+        except PyJWTError as e:
             logger.warning(f"JWT verification failed: {e}")
             return None
         except Exception as e:
@@ -323,11 +829,22 @@ class AuthService:
         try:
             payload = jwt.decode(
                 token, 
-                settings.jwt_secret, 
+                _JWT_SECRET, 
                 algorithms=[settings.jwt_algorithm]
             )
-            expires_at = datetime.fromtimestamp(payload.get("exp", 0))
-            token_blacklist.add_token(token, expires_at)
+            if payload.get("jti"):
+                AuthService.revoke_token_by_jti(payload["jti"], payload.get("exp", 0))
+                return
+            token_blacklist.add_token(token, payload.get("exp", 0))
+            logger.info("Token revoked successfully")
+        except Exception as e:
+            logger.error(f"Token revocation error: {e}")
+    
+    @staticmethod
+    def revoke_token_by_jti(jti: str, exp: int):
+        """Revoke an already-verified token by its ID, without decoding it again."""
+        try:
+            token_blacklist.add_jti(jti, exp)
             logger.info("Token revoked successfully")
         except Exception as e:
             logger.error(f"Token revocation error: {e}")
@@ -379,15 +896,15 @@ class AuthService:
     def register_user(username: str, email: str, password: str):
         """Register a new user - implementation in UserService."""
         from app.services.user_service import UserService
-        user_service = UserService()
-        return user_service.create_user(username, email, password)
+        with UserService() as user_service:
+            return user_service.create_user(username, email, password)
     
     @staticmethod
     def authenticate(username: str, password: str) -> Optional[str]:
         """Authenticate user and return JWT token."""
         from app.services.user_service import UserService
-        user_service = UserService()
-        user = user_service.authenticate_user(username, password)
+        with UserService() as user_service:
+            user = user_service.authenticate_user(username, password)
         if user:
             access_token_expires = timedelta(minutes=settings.jwt_access_expire_minutes)
             access_token = AuthService.create_access_token(
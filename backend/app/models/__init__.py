@@ -3,6 +3,6 @@
 from .user import User
 from .resume import Resume, ResumeVersion
 from .application import Application
-from .cover_letter import CoverLetter, CoverLetterTemplate
+from .cover_letter import CoverLetter, CoverLetterTemplate, CoverLetterVersion
 
-__all__ = ["User", "Resume", "ResumeVersion", "Application", "CoverLetter", "CoverLetterTemplate"]
+__all__ = ["User", "Resume", "ResumeVersion", "Application", "CoverLetter", "CoverLetterTemplate", "CoverLetterVersion"]
@@ -1,6 +1,6 @@
 """Application model for job application tracking with proper cascade deletion."""
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Date
+from sqlalchemy import DDL, Column, Integer, String, Text, DateTime, ForeignKey, Date, Index, event
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -31,6 +31,26 @@ class Application(Base):
     """
     
     __tablename__ = "applications"
+    __table_args__ = (
+        # Every listing is scoped to one user and ordered by applied_date
+        Index("ix_applications_user_applied_date", "user_id", "applied_date"),
+        # Status-filtered listings; per-user status counts are answered from the index alone
+        Index(
+            "ix_applications_user_status_applied_date",
+            "user_id",
+            "status",
+            "applied_date",
+            postgresql_include=["id"],
+        ),
+        # Company filters are substring ILIKE matches, which only a trigram index can serve
+        Index(
+            "ix_applications_company_trgm",
+            "company",
+            postgresql_using="gin",
+            postgresql_ops={"company": "gin_trgm_ops"},
+        ),
+    )
+    __mapper_args__ = {"eager_defaults": True}
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
@@ -85,13 +105,13 @@ class Application(Base):
     additional_instructions = Column(Text)
     
     # Job details
-    company = Column(String, nullable=False, index=True)
+    company = Column(String, nullable=False)
     position = Column(String, nullable=False)
     job_description = Column(Text)
     
     # Application status
-    status = Column(String, default="Applied", index=True)  # Applied, Interviewing, Rejected, Offer, Withdrawn
-    applied_date = Column(Date, index=True)
+    status = Column(String, default="Applied")  # Applied, Interviewing, Rejected, Offer, Withdrawn
+    applied_date = Column(Date)
     
     # Metadata
     notes = Column(Text)
@@ -121,7 +141,7 @@ class Application(Base):
         "CoverLetterVersion",
         back_populates="applications",
         foreign_keys=[cover_letter_version_id],
-        passive_deletes=False
+        passive_deletes=True
     )
     customized_cover_letter_version = relationship(
         "CoverLetterVersion",
@@ -131,3 +151,11 @@ class Application(Base):
     
     def __repr__(self):
         return f"<Application(id={self.id}, company='{self.company}', position='{self.position}')>"
+
+
+# gin_trgm_ops comes from pg_trgm, which must exist before create_all builds the index
+event.listen(
+    Application.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
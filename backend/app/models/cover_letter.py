@@ -1,10 +1,16 @@
 """Cover Letter and CoverLetterVersion models matching Resume pattern."""
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey
-from sqlalchemy.orm import relationship
+from datetime import datetime
+from typing import TYPE_CHECKING, List, Optional
+from sqlalchemy import String, Text, DateTime, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
 
+if TYPE_CHECKING:
+    from app.models.application import Application
+    from app.models.user import User
+
 class CoverLetterTemplate(Base):
     """Cover letter template model for storing reusable templates.
     
@@ -14,17 +20,19 @@ class CoverLetterTemplate(Base):
     """
     
     __tablename__ = "cover_letter_templates"
+    __mapper_args__ = {"eager_defaults": True}
     
-    id = Column(Integer, primary_key=True, index=True)
-    name = Column(String(255), nullable=False, index=True)
-    description = Column(Text)
-    content_template = Column(
-        Text, 
-        nullable=False,
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    name: Mapped[str] = mapped_column(String, index=True)
+    description: Mapped[Optional[str]] = mapped_column(Text)
+    content_template: Mapped[str] = mapped_column(
+        Text,
         comment="Template content with placeholders like {position}, {company}, etc."
     )
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
     
     def __repr__(self):
         return f"<CoverLetterTemplate(id={self.id}, name='{self.name}')>"
@@ -43,36 +51,43 @@ class CoverLetter(Base):
     """
     
     __tablename__ = "cover_letters"
+    __table_args__ = (
+        # Owner-scoped lookups (WHERE id = ? AND user_id = ?) are a single index seek
+        Index("ix_cover_letters_user_id_id", "user_id", "id"),
+        # Per-user listings, newest first
+        Index("ix_cover_letters_user_created", "user_id", "created_at"),
+    )
+    __mapper_args__ = {"eager_defaults": True}
     
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(
-        Integer, 
-        ForeignKey("users.id", ondelete="CASCADE"), 
-        nullable=False,
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"),
         index=True,
         comment="User who owns this cover letter"
     )
-    title = Column(String(255), nullable=False)
-    is_default = Column(Boolean, default=False, index=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    title: Mapped[str] = mapped_column(String)
+    is_default: Mapped[Optional[bool]] = mapped_column(default=False, index=True)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
     
     # Relationships
-    user = relationship("User", back_populates="cover_letters")
+    user: Mapped["User"] = relationship(back_populates="cover_letters")
     
-    # Versions cascade delete with cover letter
-    versions = relationship(
-        "CoverLetterVersion", 
-        back_populates="cover_letter", 
+    # Versions cascade delete with cover letter; ON DELETE CASCADE removes unloaded ones
+    versions: Mapped[List["CoverLetterVersion"]] = relationship(
+        back_populates="cover_letter",
         cascade="all, delete-orphan",
-        passive_deletes=False
+        passive_deletes=True
     )
     
-    # Applications RESTRICT deletion - must be handled manually
-    applications = relationship(
-        "Application", 
+    # Applications RESTRICT deletion; the service probes for dependents before
+    # deleting, and the collection is never loaded (or nulled out) by the ORM
+    applications: Mapped[List["Application"]] = relationship(
         back_populates="cover_letter",
-        passive_deletes=False
+        passive_deletes="all",
+        lazy="raise"
     )
     
     def __repr__(self):
@@ -92,29 +107,32 @@ class CoverLetterVersion(Base):
     """
     
     __tablename__ = "cover_letter_versions"
+    __table_args__ = (
+        # Version listings and "latest (original) version" lookups per cover letter
+        Index("ix_cover_letter_versions_letter_original_created", "cover_letter_id", "is_original", "created_at"),
+    )
+    __mapper_args__ = {"eager_defaults": True}
     
-    id = Column(Integer, primary_key=True, index=True)
-    cover_letter_id = Column(
-        Integer, 
-        ForeignKey("cover_letters.id", ondelete="CASCADE"), 
-        nullable=False,
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    cover_letter_id: Mapped[int] = mapped_column(
+        ForeignKey("cover_letters.id", ondelete="CASCADE"),
         comment="Parent cover letter - cascade delete versions"
     )
-    version = Column(String(50), nullable=False, index=True)  # e.g., "v1", "v1.1", "v2 - Company Name"
-    markdown_content = Column(Text, nullable=False)
-    job_description = Column(Text)  # JD used for customization, if any
-    is_original = Column(Boolean, default=False, index=True)  # True for master cover letter versions
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    version: Mapped[str] = mapped_column(String, index=True)  # e.g., "v1", "v1.1", "v2 - Company Name"
+    markdown_content: Mapped[str] = mapped_column(Text)
+    job_description: Mapped[Optional[str]] = mapped_column(Text)  # JD used for customization, if any
+    is_original: Mapped[Optional[bool]] = mapped_column(default=False, index=True)  # True for master cover letter versions
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now(), index=True)
     
     # Relationships
-    cover_letter = relationship("CoverLetter", back_populates="versions")
+    cover_letter: Mapped["CoverLetter"] = relationship(back_populates="versions")
     
     # Applications that use this as their cover letter (protected)
-    applications = relationship(
-        "Application",
+    applications: Mapped[List["Application"]] = relationship(
         foreign_keys="Application.cover_letter_version_id",
         back_populates="cover_letter_version",
-        passive_deletes=False
+        passive_deletes="all",  # Never load or null referrers; the RESTRICT FK decides
+        lazy="raise"
     )
     
     def __repr__(self):
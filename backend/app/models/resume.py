@@ -1,10 +1,16 @@
 """Resume and ResumeVersion models with proper cascade deletion constraints."""
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey
-from sqlalchemy.orm import relationship
+from datetime import datetime
+from typing import TYPE_CHECKING, List, Optional
+from sqlalchemy import String, Text, DateTime, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
 
+if TYPE_CHECKING:
+    from app.models.application import Application
+    from app.models.user import User
+
 
 class Resume(Base):
     """Resume model for storing user resumes.
@@ -16,30 +22,38 @@ class Resume(Base):
     """
     
     __tablename__ = "resumes"
+    __table_args__ = (
+        # Owner-scoped lookups (WHERE id = ? AND user_id = ?) are a single index seek
+        Index("ix_resumes_user_id_id", "user_id", "id"),
+    )
+    # INSERT and UPDATE return server-generated timestamps instead of expiring them
+    __mapper_args__ = {"eager_defaults": True}
     
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
-    title = Column(String, nullable=False)
-    is_default = Column(Boolean, default=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
+    title: Mapped[str] = mapped_column(String)
+    is_default: Mapped[Optional[bool]] = mapped_column(default=False)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
     
     # Relationships
-    user = relationship("User", back_populates="resumes")
+    user: Mapped["User"] = relationship(back_populates="resumes")
     
-    # Versions cascade delete with resume
-    versions = relationship(
-        "ResumeVersion", 
-        back_populates="resume", 
+    # Versions cascade delete with resume; ON DELETE CASCADE removes unloaded ones
+    versions: Mapped[List["ResumeVersion"]] = relationship(
+        back_populates="resume",
         cascade="all, delete-orphan",
-        passive_deletes=False  # Application logic handles it
+        passive_deletes=True
     )
     
-    # Applications RESTRICT deletion - must be handled manually
-    applications = relationship(
-        "Application", 
+    # Applications RESTRICT deletion; the service probes for dependents before
+    # deleting, and the collection is never loaded (or nulled out) by the ORM
+    applications: Mapped[List["Application"]] = relationship(
         back_populates="resume",
-        passive_deletes=False  # We handle this in application logic
+        passive_deletes="all",
+        lazy="raise"
     )
     
     def __repr__(self):
@@ -56,29 +70,32 @@ class ResumeVersion(Base):
     """
     
     __tablename__ = "resume_versions"
+    __table_args__ = (
+        # Version listings and "latest (original) version" lookups per resume
+        Index("ix_resume_versions_resume_original_created", "resume_id", "is_original", "created_at"),
+    )
+    __mapper_args__ = {"eager_defaults": True}
     
-    id = Column(Integer, primary_key=True, index=True)
-    resume_id = Column(
-        Integer, 
-        ForeignKey("resumes.id", ondelete="CASCADE"), 
-        nullable=False,
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    resume_id: Mapped[int] = mapped_column(
+        ForeignKey("resumes.id", ondelete="CASCADE"),
         comment="Parent resume - cascade delete versions"
     )
-    version = Column(String, nullable=False, index=True)  # e.g., "v1", "v1.1", "v2 - Company Name"
-    markdown_content = Column(Text, nullable=False)
-    job_description = Column(Text)  # JD used for customization, if any
-    is_original = Column(Boolean, default=False, index=True)  # True for master resume versions
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    version: Mapped[str] = mapped_column(String, index=True)  # e.g., "v1", "v1.1", "v2 - Company Name"
+    markdown_content: Mapped[str] = mapped_column(Text)
+    job_description: Mapped[Optional[str]] = mapped_column(Text)  # JD used for customization, if any
+    is_original: Mapped[Optional[bool]] = mapped_column(default=False, index=True)  # True for master resume versions
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now(), index=True)
     
     # Relationships
-    resume = relationship("Resume", back_populates="versions")
+    resume: Mapped["Resume"] = relationship(back_populates="versions")
     
     # Applications that use this as their original version (protected)
-    applications = relationship(
-        "Application",
+    applications: Mapped[List["Application"]] = relationship(
         foreign_keys="Application.resume_version_id",
         back_populates="resume_version",
-        passive_deletes=False  # Application logic enforces restriction
+        passive_deletes="all",  # Never load or null referrers; the RESTRICT FK decides
+        lazy="raise"
     )
     
     def __repr__(self):
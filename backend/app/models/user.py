@@ -10,6 +10,7 @@ class User(Base):
     """User model for authentication and user management."""
     
     __tablename__ = "users"
+    __mapper_args__ = {"eager_defaults": True}
     
     id = Column(Integer, primary_key=True, index=True)
     username = Column(String, unique=True, index=True, nullable=False)
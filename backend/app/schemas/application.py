@@ -3,7 +3,7 @@
 from datetime import datetime, date
 from typing import Optional
 from uuid import UUID
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 from ..schemas.cover_letter import CoverLetterVersionResponse
 
@@ -65,8 +65,7 @@ class ApplicationResponse(ApplicationBase):
     customized_version_name: Optional[str] = None
     can_download_resume: bool = True
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class CoverLetterSelectionRequest(BaseModel):
@@ -81,6 +80,7 @@ class ApplicationListResponse(BaseModel):
     total: int
     page: int
     per_page: int
+    next_cursor: Optional[str] = None  # Pass back as ?cursor= for the following page
 
 
 class ApplicationStats(BaseModel):
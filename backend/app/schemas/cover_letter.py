@@ -53,14 +53,14 @@ class CoverLetterVersionResponse(BaseModel):
 
 class CoverLetterCreate(BaseModel):
     """Create a new master cover letter."""
-    title: str = Field(..., description="Name of this cover letter")
+    title: str = Field(..., max_length=255, description="Name of this cover letter")
     content: str = Field(default="", description="Initial content for the first version")
     is_default: bool = Field(default=False, description="Whether this is the default cover letter")
 
 
 class CoverLetterUpdate(BaseModel):
     """Update cover letter metadata."""
-    title: Optional[str] = None
+    title: Optional[str] = Field(None, max_length=255)
     is_default: Optional[bool] = None
 
 
@@ -78,6 +78,20 @@ class CoverLetterResponse(BaseModel):
         from_attributes = True
 
 
+class CoverLetterSummaryResponse(BaseModel):
+    """Lightweight cover letter row for list views."""
+    id: int
+    user_id: int
+    title: str
+    is_default: bool
+    version: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+
 class CoverLetterDetailResponse(BaseModel):
     """Detailed cover letter response with versions."""
     id: int
@@ -98,7 +112,7 @@ class CoverLetterDetailResponse(BaseModel):
 
 class CoverLetterGenerateRequest(BaseModel):
     """Request to generate a new cover letter."""
-    title: str = Field(..., description="Name for this cover letter")
+    title: str = Field(..., max_length=255, description="Name for this cover letter")
     resume_id: int = Field(..., description="Resume to use for personalization")
     job_description: str = Field(..., description="Job posting text")
     company: str = Field(..., description="Company name")
@@ -127,47 +141,6 @@ class CoverLetterPreviewResponse(BaseModel):
     content: str
 
 
-# ======================================
-# Legacy Schemas (for backward compatibility)
-# ======================================
-
-class CoverLetterCreateLegacy(BaseModel):
-    """Legacy schema for creating cover letter with content directly."""
-    title: str
-    content: str
-    template_id: Optional[int] = None
-
-
-class CoverLetterUpdateLegacy(BaseModel):
-    """Legacy schema for updating cover letter."""
-    title: Optional[str] = None
-    content: Optional[str] = None
-    template_id: Optional[int] = None
-
-
-class CoverLetterResponseLegacy(BaseModel):
-    """Legacy cover letter response."""
-    id: int
-    user_id: int
-    title: str
-    content: str
-    template_id: Optional[int] = None
-    created_at: datetime
-    updated_at: datetime
-    
-    class Config:
-        from_attributes = True
-
-
-class CoverLetterGenerateRequestLegacy(BaseModel):
-    """Legacy generation request."""
-    resume_id: Optional[int] = None
-    company: str
-    position: str
-    job_description: str
-    template_id: Optional[int] = None
-
-
 class CoverLetterListResponse(BaseModel):
     """Paginated list of cover letters."""
     cover_letters: List[CoverLetterResponse]
@@ -34,6 +34,18 @@ class UserResponse(UserBase):
         from_attributes = True
 
 
+def user_to_response(user) -> UserResponse:
+    """Build a UserResponse from a trusted ORM user without re-validating it."""
+    return UserResponse.model_construct(
+        id=user.id,
+        username=user.username,
+        email=user.email,
+        is_active=user.is_active,
+        created_at=user.created_at,
+        updated_at=user.updated_at,
+    )
+
+
 class UserLogin(BaseModel):
     """Schema for user login."""
     email: EmailStr
@@ -2,15 +2,59 @@
 
 import os
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterator, List, Optional
+import httpx
 import requests
-from groq import Groq
+from groq import AsyncGroq, Groq
 from app.config import settings
 from app.core.exceptions import AIServiceError
 
 
 logger = logging.getLogger(__name__)
 
+# Pooled clients for AI calls so connections (and TLS sessions) to the provider are
+# reused across requests instead of being opened per AIGeneratorClient
+_http_client: Optional[httpx.Client] = None
+_async_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.Client:
+    """Get the shared HTTP client for blocking AI calls."""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.Client(
+            timeout=httpx.Timeout(60.0, connect=5.0),
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=60.0)
+        )
+    return _http_client
+
+
+def close_http_client():
+    """Close the shared blocking HTTP client on shutdown."""
+    global _http_client
+    if _http_client is not None:
+        _http_client.close()
+        _http_client = None
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """Get the shared HTTP client for async AI calls."""
+    global _async_http_client
+    if _async_http_client is None:
+        _async_http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(60.0, connect=5.0),
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50)
+        )
+    return _async_http_client
+
+
+async def close_async_http_client():
+    """Close the shared async HTTP client on shutdown."""
+    global _async_http_client
+    if _async_http_client is not None:
+        await _async_http_client.aclose()
+        _async_http_client = None
+
 
 class AIGeneratorClient:
     """Client for interacting with Groq AI service."""
@@ -24,7 +68,8 @@ class AIGeneratorClient:
             raise AIServiceError("GROQ_API_KEY environment variable is required")
         
         try:
-            self.client = Groq(api_key=self.api_key)
+            self.client = Groq(api_key=self.api_key, http_client=get_http_client())
+            self.async_client = AsyncGroq(api_key=self.api_key, http_client=get_async_http_client())
         except Exception as e:
             logger.error(f"Failed to initialize Groq client: {e}")
             raise AIServiceError("Failed to initialize AI service")
@@ -87,21 +132,21 @@ Generate a professional cover letter:"""
         }
         return templates.get(template_name, "")
     
-    def rewrite_resume(self, resume_markdown: str, job_description: str, instructions: Optional[Dict] = None) -> str:
-        """Return rewritten resume markdown tailored to the JD."""
-        try:
-            # Extract and format custom instructions
-            custom_instructions_text = ""
-            if instructions:
-                # Handle both dict and string types
-                if isinstance(instructions, dict):
-                    # Extract from common keys
-                    instruction_value = instructions.get('custom_instructions') or instructions.get('additional_instructions') or str(instructions)
-                else:
-                    instruction_value = str(instructions)
-                
-                if instruction_value:
-                    custom_instructions_text = f"""🔴 CRITICAL CUSTOM INSTRUCTIONS - HIGHEST PRIORITY 🔴
+    def _rewrite_resume_messages(self, resume_markdown: str, job_description: str,
+                                 instructions: Optional[Dict] = None) -> List[Dict[str, str]]:
+        """Build the chat messages for a resume rewrite request."""
+        # Extract and format custom instructions
+        custom_instructions_text = ""
+        if instructions:
+            # Handle both dict and string types
+            if isinstance(instructions, dict):
+                # Extract from common keys
+                instruction_value = instructions.get('custom_instructions') or instructions.get('additional_instructions') or str(instructions)
+            else:
+                instruction_value = str(instructions)
+            
+            if instruction_value:
+                custom_instructions_text = f"""🔴 CRITICAL CUSTOM INSTRUCTIONS - HIGHEST PRIORITY 🔴
 You MUST follow these specific user instructions EXACTLY as specified.
 These instructions override standard rules if there's a conflict.
 
@@ -110,27 +155,34 @@ CUSTOM INSTRUCTIONS:
 
 ⚠️ IMPORTANT: Apply the above instructions IMMEDIATELY to the resume customization.
 ================================"""
-            
-            # Load and format the prompt template
-            prompt_template = self._load_prompt_template("rewrite_resume")
-            prompt = prompt_template.format(
-                resume_markdown=resume_markdown,
-                job_description=job_description,
-                custom_instructions=custom_instructions_text
-            )
+        
+        # Load and format the prompt template
+        prompt_template = self._load_prompt_template("rewrite_resume")
+        prompt = prompt_template.format(
+            resume_markdown=resume_markdown,
+            job_description=job_description,
+            custom_instructions=custom_instructions_text
+        )
+        
+        return [
+            {
+                "role": "system",
+                "content": "You are an expert resume editor who tailors resumes to specific job descriptions."
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ]
+    
+    def rewrite_resume(self, resume_markdown: str, job_description: str, instructions: Optional[Dict] = None) -> str:
+        """Return rewritten resume markdown tailored to the JD."""
+        try:
+            messages = self._rewrite_resume_messages(resume_markdown, job_description, instructions)
             
             # Make the API call
             chat_completion = self.client.chat.completions.create(
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert resume editor who tailors resumes to specific job descriptions."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
+                messages=messages,
                 model=self.model,
                 temperature=1,
                 max_completion_tokens=8192,
@@ -152,14 +204,43 @@ CUSTOM INSTRUCTIONS:
                 raise
             raise AIServiceError(f"Resume customization failed: {str(e)}")
     
-    def generate_cover_letter(self, template: str, job_description: str, resume_summary: str, 
-                            company: str = "", position: str = "", additional_instructions: Optional[str] = None) -> str:
-        """Return a tailored cover letter (plain text)."""
+    async def arewrite_resume(self, resume_markdown: str, job_description: str,
+                              instructions: Optional[Dict] = None) -> str:
+        """Return rewritten resume markdown without blocking the event loop."""
         try:
-            # Handle custom instructions
-            custom_instructions_text = ""
-            if additional_instructions:
-                custom_instructions_text = f"""🔴 CRITICAL CUSTOM INSTRUCTIONS - HIGHEST PRIORITY 🔴
+            messages = self._rewrite_resume_messages(resume_markdown, job_description, instructions)
+            
+            chat_completion = await self.async_client.chat.completions.create(
+                messages=messages,
+                model=self.model,
+                temperature=1,
+                max_completion_tokens=8192,
+                top_p=1,
+                reasoning_effort="high",
+                stream=False,
+                stop=None
+            )
+            
+            result = chat_completion.choices[0].message.content
+            if not result:
+                raise AIServiceError("Empty response from AI service")
+            
+            return result.strip()
+            
+        except Exception as e:
+            logger.error(f"Failed to rewrite resume: {e}")
+            if isinstance(e, AIServiceError):
+                raise
+            raise AIServiceError(f"Resume customization failed: {str(e)}")
+    
+    def _cover_letter_messages(self, template: str, job_description: str, resume_summary: str,
+                               company: str = "", position: str = "",
+                               additional_instructions: Optional[str] = None) -> List[Dict[str, str]]:
+        """Build the chat messages for a cover letter request."""
+        # Handle custom instructions
+        custom_instructions_text = ""
+        if additional_instructions:
+            custom_instructions_text = f"""🔴 CRITICAL CUSTOM INSTRUCTIONS - HIGHEST PRIORITY 🔴
 You MUST follow these specific user instructions EXACTLY as specified.
 These instructions override standard rules if there's a conflict.
 
@@ -169,31 +250,41 @@ CUSTOM INSTRUCTIONS:
 ⚠️ IMPORTANT: Apply the above instructions IMMEDIATELY to the resume customization.
 ================================"""
 
-            # Load and format the prompt template
-            prompt_template = self._load_prompt_template("cover_letter")
-            prompt = prompt_template.format(
-                company=company,
-                position=position,
-                job_description=job_description,
-                resume_summary=resume_summary,
-                custom_instructions=custom_instructions_text
+        # Load and format the prompt template
+        prompt_template = self._load_prompt_template("cover_letter")
+        prompt = prompt_template.format(
+            company=company,
+            position=position,
+            job_description=job_description,
+            resume_summary=resume_summary,
+            custom_instructions=custom_instructions_text
+        )
+        
+        if template:
+            prompt += f"\n\nTemplate to follow: {template}"
+        
+        return [
+            {
+                "role": "system", 
+                "content": "You are an expert cover letter writer who creates compelling, professional cover letters."
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ]
+    
+    def generate_cover_letter(self, template: str, job_description: str, resume_summary: str, 
+                            company: str = "", position: str = "", additional_instructions: Optional[str] = None) -> str:
+        """Return a tailored cover letter (plain text)."""
+        try:
+            messages = self._cover_letter_messages(
+                template, job_description, resume_summary, company, position, additional_instructions
             )
             
-            if template:
-                prompt += f"\n\nTemplate to follow: {template}"
-            
             # Make the API call
             chat_completion = self.client.chat.completions.create(
-                messages=[
-                    {
-                        "role": "system", 
-                        "content": "You are an expert cover letter writer who creates compelling, professional cover letters."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
+                messages=messages,
                 model=self.model,
                 temperature=1,
                 max_completion_tokens=8192,
@@ -215,6 +306,71 @@ CUSTOM INSTRUCTIONS:
                 raise
             raise AIServiceError(f"Cover letter generation failed: {str(e)}")
     
+    async def agenerate_cover_letter(self, template: str, job_description: str, resume_summary: str,
+                                     company: str = "", position: str = "",
+                                     additional_instructions: Optional[str] = None) -> str:
+        """Return a tailored cover letter (plain text) without blocking the event loop."""
+        try:
+            messages = self._cover_letter_messages(
+                template, job_description, resume_summary, company, position, additional_instructions
+            )
+            
+            chat_completion = await self.async_client.chat.completions.create(
+                messages=messages,
+                model=self.model,
+                temperature=1,
+                max_completion_tokens=8192,
+                top_p=1,
+                reasoning_effort="high",
+                stream=False,
+                stop=None
+            )
+            
+            result = chat_completion.choices[0].message.content
+            if not result:
+                raise AIServiceError("Empty response from AI service")
+            
+            return result.strip()
+            
+        except Exception as e:
+            logger.error(f"Failed to generate cover letter: {e}")
+            if isinstance(e, AIServiceError):
+                raise
+            raise AIServiceError(f"Cover letter generation failed: {str(e)}")
+    
+    def stream_cover_letter(self, template: str, job_description: str, resume_summary: str,
+                            company: str = "", position: str = "",
+                            additional_instructions: Optional[str] = None) -> Iterator[str]:
+        """Yield a tailored cover letter as text deltas while the model produces it."""
+        try:
+            messages = self._cover_letter_messages(
+                template, job_description, resume_summary, company, position, additional_instructions
+            )
+            
+            stream = self.client.chat.completions.create(
+                messages=messages,
+                model=self.model,
+                temperature=1,
+                max_completion_tokens=8192,
+                top_p=1,
+                reasoning_effort="high",
+                stream=True,
+                stop=None
+            )
+            
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    yield delta
+            
+        except Exception as e:
+            logger.error(f"Failed to stream cover letter: {e}")
+            if isinstance(e, AIServiceError):
+                raise
+            raise AIServiceError(f"Cover letter generation failed: {str(e)}")
+    
     def test_connection(self) -> bool:
         """Test the connection to Groq API."""
         try:
@@ -1,40 +1,68 @@
 """Application service for job application tracking operations."""
 
+import asyncio
+import base64
 import logging
+import orjson
 from typing import Optional, List, Dict, Any, Tuple
-from datetime import date, datetime
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, desc
-from app.core.database import get_db
+from datetime import date, datetime, timedelta
+from sqlalchemy.orm import Session, joinedload, selectinload, defer
+from sqlalchemy import and_, or_, desc
+from fastapi import BackgroundTasks
+from starlette.concurrency import run_in_threadpool
+from app.core.database import SessionBacked
 from app.models.application import Application
 from app.models.cover_letter import CoverLetter, CoverLetterVersion
 from app.models.user import User
 from app.models.resume import Resume, ResumeVersion
-from app.core.exceptions import ApplicationNotFoundError, ValidationError, UnauthorizedError
+from app.core.exceptions import AIServiceError, ApplicationNotFoundError, ValidationError, UnauthorizedError
+from app.services.user_service import STATS_STATUSES, USER_STATS_STMT, user_stats_cache
 
 
 logger = logging.getLogger(__name__)
 
+# Listings are ordered newest applied_date first (NULLs first, as PostgreSQL's
+# DESC does natively so the (user_id, applied_date) index can serve it), then id
+_LISTING_ORDER = (Application.applied_date.desc().nulls_first(), Application.id.desc())
 
-class ApplicationService:
+# Listings embed the attached cover letter version; one IN (...) query per page loads
+# each version body once, even when several applications share it
+_WITH_COVER_LETTER_VERSION = selectinload(Application.cover_letter_version).joinedload(CoverLetterVersion.cover_letter)
+
+
+def encode_listing_cursor(application: Application) -> str:
+    """Opaque cursor pointing just past an application in listing order."""
+    applied = application.applied_date.isoformat() if application.applied_date else None
+    return base64.urlsafe_b64encode(orjson.dumps([applied, application.id])).decode()
+
+
+def decode_listing_cursor(cursor: str) -> Tuple[Optional[date], int]:
+    """Decode a listing cursor into its (applied_date, id) position."""
+    try:
+        applied, application_id = orjson.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return (date.fromisoformat(applied) if applied else None), int(application_id)
+    except Exception:
+        raise ValidationError("Invalid pagination cursor")
+
+
+class ApplicationService(SessionBacked):
     """Service for application operations."""
     
     def __init__(self, db: Optional[Session] = None):
         """Initialize application service."""
         self.db = db
     
-    def _get_db(self) -> Session:
-        """Get database session."""
-        if self.db:
-            return self.db
-        return next(get_db())
-    
     def create_application(
         self,
         user_id: int,
-        application_data: "ApplicationCreate"
+        application_data: "ApplicationCreate",
+        customized_markdown: Optional[str] = None,
+        customized_cover_letter: Optional[str] = None
     ) -> Application:
-        """Create an application record with optional AI customization."""
+        """Create an application record with optional AI customization.
+        
+        Precomputed customizations are saved as-is instead of calling the AI service.
+        """
         from app.services.resume_service import ResumeService
         from app.services.cover_letter_service import CoverLetterService
         from app.schemas.application import ApplicationCreate
@@ -45,7 +73,7 @@ class ApplicationService:
         
         try:
             # Validate original resume version belongs to user
-            original_version = db.query(ResumeVersion).join(Resume).filter(
+            original_version = db.query(ResumeVersion.id).join(Resume).filter(
                 and_(
                     ResumeVersion.id == application_data.resume_version_id,
                     Resume.user_id == user_id
@@ -57,7 +85,7 @@ class ApplicationService:
             
             # Validate cover letter version belongs to user (if provided)
             if application_data.cover_letter_version_id:
-                cover_letter_version = db.query(CoverLetterVersion).join(CoverLetter).filter(
+                cover_letter_version = db.query(CoverLetterVersion.id).join(CoverLetter).filter(
                     and_(
                         CoverLetterVersion.id == application_data.cover_letter_version_id,
                         CoverLetter.user_id == user_id
@@ -76,6 +104,7 @@ class ApplicationService:
                     original_version_id=application_data.resume_version_id,
                     job_description=application_data.job_description,
                     company=application_data.company,
+                    customized_markdown=customized_markdown,
                     additional_instructions=application_data.additional_instructions
                 )
                 customized_resume_version_id = customized_version.id
@@ -88,7 +117,7 @@ class ApplicationService:
                     cover_letter_id=application_data.cover_letter_id,
                     job_description=application_data.job_description,
                     company=application_data.company,
-                    customized_content=None,  # Let AI generate
+                    customized_content=customized_cover_letter,  # None lets AI generate
                     additional_instructions=application_data.additional_instructions
                 )
                 customized_cover_letter_version_id = customized_cl_version.id
@@ -114,6 +143,7 @@ class ApplicationService:
             db.add(application)
             db.commit()
             db.refresh(application)
+            user_stats_cache.invalidate(user_id)
             
             logger.info(f"Created application for {application_data.company} - {application_data.position} (ID: {application.id})")
             return application
@@ -125,6 +155,94 @@ class ApplicationService:
                 raise
             raise ValidationError(f"Failed to create application: {str(e)}")
     
+    def _pending_customizations(
+        self,
+        user_id: int,
+        application_data: "ApplicationCreate"
+    ) -> Tuple[Optional[str], bool]:
+        """Return the resume markdown to rewrite and whether a cover letter must be generated.
+        
+        Mirrors the reuse rules of the customize methods: nothing is generated for a
+        company that already has a customized version.
+        """
+        from app.services.resume_service import ResumeService
+        from app.services.cover_letter_service import CoverLetterService
+
+        db = self._get_db()
+        company = application_data.company
+        
+        resume_markdown = None
+        if not ResumeService(db).get_company_version(application_data.resume_id, company):
+            original = db.query(ResumeVersion.markdown_content).join(Resume).filter(
+                and_(
+                    ResumeVersion.id == application_data.resume_version_id,
+                    ResumeVersion.resume_id == application_data.resume_id,
+                    Resume.user_id == user_id
+                )
+            ).first()
+            resume_markdown = original.markdown_content if original else None
+        
+        needs_cover_letter = False
+        if application_data.cover_letter_id:
+            owned = db.query(CoverLetter.id).filter(
+                and_(CoverLetter.id == application_data.cover_letter_id, CoverLetter.user_id == user_id)
+            ).first()
+            existing_cl_version = CoverLetterService(db).get_company_version(
+                application_data.cover_letter_id, company
+            )
+            needs_cover_letter = owned is not None and existing_cl_version is None
+        
+        return resume_markdown, needs_cover_letter
+    
+    async def acreate_application(
+        self,
+        user_id: int,
+        application_data: "ApplicationCreate"
+    ) -> Application:
+        """Create an application, running the resume and cover letter AI calls concurrently."""
+        if not application_data.customize_with_ai:
+            return await run_in_threadpool(self.create_application, user_id, application_data)
+        
+        from app.services.ai_service import AIGeneratorClient
+        
+        resume_markdown, needs_cover_letter = await run_in_threadpool(
+            self._pending_customizations, user_id, application_data
+        )
+        
+        ai_client = AIGeneratorClient()
+        calls = []
+        if resume_markdown is not None:
+            calls.append(ai_client.arewrite_resume(
+                resume_markdown,
+                application_data.job_description,
+                application_data.additional_instructions
+            ))
+        if needs_cover_letter:
+            calls.append(ai_client.agenerate_cover_letter(
+                "",
+                application_data.job_description,
+                "",
+                application_data.company,
+                "",
+                additional_instructions=application_data.additional_instructions
+            ))
+        
+        try:
+            results = list(await asyncio.gather(*calls))
+        except AIServiceError as e:
+            raise ValidationError(f"Failed to customize application: {str(e)}")
+        
+        customized_markdown = results.pop(0) if resume_markdown is not None else None
+        customized_cover_letter = results.pop(0) if needs_cover_letter else None
+        
+        return await run_in_threadpool(
+            self.create_application,
+            user_id,
+            application_data,
+            customized_markdown,
+            customized_cover_letter
+        )
+    
     def get_application(self, user_id: int, application_id: int) -> Application:
         """Get application by ID with all relations."""
         db = self._get_db()
@@ -161,14 +279,20 @@ class ApplicationService:
         status: Optional[str] = None,
         company: Optional[str] = None,
         page: int = 1,
-        per_page: int = 20
-    ) -> Tuple[List[Application], int]:
-        """List applications for a user with optional filters and pagination."""
+        per_page: int = 20,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Application], int, Optional[str]]:
+        """List applications for a user with optional filters and pagination.
+        
+        With a cursor, the page starts right after the cursor's position (keyset
+        pagination) instead of skipping (page - 1) * per_page rows.
+        """
         db = self._get_db()
+        position = decode_listing_cursor(cursor) if cursor else None
         
         try:
             query = db.query(Application).options(
-                joinedload(Application.cover_letter_version).joinedload(CoverLetterVersion.cover_letter)
+                _WITH_COVER_LETTER_VERSION
             ).filter(Application.user_id == user_id)
             
             if status:
@@ -181,8 +305,27 @@ class ApplicationService:
             total = query.count()
             
             # Apply pagination
-            offset = (page - 1) * per_page
-            applications = query.order_by(desc(Application.applied_date)).offset(offset).limit(per_page).all()
+            if position is not None:
+                last_applied, last_id = position
+                if last_applied is None:
+                    query = query.filter(or_(
+                        and_(Application.applied_date.is_(None), Application.id < last_id),
+                        Application.applied_date.isnot(None)
+                    ))
+                else:
+                    query = query.filter(or_(
+                        Application.applied_date < last_applied,
+                        and_(Application.applied_date == last_applied, Application.id < last_id)
+                    ))
+            query = query.order_by(*_LISTING_ORDER)
+            if position is None:
+                query = query.offset((page - 1) * per_page)
+            # One extra row tells whether another page follows
+            applications = query.limit(per_page + 1).all()
+            next_cursor = None
+            if len(applications) > per_page:
+                applications = applications[:per_page]
+                next_cursor = encode_listing_cursor(applications[-1])
 
             for app in applications:
                 if app.cover_letter_version and app.cover_letter_version.cover_letter:
@@ -190,11 +333,11 @@ class ApplicationService:
                 else:
                     app.cover_letter_title = None
             
-            return applications, total
+            return applications, total, next_cursor
             
         except Exception as e:
             logger.error(f"Failed to list applications for user {user_id}: {e}")
-            return [], 0
+            return [], 0, None
     
     
     def delete_application(
@@ -292,6 +435,7 @@ class ApplicationService:
             # Delete the application
             db.delete(application)
             db.commit()
+            user_stats_cache.invalidate(user_id)
             
             result['success'] = True
             result['application_deleted'] = True
@@ -430,26 +574,15 @@ class ApplicationService:
         db = self._get_db()
         
         try:
-            total = db.query(Application).filter(Application.user_id == user_id).count()
-            
-            stats = {}
-            statuses = ["Applied", "Interviewing", "Rejected", "Offer", "Withdrawn"]
-            
-            for status in statuses:
-                count = db.query(Application).filter(
-                    and_(Application.user_id == user_id, Application.status == status)
-                ).count()
-                stats[status.lower()] = count
-            
-            # Recent activity (last 30 days)
-            from datetime import timedelta
+            # Recent activity covers the last 30 days
             recent_date = date.today() - timedelta(days=30)
-            recent = db.query(Application).filter(
-                and_(
-                    Application.user_id == user_id,
-                    Application.applied_date >= recent_date
-                )
-            ).count()
+            counts = db.execute(
+                USER_STATS_STMT, {"user_id": user_id, "recent_date": recent_date}
+            ).one()._mapping
+            
+            total = counts["total"]
+            stats = {status.lower(): counts[status.lower()] for status in STATS_STATUSES}
+            recent = counts["recent_month"]
             
             return {
                 "total": total,
@@ -478,7 +611,9 @@ class ApplicationService:
         try:
             search_pattern = f"%{query}%"
             
-            query_obj = db.query(Application).filter(
+            query_obj = db.query(Application).options(
+                _WITH_COVER_LETTER_VERSION
+            ).filter(
                 and_(
                     Application.user_id == user_id,
                     (
@@ -505,7 +640,9 @@ class ApplicationService:
         db = self._get_db()
         
         try:
-            return db.query(Application).filter(
+            return db.query(Application).options(
+                _WITH_COVER_LETTER_VERSION
+            ).filter(
                 Application.user_id == user_id
             ).order_by(desc(Application.applied_date)).limit(limit).all()
             
@@ -518,7 +655,9 @@ class ApplicationService:
         db = self._get_db()
         
         try:
-            return db.query(Application).filter(
+            return db.query(Application).options(
+                _WITH_COVER_LETTER_VERSION
+            ).filter(
                 and_(
                     Application.user_id == user_id,
                     Application.company.ilike(f"%{company}%")
@@ -544,6 +683,7 @@ class ApplicationService:
             
             db.commit()
             db.refresh(application)
+            user_stats_cache.invalidate(user_id)
             
             logger.info(f"Updated application {application_id}")
             return application
@@ -563,6 +703,7 @@ class ApplicationService:
             application = self.get_application(user_id, application_id)
             application.status = status
             db.commit()
+            user_stats_cache.invalidate(user_id)
             
             logger.info(f"Updated application {application_id} status to {status}")
             
@@ -580,7 +721,7 @@ class ApplicationService:
             application = self.get_application(user_id, application_id)
             
             # Validate cover letter version belongs to user
-            cover_letter_version = db.query(CoverLetterVersion).join(CoverLetter).filter(
+            cover_letter_version = db.query(CoverLetterVersion.id).join(CoverLetter).filter(
                 and_(
                     CoverLetterVersion.id == cover_letter_version_id,
                     CoverLetter.user_id == user_id
@@ -602,19 +743,22 @@ class ApplicationService:
                 raise
             raise ValidationError(f"Failed to attach cover letter: {str(e)}")
 
-    def customize_cover_letter_for_application(self, user_id: int, application_id: int, job_description: Optional[str] = None) -> Application:
+    def customize_cover_letter_for_application(self, user_id: int, application_id: int, job_description: Optional[str] = None,
+                                               background_tasks: Optional[BackgroundTasks] = None) -> Application:
         """Customize a cover letter for an existing application."""
         from app.services.cover_letter_service import CoverLetterService
 
         db = self._get_db()
-        cover_letter_service = CoverLetterService(db)
+        cover_letter_service = CoverLetterService(db, background_tasks=background_tasks)
         try:
             application = self.get_application(user_id, application_id)
             if not application.cover_letter_version_id:
                 raise ValidationError("Application does not have a cover letter to customize.")
 
             # Get the current cover letter version
-            current_version = db.query(CoverLetterVersion).filter(
+            current_version = db.query(CoverLetterVersion).options(
+                defer(CoverLetterVersion.markdown_content), defer(CoverLetterVersion.job_description)
+            ).filter(
                 CoverLetterVersion.id == application.cover_letter_version_id
             ).first()
 
@@ -1,10 +1,15 @@
 """Cover letter service for cover letter management operations."""
 
+import hashlib
 import logging
-from typing import Optional, List, Dict, Any
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
-from app.core.database import get_db
+import threading
+import time
+from typing import Optional, List, Dict, Any, Iterator
+from sqlalchemy.orm import Session, selectinload, defer
+from sqlalchemy import and_, or_, delete, func, select, bindparam
+from cachetools import TTLCache
+from fastapi import BackgroundTasks
+from app.core.database import SessionBacked
 from app.models.cover_letter import CoverLetter, CoverLetterVersion, CoverLetterTemplate
 from app.core.exceptions import ValidationError, UnauthorizedError, CoverLetterNotFoundError
 from app.services.ai_service import AIGeneratorClient
@@ -13,25 +18,50 @@ from app.services.storage_service import StorageService, get_storage_service
 
 logger = logging.getLogger(__name__)
 
+# Owner-scoped lookup built once so its compiled form stays in the engine's statement cache
+_COVER_LETTER_STMT = select(CoverLetter).where(
+    and_(
+        CoverLetter.id == bindparam("cover_letter_id"),
+        CoverLetter.user_id == bindparam("user_id")
+    )
+)
 
-class CoverLetterService:
+# Version rows carry the full body; paths that only check or delete a version skip it
+_WITHOUT_VERSION_BODY = (defer(CoverLetterVersion.markdown_content), defer(CoverLetterVersion.job_description))
+
+# Templates only change on deploy/seed; the ETag is rechecked after a short TTL so seeds
+# run from another process reach every worker
+_TEMPLATES_ETAG_TTL = 300
+_templates_etag: Optional[str] = None
+_templates_etag_checked_at = 0.0
+
+# Detached template rows keyed by id, shared across requests
+_template_cache: TTLCache = TTLCache(maxsize=256, ttl=600)
+_template_cache_lock = threading.Lock()
+
+
+def invalidate_templates_etag():
+    """Drop the cached templates ETag and template rows after templates are written."""
+    global _templates_etag
+    _templates_etag = None
+    with _template_cache_lock:
+        _template_cache.clear()
+
+
+class CoverLetterService(SessionBacked):
     """Service for cover letter operations matching Resume workflow."""
     
-    def __init__(self, db: Optional[Session] = None, storage_service: Optional[StorageService] = None):
+    def __init__(self, db: Optional[Session] = None, storage_service: Optional[StorageService] = None,
+                 background_tasks: Optional[BackgroundTasks] = None):
         """Initialize cover letter service."""
         self.db = db
+        self.background_tasks = background_tasks
         self.ai_client = AIGeneratorClient()
         if storage_service:
             self.storage_service = storage_service
         else:
             self.storage_service = get_storage_service()
     
-    def _get_db(self) -> Session:
-        """Get database session."""
-        if self.db:
-            return self.db
-        return next(get_db())
-    
     # ======================================
     # Master Cover Letter Operations
     # ======================================
@@ -76,7 +106,30 @@ class CoverLetterService:
         db = self._get_db()
         
         try:
-            cover_letter = db.query(CoverLetter).filter(
+            cover_letter = db.execute(
+                _COVER_LETTER_STMT, {"cover_letter_id": cover_letter_id, "user_id": user_id}
+            ).scalars().first()
+            
+            if not cover_letter:
+                raise CoverLetterNotFoundError(cover_letter_id)
+            
+            return cover_letter
+            
+        except Exception as e:
+            logger.error(f"Failed to get cover letter {cover_letter_id}: {e}")
+            if isinstance(e, (ValidationError, CoverLetterNotFoundError)):
+                raise
+            raise ValidationError(f"Failed to retrieve cover letter: {str(e)}")
+
+    def get_cover_letter_with_versions(self, user_id: int, cover_letter_id: int) -> tuple[CoverLetter, List[CoverLetterVersion]]:
+        """Get a cover letter and its versions (newest first) in two fixed queries."""
+        db = self._get_db()
+        
+        try:
+            # selectin keeps version rows (with their content) out of a JOIN against the parent
+            cover_letter = db.query(CoverLetter).options(
+                selectinload(CoverLetter.versions)
+            ).filter(
                 and_(
                     CoverLetter.id == cover_letter_id,
                     CoverLetter.user_id == user_id
@@ -86,7 +139,12 @@ class CoverLetterService:
             if not cover_letter:
                 raise CoverLetterNotFoundError(cover_letter_id)
             
-            return cover_letter
+            versions = sorted(
+                cover_letter.versions,
+                key=lambda v: (v.created_at, v.id),
+                reverse=True
+            )
+            return cover_letter, versions
             
         except Exception as e:
             logger.error(f"Failed to get cover letter {cover_letter_id}: {e}")
@@ -121,6 +179,36 @@ class CoverLetterService:
             logger.error(f"Failed to list cover letters for user {user_id}: {e}")
             return []
 
+    def list_user_cover_letters_summary(self, user_id: int) -> List[Any]:
+        """List cover letters for a user as column-only rows (no ORM hydration)."""
+        db = self._get_db()
+        
+        try:
+            # One label per cover letter: the newest of its original versions
+            latest_original_version = select(CoverLetterVersion.version).where(
+                and_(
+                    CoverLetterVersion.cover_letter_id == CoverLetter.id,
+                    CoverLetterVersion.is_original == True
+                )
+            ).order_by(
+                CoverLetterVersion.created_at.desc(), CoverLetterVersion.id.desc()
+            ).limit(1).correlate(CoverLetter).scalar_subquery()
+            
+            return db.query(
+                CoverLetter.id,
+                CoverLetter.user_id,
+                CoverLetter.title,
+                CoverLetter.is_default,
+                latest_original_version.label("version"),
+                CoverLetter.created_at,
+                CoverLetter.updated_at
+            ).filter(
+                CoverLetter.user_id == user_id
+            ).order_by(CoverLetter.created_at.desc()).all()
+        except Exception as e:
+            logger.error(f"Failed to list cover letters for user {user_id}: {e}")
+            return []
+
     def update_cover_letter(self, user_id: int, cover_letter_id: int, 
                            title: Optional[str] = None, 
                            is_default: Optional[bool] = None) -> CoverLetter:
@@ -282,7 +370,7 @@ class CoverLetterService:
                 raise ValidationError(dependencies['message'])
             
             # Get version to delete
-            version = db.query(CoverLetterVersion).filter(
+            version = db.query(CoverLetterVersion).options(*_WITHOUT_VERSION_BODY).filter(
                 and_(
                     CoverLetterVersion.id == version_id,
                     CoverLetterVersion.cover_letter_id == cover_letter_id
@@ -328,6 +416,50 @@ class CoverLetterService:
             logger.error(f"Failed to generate cover letter content: {e}")
             raise ValidationError(f"Failed to generate content: {str(e)}")
     
+    async def agenerate_content(self, resume_content: str, job_description: str,
+                                company: str, position: str,
+                                template: Optional[str] = None,
+                                additional_instructions: Optional[str] = None) -> str:
+        """Generate cover letter content using AI (preview only) without blocking the event loop."""
+        try:
+            return await self.ai_client.agenerate_cover_letter(
+                template or "",
+                job_description,
+                resume_content,
+                company,
+                position,
+                additional_instructions=additional_instructions
+            )
+        except Exception as e:
+            logger.error(f"Failed to generate cover letter content: {e}")
+            raise ValidationError(f"Failed to generate content: {str(e)}")
+    
+    def _resolve_template_content(self, template_id: Optional[int],
+                                  base_cover_letter_content: Optional[str]) -> Optional[str]:
+        """Get the text that guides generation: explicit base content, else the template's."""
+        if base_cover_letter_content or not template_id:
+            return base_cover_letter_content
+        template = self._get_cached_template(template_id)
+        return template.content_template if template else None
+    
+    def save_generated(self, user_id: int, title: str, content: str, job_description: str) -> CoverLetter:
+        """Save generated content as a new cover letter with its initial version."""
+        cover_letter = self.create_cover_letter(
+            user_id=user_id,
+            title=title,
+            is_default=False
+        )
+        
+        self.create_version(
+            user_id=user_id,
+            cover_letter_id=cover_letter.id,
+            content=content,
+            job_description=job_description,
+            is_original=True
+        )
+        
+        return cover_letter
+    
     def generate_and_save(self, user_id: int, title: str, resume_content: str, 
                          job_description: str, company: str, position: str,
                          template_id: Optional[int] = None,
@@ -335,15 +467,7 @@ class CoverLetterService:
                          additional_instructions: Optional[str] = None) -> CoverLetter:
         """Generate cover letter using AI and save as new cover letter with initial version."""
         try:
-            # Get template name if provided
-            template_content = base_cover_letter_content
-            if not template_content and template_id:
-                db = self._get_db()
-                template = db.query(CoverLetterTemplate).filter(
-                    CoverLetterTemplate.id == template_id
-                ).first()
-                if template:
-                    template_content = template.content_template
+            template_content = self._resolve_template_content(template_id, base_cover_letter_content)
             
             # Generate content
             content = self.generate_content(
@@ -355,23 +479,7 @@ class CoverLetterService:
                 additional_instructions=additional_instructions
             )
             
-            # Create cover letter
-            cover_letter = self.create_cover_letter(
-                user_id=user_id,
-                title=title,
-                is_default=False
-            )
-            
-            # Create initial version
-            self.create_version(
-                user_id=user_id,
-                cover_letter_id=cover_letter.id,
-                content=content,
-                job_description=job_description,
-                is_original=True
-            )
-            
-            return cover_letter
+            return self.save_generated(user_id, title, content, job_description)
             
         except Exception as e:
             logger.error(f"Failed to generate and save cover letter: {e}")
@@ -379,6 +487,41 @@ class CoverLetterService:
                 raise
             raise ValidationError(f"Failed to generate cover letter: {str(e)}")
     
+    def stream_generated_content(self, resume_content: str, job_description: str,
+                                 company: str, position: str,
+                                 template_id: Optional[int] = None,
+                                 base_cover_letter_content: Optional[str] = None,
+                                 additional_instructions: Optional[str] = None) -> Iterator[str]:
+        """Yield AI-generated cover letter text as it arrives (nothing is saved)."""
+        try:
+            template_content = self._resolve_template_content(template_id, base_cover_letter_content)
+            yield from self.ai_client.stream_cover_letter(
+                template_content or "",
+                job_description,
+                resume_content,
+                company,
+                position,
+                additional_instructions=additional_instructions
+            )
+        except Exception as e:
+            logger.error(f"Failed to stream cover letter content: {e}")
+            raise ValidationError(f"Failed to generate content: {str(e)}")
+    
+    @staticmethod
+    def company_version_name(company: str) -> str:
+        """Version name given to a cover letter customized for a company."""
+        return f"v2 - {company}"
+    
+    def get_company_version(self, cover_letter_id: int, company: str) -> Optional[CoverLetterVersion]:
+        """Get the version already customized for a company, if any."""
+        db = self._get_db()
+        return db.query(CoverLetterVersion).filter(
+            and_(
+                CoverLetterVersion.cover_letter_id == cover_letter_id,
+                CoverLetterVersion.version == self.company_version_name(company)
+            )
+        ).first()
+    
     def customize_for_application(self, user_id: int, cover_letter_id: int, 
                                  job_description: str, company: str,
                                  customized_content: Optional[str] = None,
@@ -406,15 +549,10 @@ class CoverLetterService:
                 raise ValidationError("No original version found")
             
             # Define the expected version name for the customization
-            version_name = f"v2 - {company}"
+            version_name = self.company_version_name(company)
 
             # Check if this specific customized version already exists
-            existing_version = db.query(CoverLetterVersion).filter(
-                and_(
-                    CoverLetterVersion.cover_letter_id == cover_letter_id,
-                    CoverLetterVersion.version == version_name
-                )
-            ).first()
+            existing_version = self.get_company_version(cover_letter_id, company)
             
             if existing_version:
                 logger.info(f"Reusing existing version for company {company}: {existing_version.version}")
@@ -519,7 +657,7 @@ class CoverLetterService:
             # Verify ownership and get version
             self.get_cover_letter(user_id, cover_letter_id)
             
-            version = db.query(CoverLetterVersion).filter(
+            version = db.query(CoverLetterVersion).options(*_WITHOUT_VERSION_BODY).filter(
                 and_(
                     CoverLetterVersion.id == version_id,
                     CoverLetterVersion.cover_letter_id == cover_letter_id
@@ -588,29 +726,65 @@ class CoverLetterService:
     # Deletion Operations
     # ======================================
     
+    def _dependent_applications_query(self, user_id: int, cover_letter_id: int, column):
+        """Select column from applications using any version of an owned cover letter."""
+        from app.models.application import Application
+        return select(column).select_from(Application).join(
+            CoverLetterVersion,
+            Application.cover_letter_version_id == CoverLetterVersion.id
+        ).join(
+            CoverLetter,
+            CoverLetterVersion.cover_letter_id == CoverLetter.id
+        ).where(
+            and_(
+                CoverLetter.id == cover_letter_id,
+                CoverLetter.user_id == user_id
+            )
+        )
+    
+    def has_dependent_applications(self, user_id: int, cover_letter_id: int) -> bool:
+        """Check whether any application uses a version of an owned cover letter (stops at the first)."""
+        from app.models.application import Application
+        db = self._get_db()
+        return db.execute(
+            self._dependent_applications_query(user_id, cover_letter_id, Application.id).limit(1)
+        ).first() is not None
+    
     def delete_cover_letter(self, user_id: int, cover_letter_id: int) -> bool:
         """Delete a cover letter only if no applications depend on it.
         
         Raises ValidationError if applications exist.
         """
+        from app.models.application import Application
         db = self._get_db()
         
         try:
-            # Check dependencies
-            dependencies = self.check_dependencies(user_id, cover_letter_id)
-            
-            if not dependencies['can_delete']:
+            if self.has_dependent_applications(user_id, cover_letter_id):
+                # Only the refusal message needs the full count
+                application_count = db.execute(
+                    self._dependent_applications_query(
+                        user_id, cover_letter_id, func.count(Application.id)
+                    )
+                ).scalar()
                 raise ValidationError(
                     f"Cannot delete cover letter. It is referenced by "
-                    f"{dependencies['application_count']} application(s). "
+                    f"{application_count} application(s). "
                     "Delete those applications first."
                 )
             
-            # Verify ownership
-            cover_letter = self.get_cover_letter(user_id, cover_letter_id)
+            # Ownership check and delete in one statement (versions cascade in the database)
+            deleted_id = db.execute(
+                delete(CoverLetter).where(
+                    and_(
+                        CoverLetter.id == cover_letter_id,
+                        CoverLetter.user_id == user_id
+                    )
+                ).returning(CoverLetter.id)
+            ).scalar()
+            
+            if deleted_id is None:
+                raise CoverLetterNotFoundError(cover_letter_id)
             
-            # Delete (cascade will handle versions)
-            db.delete(cover_letter)
             db.commit()
             
             logger.info(f"Deleted cover letter {cover_letter_id}")
@@ -632,25 +806,67 @@ class CoverLetterService:
         db = self._get_db()
         
         try:
-            total = db.query(CoverLetterTemplate).count()
-            templates = db.query(CoverLetterTemplate).order_by(
+            # The window count rides along with the page instead of a separate COUNT(*)
+            rows = db.query(
+                CoverLetterTemplate,
+                func.count().over().label("total")
+            ).order_by(
                 CoverLetterTemplate.created_at.desc()
             ).offset(skip).limit(limit).all()
             
-            return templates, total
+            if rows:
+                total = rows[0].total
+            elif skip:
+                total = db.query(func.count(CoverLetterTemplate.id)).scalar()
+            else:
+                total = 0
+            
+            return [template for template, _ in rows], total
             
         except Exception as e:
             logger.error(f"Failed to list templates: {e}")
             return [], 0
     
+    def get_templates_etag(self) -> str:
+        """Get an ETag identifying the current set of templates."""
+        global _templates_etag, _templates_etag_checked_at
+        now = time.monotonic()
+        if _templates_etag is None or now - _templates_etag_checked_at > _TEMPLATES_ETAG_TTL:
+            db = self._get_db()
+            rows = db.query(CoverLetterTemplate.id, CoverLetterTemplate.updated_at).order_by(
+                CoverLetterTemplate.id
+            ).all()
+            digest = hashlib.blake2b(repr(rows).encode(), digest_size=8).hexdigest()
+            etag = f'"{digest}"'
+            if _templates_etag is not None and etag != _templates_etag:
+                # Written elsewhere; cached rows may be stale
+                with _template_cache_lock:
+                    _template_cache.clear()
+            _templates_etag = etag
+            _templates_etag_checked_at = now
+        return _templates_etag
+    
+    def _get_cached_template(self, template_id: int) -> Optional[CoverLetterTemplate]:
+        """Get a template from the shared cache, loading and detaching it on a miss."""
+        with _template_cache_lock:
+            template = _template_cache.get(template_id)
+        if template is not None:
+            return template
+        
+        db = self._get_db()
+        template = db.query(CoverLetterTemplate).filter(
+            CoverLetterTemplate.id == template_id
+        ).first()
+        if template is not None:
+            db.expunge(template)
+            with _template_cache_lock:
+                _template_cache[template_id] = template
+        return template
+    
     def get_template(self, template_id: int) -> CoverLetterTemplate:
         """Get a specific template."""
-        db = self._get_db()
-        
         try:
-            template = db.query(CoverLetterTemplate).filter(
-                CoverLetterTemplate.id == template_id
-            ).first()
+            template = self._get_cached_template(template_id)
             
             if not template:
                 raise ValidationError(f"Template {template_id} not found")
@@ -668,9 +884,16 @@ class CoverLetterService:
     # ======================================
     
     def _save_to_storage(self, user_id: int, cover_letter_id: int, version: str, content: str):
-        """Save cover letter content to storage."""
+        """Save cover letter content to storage, after the response when running in a request."""
+        file_path = f"users/{user_id}/cover_letters/{cover_letter_id}/versions/{version}/content.md"
+        if self.background_tasks is not None:
+            self.background_tasks.add_task(self._write_to_storage, file_path, content)
+        else:
+            self._write_to_storage(file_path, content)
+    
+    def _write_to_storage(self, file_path: str, content: str):
+        """Write content to storage; the database row stays the source of truth."""
         try:
-            file_path = f"users/{user_id}/cover_letters/{cover_letter_id}/versions/{version}/content.md"
             self.storage_service.save(file_path, content)
         except Exception as e:
             logger.warning(f"Failed to save cover letter to storage: {e}")
@@ -1,6 +1,7 @@
 """HTML rendering service for converting markdown resumes to HTML."""
 
 import os
+import hashlib
 import logging
 from typing import Optional
 from pathlib import Path
@@ -18,7 +19,16 @@ class HTMLRenderer:
     
     def __init__(self):
         """Initialize HTML renderer."""
-        pass
+        # Templates only change with a deploy, which restarts the process
+        self._template_digests = {}
+    
+    def template_digest(self, template_id: str) -> str:
+        """Hash of a template's HTML, so caches of rendered output follow template changes."""
+        digest = self._template_digests.get(template_id)
+        if digest is None:
+            digest = hashlib.sha256(self._load_template(template_id).encode("utf-8")).hexdigest()[:16]
+            self._template_digests[template_id] = digest
+        return digest
     
     def render_markdown_to_html(self, markdown_content: str, template_id: str = "modern") -> str:
         """Convert markdown to HTML using template."""
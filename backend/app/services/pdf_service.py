@@ -1,17 +1,124 @@
 "PDF rendering service for converting HTML content to PDF."
 
-import os
+import hashlib
 import logging
-from typing import Optional
+import multiprocessing
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Iterator
 from abc import ABC, abstractmethod
 from datetime import datetime
-import weasyprint
+from app.config.settings import settings
 from app.core.exceptions import StorageError
+from app.core.security import RedisBacked, RedisBackoff, SHARED_REDIS
 from app.services.storage_service import StorageService, get_storage_service
 from app.services.html_renderer_service import html_renderer
+from app.services.pdf_worker import render_html_to_pdf
 
 logger = logging.getLogger(__name__)
 
+PDF_CHUNK_SIZE = 64 * 1024
+
+_pdf_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_pdf_pool() -> ProcessPoolExecutor:
+    """Get the process pool used for WeasyPrint renders, creating it on first use."""
+    global _pdf_pool
+    if _pdf_pool is None:
+        _pdf_pool = ProcessPoolExecutor(
+            max_workers=max(1, settings.pdf_render_workers),
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _pdf_pool
+
+
+def shutdown_pdf_pool():
+    """Stop the PDF render worker processes."""
+    global _pdf_pool
+    if _pdf_pool is not None:
+        _pdf_pool.shutdown(wait=False, cancel_futures=True)
+        _pdf_pool = None
+
+
+def iter_pdf_chunks(pdf_bytes: bytes, chunk_size: int = PDF_CHUNK_SIZE) -> Iterator[bytes]:
+    """Yield fixed-size, zero-copy slices of a rendered PDF for streaming."""
+    view = memoryview(pdf_bytes)
+    for start in range(0, len(view), chunk_size):
+        yield view[start:start + chunk_size]
+
+
+class PDFCache(RedisBacked):
+    """Content-addressed cache for rendered PDFs (Redis, with a small in-process fallback)."""
+
+    def __init__(self, redis_client=SHARED_REDIS, ttl: int = settings.pdf_cache_ttl_seconds,
+                 local_max_entries: int = 32):
+        self.redis = redis_client
+        self.backoff = RedisBackoff()
+        self.ttl = ttl
+        self.local_max_entries = local_max_entries
+        self._local: "OrderedDict[str, bytes]" = OrderedDict()
+        # Renders run in threadpool workers; the LRU reorder is not atomic
+        self._local_lock = threading.Lock()
+
+    @staticmethod
+    def make_key(markdown_content: str, template_id: str) -> str:
+        """Build a cache key from the exact content and template (including its HTML) being rendered."""
+        template_digest = html_renderer.template_digest(template_id)
+        digest = hashlib.sha256(
+            f"{template_id}\0{template_digest}\0{markdown_content}".encode("utf-8")
+        ).hexdigest()
+        return f"pdf:{digest}"
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return cached PDF bytes, if any."""
+        if self.redis and self.backoff.available():
+            try:
+                pdf_bytes = self.redis.get(key)
+                self.backoff.succeeded()
+                return pdf_bytes
+            except Exception as e:
+                self.backoff.failed("PDF cache read failed", e)
+                return None
+
+        with self._local_lock:
+            pdf_bytes = self._local.get(key)
+            if pdf_bytes is not None:
+                self._local.move_to_end(key)
+        return pdf_bytes
+
+    def set(self, key: str, pdf_bytes: bytes):
+        """Store rendered PDF bytes."""
+        if self.redis and self.backoff.available():
+            try:
+                self.redis.setex(key, self.ttl, pdf_bytes)
+                self.backoff.succeeded()
+                return
+            except Exception as e:
+                self.backoff.failed("PDF cache write failed", e)
+
+        # Also the fallback while Redis is backing off
+        with self._local_lock:
+            self._local[key] = pdf_bytes
+            self._local.move_to_end(key)
+            while len(self._local) > self.local_max_entries:
+                self._local.popitem(last=False)
+
+
+pdf_cache = PDFCache()
+
+
+def render_resume_pdf_cached(pdf_service: "PDFService", markdown_content: str,
+                             template_id: str = "modern") -> bytes:
+    """Render a resume PDF, reusing an earlier render of identical content and template."""
+    key = PDFCache.make_key(markdown_content, template_id)
+    pdf_bytes = pdf_cache.get(key)
+    if pdf_bytes is None:
+        pdf_bytes = pdf_service.generate_resume_pdf(markdown_content, template_id)
+        pdf_cache.set(key, pdf_bytes)
+    return pdf_bytes
+
 
 class PDFRenderer(ABC):
     """Abstract base class for PDF renderers."""
@@ -38,7 +145,8 @@ class WeasyPrintRenderer(PDFRenderer):
     def render_from_html(self, html_content: str) -> bytes:
         """Render HTML to PDF using WeasyPrint."""
         try:
-            return weasyprint.HTML(string=html_content).write_pdf()
+            # Render in a worker process so concurrent renders use all cores instead of holding the GIL
+            return get_pdf_pool().submit(render_html_to_pdf, html_content).result()
         except Exception as e:
             logger.error(f"WeasyPrint PDF generation failed: {e}")
             raise StorageError(f"PDF generation failed: {str(e)}")
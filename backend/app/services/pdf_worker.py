@@ -0,0 +1,10 @@
+"""Process-pool entry points for CPU-heavy PDF rendering.
+
+Kept free of application imports so spawned worker processes start quickly.
+"""
+
+
+def render_html_to_pdf(html_content: str) -> bytes:
+    """Render HTML to PDF bytes with WeasyPrint (runs inside a worker process)."""
+    import weasyprint
+    return weasyprint.HTML(string=html_content).write_pdf()
@@ -2,21 +2,37 @@
 
 import logging
 from typing import Optional, List, Dict, Any
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
-from app.core.database import get_db
+from sqlalchemy.orm import Session, selectinload, defer
+from sqlalchemy import and_, or_, select, bindparam, delete, func
+from app.core.database import SessionBacked
 from app.models.resume import Resume, ResumeVersion
 from app.models.cover_letter import CoverLetter
 from app.schemas.resume import ResumeCreate, ResumeUpdate
 from app.core.exceptions import ResumeNotFoundError, ValidationError, UnauthorizedError
 from app.services.ai_service import AIGeneratorClient
 from app.services.storage_service import StorageService, get_storage_service
+from app.services.user_service import user_stats_cache
 
 
 logger = logging.getLogger(__name__)
 
+# Version rows carry the full markdown body; paths that only check or delete a version skip it
+_WITHOUT_VERSION_BODY = (defer(ResumeVersion.markdown_content), defer(ResumeVersion.job_description))
 
-class ResumeService:
+# Hot lookups are built once so their compiled form stays in the engine's statement cache
+_RESUME_STMT = select(Resume).where(
+    and_(Resume.id == bindparam("resume_id"), Resume.user_id == bindparam("user_id"))
+)
+_LATEST_VERSION_STMT = select(ResumeVersion).join(
+    Resume, Resume.id == ResumeVersion.resume_id
+).where(
+    and_(Resume.id == bindparam("resume_id"), Resume.user_id == bindparam("user_id"))
+).order_by(
+    ResumeVersion.created_at.desc(), ResumeVersion.id.desc()
+).limit(1)
+
+
+class ResumeService(SessionBacked):
     """Service for resume operations."""
     
     def __init__(self, db: Optional[Session] = None, storage_service: Optional[StorageService] = None):
@@ -28,12 +44,6 @@ class ResumeService:
         else:
             self.storage_service = get_storage_service()
     
-    def _get_db(self) -> Session:
-        """Get database session."""
-        if self.db:
-            return self.db
-        return next(get_db())
-    
     def upload_resume(self, user_id: int, title: str, markdown: str) -> Resume:
         """Save master resume and create initial version."""
         db = self._get_db()
@@ -60,6 +70,7 @@ class ResumeService:
             db.add(version)
             db.commit()
             db.refresh(resume)
+            user_stats_cache.invalidate(user_id)
             
             # Save markdown to storage
             self._save_resume_to_storage(user_id, resume.id, "v1", markdown)
@@ -77,9 +88,9 @@ class ResumeService:
         db = self._get_db()
         
         try:
-            resume = db.query(Resume).filter(
-                and_(Resume.id == resume_id, Resume.user_id == user_id)
-            ).first()
+            resume = db.execute(
+                _RESUME_STMT, {"resume_id": resume_id, "user_id": user_id}
+            ).scalars().first()
             
             if not resume:
                 raise ResumeNotFoundError(resume_id)
@@ -128,7 +139,10 @@ class ResumeService:
         db = self._get_db()
         
         try:
-            return db.query(Resume).filter(Resume.user_id == user_id).all()
+            # Versions are serialized with each resume, so fetch them all in one IN (...) query
+            return db.query(Resume).options(
+                selectinload(Resume.versions)
+            ).filter(Resume.user_id == user_id).all()
         except Exception as e:
             logger.error(f"Failed to list resumes for user {user_id}: {e}")
             return []
@@ -136,16 +150,9 @@ class ResumeService:
     def preview_customization(self, user_id: int, resume_id: int, job_description: str, 
                              instructions: Optional[Dict[str, Any]] = None) -> str:
         """Generate customized resume WITHOUT saving to database (preview only)."""
-        db = self._get_db()
-        
         try:
-            # Get the resume and verify ownership
-            resume = self.get_resume(user_id, resume_id)
-            
-            # Get the latest version or original
-            latest_version = db.query(ResumeVersion).filter(
-                ResumeVersion.resume_id == resume_id
-            ).order_by(ResumeVersion.created_at.desc()).first()
+            # Ownership check and newest version in one query
+            latest_version = self.get_latest_version(user_id, resume_id)
             
             if not latest_version:
                 raise ValidationError("No resume version found")
@@ -224,13 +231,8 @@ class ResumeService:
         db = self._get_db()
         
         try:
-            # Get the resume and verify ownership
-            resume = self.get_resume(user_id, resume_id)
-            
-            # Get the latest version or original
-            latest_version = db.query(ResumeVersion).filter(
-                ResumeVersion.resume_id == resume_id
-            ).order_by(ResumeVersion.created_at.desc()).first()
+            # Ownership check and newest version in one query
+            latest_version = self.get_latest_version(user_id, resume_id)
             
             if not latest_version:
                 raise ValidationError("No resume version found")
@@ -299,6 +301,27 @@ class ResumeService:
                 raise
             return []
     
+    def get_latest_version(self, user_id: int, resume_id: int) -> Optional[ResumeVersion]:
+        """Return the newest version of a resume in a single ownership-checked query."""
+        db = self._get_db()
+        
+        try:
+            version = db.execute(
+                _LATEST_VERSION_STMT, {"resume_id": resume_id, "user_id": user_id}
+            ).scalars().first()
+            
+            if version is None:
+                # Distinguish a missing resume from one without versions
+                self.get_resume(user_id, resume_id)
+            
+            return version
+            
+        except Exception as e:
+            logger.error(f"Failed to get latest version for resume {resume_id}: {e}")
+            if isinstance(e, ResumeNotFoundError):
+                raise
+            return None
+    
     def get_resume_version(self, user_id: int, resume_id: int, version_id: int) -> Optional[ResumeVersion]:
         """Get a specific resume version."""
         try:
@@ -486,7 +509,7 @@ class ResumeService:
             # Verify ownership and get version
             self.get_resume(user_id, resume_id)
             
-            version = db.query(ResumeVersion).filter(
+            version = db.query(ResumeVersion).options(*_WITHOUT_VERSION_BODY).filter(
                 and_(
                     ResumeVersion.id == version_id,
                     ResumeVersion.resume_id == resume_id
@@ -592,29 +615,33 @@ class ResumeService:
                 'message': ''
             }
             
-            # Delete all applications first
-            applications = db.query(Application).filter(
-                Application.resume_id == resume_id
-            ).all()
-
-            for app in applications:
-                db.delete(app)
-            
-            # Count versions before deletion
-            version_count = db.query(ResumeVersion).filter(
-                ResumeVersion.resume_id == resume_id
-            ).count()
-            
-            # Delete resume (cascade will handle versions)
-            db.delete(resume)
+            title = resume.title
+            
+            # Bulk teardown in dependency order: applications (RESTRICT on the resume
+            # and its versions), then versions, then the resume itself
+            applications_deleted = db.execute(
+                delete(Application).where(Application.resume_id == resume_id),
+                execution_options={"synchronize_session": False}
+            ).rowcount
+            versions_deleted = db.execute(
+                delete(ResumeVersion).where(ResumeVersion.resume_id == resume_id),
+                execution_options={"synchronize_session": False}
+            ).rowcount
+            db.execute(
+                delete(Resume).where(
+                    and_(Resume.id == resume_id, Resume.user_id == user_id)
+                ),
+                execution_options={"synchronize_session": False}
+            )
             db.commit()
+            user_stats_cache.invalidate(user_id)
             
             result['success'] = True
             result['resume_deleted'] = True
-            result['versions_deleted'] = version_count
-            result['applications_deleted'] = len(applications)
+            result['versions_deleted'] = versions_deleted
+            result['applications_deleted'] = applications_deleted
             result['message'] = (
-                f"Deleted resume '{resume.title}', "
+                f"Deleted resume '{title}', "
                 f"{result['applications_deleted']} application(s), "
                 f"and {result['versions_deleted']} version(s)."
             )
@@ -699,30 +726,50 @@ class ResumeService:
                 raise
             raise ValidationError(f"Failed to reassign applications: {str(e)}")
     
+    def has_dependent_applications(self, user_id: int, resume_id: int) -> bool:
+        """Check whether any application references an owned resume (stops at the first)."""
+        from app.models.application import Application
+        db = self._get_db()
+        return db.execute(
+            select(Application.id).join(
+                Resume, Application.resume_id == Resume.id
+            ).where(
+                and_(Resume.id == resume_id, Resume.user_id == user_id)
+            ).limit(1)
+        ).first() is not None
+    
     def delete_resume(self, user_id: int, resume_id: int) -> bool:
         """Delete a resume only if no applications depend on it.
         
         Raises ValidationError if applications exist.
         """
+        from app.models.application import Application
         db = self._get_db()
         
         try:
-            # Check dependencies first
-            dependencies = self.check_resume_dependencies(user_id, resume_id)
-            
-            if not dependencies['can_delete']:
+            if self.has_dependent_applications(user_id, resume_id):
+                # Only the refusal message needs the full count
+                application_count = db.query(func.count(Application.id)).filter(
+                    and_(Application.resume_id == resume_id, Application.user_id == user_id)
+                ).scalar()
                 raise ValidationError(
                     f"Cannot delete resume. It is referenced by "
-                    f"{dependencies['application_count']} application(s). "
+                    f"{application_count} application(s). "
                     "Delete those applications first, or use the force delete option."
                 )
             
-            # Verify ownership
-            resume = self.get_resume(user_id, resume_id)
+            # Ownership check and delete in one statement (versions cascade in the database)
+            deleted_id = db.execute(
+                delete(Resume).where(
+                    and_(Resume.id == resume_id, Resume.user_id == user_id)
+                ).returning(Resume.id)
+            ).scalar()
+            
+            if deleted_id is None:
+                raise ResumeNotFoundError(resume_id)
             
-            # Delete from database (cascade will handle versions)
-            db.delete(resume)
             db.commit()
+            user_stats_cache.invalidate(user_id)
             
             logger.info(f"Deleted resume {resume_id}")
             return True
@@ -746,7 +793,7 @@ class ResumeService:
                 raise ValidationError(dependencies['message'])
             
             # Get the version to delete
-            version = db.query(ResumeVersion).filter(
+            version = db.query(ResumeVersion).options(*_WITHOUT_VERSION_BODY).filter(
                 and_(
                     ResumeVersion.id == version_id,
                     ResumeVersion.resume_id == resume_id
@@ -770,6 +817,16 @@ class ResumeService:
                 raise
             return False
     
+    def get_company_version(self, resume_id: int, company: str) -> Optional[ResumeVersion]:
+        """Get the version already customized for a company, if any."""
+        db = self._get_db()
+        return db.query(ResumeVersion).filter(
+            and_(
+                ResumeVersion.resume_id == resume_id,
+                ResumeVersion.version.like(f"% - {company}")
+            )
+        ).first()
+    
     def customize_resume_for_application(self, user_id: int, resume_id: int, 
                                        original_version_id: int, job_description: str, 
                                        company: str, customized_markdown: Optional[str] = None,
@@ -797,13 +854,7 @@ class ResumeService:
                 raise ValidationError("Original resume version not found")
             
             # Check if a customized version for this company already exists
-            company_suffix = f" - {company}"
-            existing_version = db.query(ResumeVersion).filter(
-                and_(
-                    ResumeVersion.resume_id == resume_id,
-                    ResumeVersion.version.like(f"%{company_suffix}")
-                )
-            ).first()
+            existing_version = self.get_company_version(resume_id, company)
             
             if existing_version:
                 logger.info(f"Reusing existing version for company {company}: {existing_version.version}")
@@ -889,7 +940,7 @@ class ResumeService:
         
         try:
             # Get the version and check if it's a customized version
-            version = db.query(ResumeVersion).join(Resume).filter(
+            version = db.query(ResumeVersion).options(*_WITHOUT_VERSION_BODY).join(Resume).filter(
                 and_(
                     ResumeVersion.id == version_id,
                     Resume.user_id == user_id,
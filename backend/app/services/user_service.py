@@ -1,11 +1,16 @@
 """User service for user management operations."""
 
 import logging
-from typing import Optional
+from typing import Optional, Dict, Any
+from datetime import date, timedelta
+from sqlalchemy import bindparam, func, select
 from sqlalchemy.orm import Session
-from app.core.database import get_db
-from app.core.security import AuthService
+from app.core.database import SessionBacked
+from app.config import settings
+from app.core.security import AuthService, RedisBacked, RedisBackoff, SHARED_REDIS
 from app.models.user import User
+from app.models.resume import Resume
+from app.models.application import Application
 from app.schemas.user import UserCreate, UserUpdate
 from app.core.exceptions import ValidationError
 
@@ -13,19 +18,78 @@ from app.core.exceptions import ValidationError
 logger = logging.getLogger(__name__)
 
 
-class UserService:
+class UserCache(RedisBacked):
+    """Serialized per-user JSON payloads in Redis, invalidated on writes."""
+    
+    def __init__(self, prefix: str, ttl: int, redis_client=SHARED_REDIS):
+        self.prefix = prefix
+        self.ttl = ttl
+        self.redis = redis_client
+        self.backoff = RedisBackoff()
+    
+    def make_key(self, user_id: int) -> str:
+        """Build the cache key for a user."""
+        return f"{self.prefix}:{user_id}"
+    
+    def get(self, user_id: int) -> Optional[bytes]:
+        """Return the cached JSON, if any."""
+        if not self.redis or not self.backoff.available():
+            return None
+        try:
+            payload = self.redis.get(self.make_key(user_id))
+            self.backoff.succeeded()
+            return payload
+        except Exception as e:
+            self.backoff.failed(f"User cache read failed for {self.prefix}", e)
+            return None
+    
+    def set(self, user_id: int, payload: bytes):
+        """Store a serialized payload."""
+        if not self.redis or not self.backoff.available():
+            return
+        try:
+            self.redis.setex(self.make_key(user_id), self.ttl, payload)
+            self.backoff.succeeded()
+        except Exception as e:
+            self.backoff.failed(f"User cache write failed for {self.prefix}", e)
+    
+    def invalidate(self, user_id: int):
+        """Drop a user's cached payload."""
+        # Tried even while backing off, so a recovered Redis doesn't serve the old payload
+        if not self.redis:
+            return
+        try:
+            self.redis.delete(self.make_key(user_id))
+            self.backoff.succeeded()
+        except Exception as e:
+            self.backoff.failed(f"User cache invalidation failed for {self.prefix}", e)
+
+
+STATS_STATUSES = ("Applied", "Interviewing", "Rejected", "Offer", "Withdrawn")
+
+# Resume count and every application counter for one user in a single round trip,
+# shared by /users/stats and /applications/stats; (user_id, status, applied_date)
+# covers all referenced application columns, so this is an index-only scan
+USER_STATS_STMT = select(
+    select(func.count(Resume.id)).where(
+        Resume.user_id == bindparam("user_id")
+    ).scalar_subquery().label("resumes"),
+    func.count().label("total"),
+    *(func.count().filter(Application.status == status).label(status.lower()) for status in STATS_STATUSES),
+    func.count().filter(Application.applied_date >= bindparam("recent_date")).label("recent_month"),
+).where(Application.user_id == bindparam("user_id"))
+
+
+user_stats_cache = UserCache("user:stats", settings.stats_cache_ttl)
+
+
+class UserService(SessionBacked):
     """Service for user operations."""
     
     def __init__(self, db: Optional[Session] = None):
         """Initialize user service."""
         self.db = db
     
-    def _get_db(self) -> Session:
-        """Get database session."""
-        if self.db:
-            return self.db
-        return next(get_db())
-    
     def create_user(self, username: str, email: str, password: str) -> User:
         """Create a new user."""
         db = self._get_db()
@@ -65,6 +129,10 @@ class UserService:
     
     def authenticate_user(self, email: str, password: str) -> Optional[User]:
         """Authenticate a user by email and password."""
+        if not AuthService.is_password_well_formed(password):
+            logger.warning(f"Authentication failed - malformed password: {email}")
+            return None
+        
         db = self._get_db()
         
         try:
@@ -72,6 +140,7 @@ class UserService:
             
             if not user:
                 logger.warning(f"Authentication failed - user not found: {email}")
+                AuthService.verify_dummy_password(password)
                 return None
             
             if not user.is_active:
@@ -82,6 +151,9 @@ class UserService:
                 logger.warning(f"Authentication failed - invalid password: {email}")
                 return None
             
+            if AuthService.password_needs_rehash(user.hashed_password):
+                self._upgrade_password_hash(user, password)
+            
             logger.info(f"User authenticated successfully: {email}")
             return user
             
@@ -89,12 +161,24 @@ class UserService:
             logger.error(f"Authentication error for user {email}: {e}")
             return None
     
+    def _upgrade_password_hash(self, user: User, password: str) -> None:
+        """Re-hash a verified password with the current Argon2 parameters."""
+        db = self._get_db()
+        
+        try:
+            user.hashed_password = AuthService.hash_password(password)
+            db.commit()
+            logger.info(f"Upgraded password hash for user {user.id}")
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to upgrade password hash for user {user.id}: {e}")
+    
     def get_user_by_id(self, user_id: int) -> Optional[User]:
         """Get user by ID."""
         db = self._get_db()
         
         try:
-            return db.query(User).filter(User.id == user_id).first()
+            return db.get(User, user_id)
         except Exception as e:
             logger.error(f"Failed to get user by ID {user_id}: {e}")
             return None
@@ -114,7 +198,7 @@ class UserService:
         db = self._get_db()
         
         try:
-            user = db.query(User).filter(User.id == user_id).first()
+            user = db.get(User, user_id)
             if not user:
                 return None
             
@@ -146,6 +230,8 @@ class UserService:
             
             db.commit()
             db.refresh(user)
+            # The cached /stats body carries the username
+            user_stats_cache.invalidate(user_id)
             
             logger.info(f"Updated user: {user.username} (ID: {user.id})")
             return user
@@ -162,7 +248,7 @@ class UserService:
         db = self._get_db()
         
         try:
-            user = db.query(User).filter(User.id == user_id).first()
+            user = db.get(User, user_id)
             if not user:
                 return False
             
@@ -182,13 +268,14 @@ class UserService:
         db = self._get_db()
         
         try:
-            user = db.query(User).filter(User.id == user_id).first()
+            user = db.get(User, user_id)
             if not user:
                 return False
             
             # Delete user (cascade will handle related records)
             db.delete(user)
             db.commit()
+            user_stats_cache.invalidate(user_id)
             
             logger.info(f"Deleted user data for user ID: {user_id}")
             return True
@@ -197,3 +284,11 @@ class UserService:
             db.rollback()
             logger.error(f"Failed to delete user data {user_id}: {e}")
             return False
+    
+    def get_user_stats(self, user_id: int) -> Dict[str, Any]:
+        """Get resume and application counts for a user."""
+        db = self._get_db()
+        
+        recent_date = date.today() - timedelta(days=30)
+        row = db.execute(USER_STATS_STMT, {"user_id": user_id, "recent_date": recent_date}).one()
+        return dict(row._mapping)
@@ -6,6 +6,7 @@
 
 -- Enable required extensions
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
 
 -- ======================================
 -- Users table
@@ -26,7 +27,7 @@ CREATE TABLE IF NOT EXISTS users (
 CREATE TABLE IF NOT EXISTS resumes (
     id SERIAL PRIMARY KEY,
     user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
-    title VARCHAR(255) NOT NULL,
+    title VARCHAR NOT NULL,
     is_default BOOLEAN DEFAULT false,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
@@ -38,7 +39,7 @@ CREATE TABLE IF NOT EXISTS resumes (
 CREATE TABLE IF NOT EXISTS resume_versions (
     id SERIAL PRIMARY KEY,
     resume_id INTEGER NOT NULL REFERENCES resumes(id) ON DELETE CASCADE,
-    version VARCHAR(50) NOT NULL,
+    version VARCHAR NOT NULL,
     markdown_content TEXT NOT NULL,
     job_description TEXT,
     is_original BOOLEAN DEFAULT false,
@@ -50,7 +51,7 @@ CREATE TABLE IF NOT EXISTS resume_versions (
 -- ======================================
 CREATE TABLE IF NOT EXISTS cover_letter_templates (
     id SERIAL PRIMARY KEY,
-    name VARCHAR(255) NOT NULL,
+    name VARCHAR NOT NULL,
     description TEXT,
     content_template TEXT NOT NULL,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
@@ -80,7 +81,7 @@ COMMENT ON COLUMN cover_letter_templates.content_template IS
 CREATE TABLE IF NOT EXISTS cover_letters (
     id SERIAL PRIMARY KEY,
     user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
-    title VARCHAR(255) NOT NULL,
+    title VARCHAR NOT NULL,
     is_default BOOLEAN DEFAULT false,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
@@ -88,8 +89,10 @@ CREATE TABLE IF NOT EXISTS cover_letters (
 
 -- Indexes for cover_letters
 CREATE INDEX IF NOT EXISTS idx_cover_letters_user_id ON cover_letters(user_id);
+CREATE INDEX IF NOT EXISTS ix_cover_letters_user_id_id ON cover_letters(user_id, id);
 CREATE INDEX IF NOT EXISTS idx_cover_letters_is_default ON cover_letters(is_default);
 CREATE INDEX IF NOT EXISTS idx_cover_letters_created_at ON cover_letters(created_at);
+CREATE INDEX IF NOT EXISTS ix_cover_letters_user_created ON cover_letters(user_id, created_at);
 
 -- Comments for cover_letters
 COMMENT ON TABLE cover_letters IS 
@@ -107,7 +110,7 @@ COMMENT ON COLUMN cover_letters.is_default IS
 CREATE TABLE IF NOT EXISTS cover_letter_versions (
     id SERIAL PRIMARY KEY,
     cover_letter_id INTEGER NOT NULL REFERENCES cover_letters(id) ON DELETE CASCADE,
-    version VARCHAR(50) NOT NULL,
+    version VARCHAR NOT NULL,
     markdown_content TEXT NOT NULL,
     job_description TEXT,
     is_original BOOLEAN DEFAULT false,
@@ -119,6 +122,8 @@ CREATE INDEX IF NOT EXISTS idx_cover_letter_versions_cover_letter_id ON cover_le
 CREATE INDEX IF NOT EXISTS idx_cover_letter_versions_version ON cover_letter_versions(version);
 CREATE INDEX IF NOT EXISTS idx_cover_letter_versions_is_original ON cover_letter_versions(is_original);
 CREATE INDEX IF NOT EXISTS idx_cover_letter_versions_created_at ON cover_letter_versions(created_at);
+CREATE INDEX IF NOT EXISTS ix_cover_letter_versions_letter_original_created
+ON cover_letter_versions(cover_letter_id, is_original, created_at);
 
 -- Comments for cover_letter_versions
 COMMENT ON TABLE cover_letter_versions IS 
@@ -212,20 +217,24 @@ CREATE INDEX IF NOT EXISTS idx_users_username ON users(username);
 
 -- Resume queries
 CREATE INDEX IF NOT EXISTS idx_resumes_user_id ON resumes(user_id);
+CREATE INDEX IF NOT EXISTS ix_resumes_user_id_id ON resumes(user_id, id);
 CREATE INDEX IF NOT EXISTS idx_resume_versions_resume_id ON resume_versions(resume_id);
 CREATE INDEX IF NOT EXISTS idx_resume_versions_is_original ON resume_versions(is_original);
 CREATE INDEX IF NOT EXISTS idx_resume_versions_created_at ON resume_versions(created_at);
+CREATE INDEX IF NOT EXISTS ix_resume_versions_resume_original_created
+ON resume_versions(resume_id, is_original, created_at);
 
 -- Application queries
-CREATE INDEX IF NOT EXISTS idx_applications_user_id ON applications(user_id);
 CREATE INDEX IF NOT EXISTS idx_applications_resume_id ON applications(resume_id);
 CREATE INDEX IF NOT EXISTS idx_applications_resume_version_id ON applications(resume_version_id);
 CREATE INDEX IF NOT EXISTS idx_applications_customized_resume_version_id 
 ON applications(customized_resume_version_id);
 CREATE INDEX IF NOT EXISTS idx_applications_cover_letter_version_id ON applications(cover_letter_version_id);
-CREATE INDEX IF NOT EXISTS idx_applications_status ON applications(status);
-CREATE INDEX IF NOT EXISTS idx_applications_company ON applications(company);
-CREATE INDEX IF NOT EXISTS idx_applications_applied_date ON applications(applied_date);
+CREATE INDEX IF NOT EXISTS ix_applications_user_applied_date ON applications(user_id, applied_date);
+CREATE INDEX IF NOT EXISTS ix_applications_user_status_applied_date
+ON applications(user_id, status, applied_date) INCLUDE (id);
+CREATE INDEX IF NOT EXISTS ix_applications_company_trgm
+ON applications USING gin (company gin_trgm_ops);
 
 -- ======================================
 -- Triggers for updated_at timestamps
@@ -1,15 +1,22 @@
 """FastAPI application entry point for Resumator with enhanced security."""
 
 import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from starlette.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from app.api import api_router # Revert to importing api_router
 # from app.api.v1 import auth # Comment out this line
 from app.core.database import engine, Base
 from app.core.middleware import SecurityMiddleware
+from app.services.pdf_service import shutdown_pdf_pool
+from app.services.ai_service import close_async_http_client, close_http_client
+from app.core.security import audit_logger, close_async_redis, get_redis, token_blacklist
 from app.config.settings import settings
 import urllib.parse
+from sqlalchemy.orm import configure_mappers
 
 # Configure logging
 logging.basicConfig(
@@ -19,12 +26,31 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-# Create database tables
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup and shutdown hooks."""
+    security_layers = sum(1 for m in app.user_middleware if m.cls is SecurityMiddleware)
+    if security_layers != 1:
+        raise RuntimeError(f"Expected one SecurityMiddleware, found {security_layers}")
+    # Connect to Redis now so the first request doesn't pay for it
+    get_redis()
+    token_blacklist.start_revocation_feed()
+    audit_logger.start()
+    yield
+    # Joining the feed thread blocks, so keep it off the event loop
+    await run_in_threadpool(token_blacklist.stop_revocation_feed)
+    shutdown_pdf_pool()
+    await close_async_http_client()
+    close_http_client()
+    await close_async_redis()
+    audit_logger.flush()
 
 
 def create_application() -> FastAPI:
     """Create and configure the FastAPI application with enhanced security."""
     Base.metadata.create_all(bind=engine)
+    # Resolve every relationship once at startup instead of on the first query
+    configure_mappers()
     
     app = FastAPI(
         title="Resumator API",
@@ -33,7 +59,9 @@ def create_application() -> FastAPI:
         docs_url="/docs" if settings.debug else None,  # Disable docs in production
         redoc_url="/redoc" if settings.debug else None,
         openapi_url="/openapi.json" if settings.debug else None,
-        redirect_slashes=False  # Prevent 307 redirects for trailing slashes
+        redirect_slashes=False,  # Prevent 307 redirects for trailing slashes
+        default_response_class=ORJSONResponse,
+        lifespan=lifespan
     )
     
     # Add security middleware first
@@ -0,0 +1,51 @@
+"""Add owner lookup indexes
+
+Revision ID: 3f1a9c2d7b64
+Revises: e8b9b0a8a7a0
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1a9c2d7b64'
+down_revision: Union[str, Sequence[str], None] = 'e8b9b0a8a7a0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside the migration transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_cover_letters_user_id_id',
+            'cover_letters',
+            ['user_id', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_resumes_user_id_id',
+            'resumes',
+            ['user_id', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_resumes_user_id_id',
+            table_name='resumes',
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_cover_letters_user_id_id',
+            table_name='cover_letters',
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,40 @@
+"""Add application status count index
+
+Revision ID: 9d2e4b7c1a05
+Revises: 3f1a9c2d7b64
+Create Date: 2026-10-16 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d2e4b7c1a05'
+down_revision: Union[str, Sequence[str], None] = '3f1a9c2d7b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside the migration transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_applications_user_status',
+            'applications',
+            ['user_id', 'status'],
+            unique=False,
+            postgresql_include=['id'],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_applications_user_status',
+            table_name='applications',
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,62 @@
+"""Replace single-column application indexes with user-scoped composites
+
+Revision ID: b41c7e9f2d13
+Revises: 9d2e4b7c1a05
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b41c7e9f2d13'
+down_revision: Union[str, Sequence[str], None] = '9d2e4b7c1a05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside the migration transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_applications_user_applied_date',
+            'applications',
+            ['user_id', 'applied_date'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_applications_user_status_applied_date',
+            'applications',
+            ['user_id', 'status', 'applied_date'],
+            unique=False,
+            postgresql_include=['id'],
+            postgresql_concurrently=True,
+        )
+        for index_name in (
+            'ix_applications_user_status',
+            'ix_applications_status',
+            'ix_applications_applied_date',
+            'ix_applications_company',
+        ):
+            op.drop_index(index_name, table_name='applications', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('ix_applications_company', 'applications', ['company'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_applications_applied_date', 'applications', ['applied_date'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_applications_status', 'applications', ['status'], unique=False, postgresql_concurrently=True)
+        op.create_index(
+            'ix_applications_user_status',
+            'applications',
+            ['user_id', 'status'],
+            unique=False,
+            postgresql_include=['id'],
+            postgresql_concurrently=True,
+        )
+        op.drop_index('ix_applications_user_status_applied_date', table_name='applications', postgresql_concurrently=True)
+        op.drop_index('ix_applications_user_applied_date', table_name='applications', postgresql_concurrently=True)
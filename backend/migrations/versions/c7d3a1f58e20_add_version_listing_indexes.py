@@ -0,0 +1,37 @@
+"""Add composite indexes for version and cover letter listings
+
+Revision ID: c7d3a1f58e20
+Revises: b41c7e9f2d13
+Create Date: 2026-10-16 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7d3a1f58e20'
+down_revision: Union[str, Sequence[str], None] = 'b41c7e9f2d13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_INDEXES = (
+    ('ix_resume_versions_resume_original_created', 'resume_versions', ['resume_id', 'is_original', 'created_at']),
+    ('ix_cover_letter_versions_letter_original_created', 'cover_letter_versions', ['cover_letter_id', 'is_original', 'created_at']),
+    ('ix_cover_letters_user_created', 'cover_letters', ['user_id', 'created_at']),
+)
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside the migration transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns in _INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(_INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
@@ -0,0 +1,37 @@
+"""Drop length limits on cover letter name, title and version columns
+
+Revision ID: d5a8e2c49b71
+Revises: c7d3a1f58e20
+Create Date: 2026-10-16 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5a8e2c49b71'
+down_revision: Union[str, Sequence[str], None] = 'c7d3a1f58e20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_COLUMNS = (
+    ('cover_letter_templates', 'name', 255),
+    ('cover_letters', 'title', 255),
+    ('cover_letter_versions', 'version', 50),
+)
+
+
+def upgrade() -> None:
+    # Widening VARCHAR(n) to VARCHAR is binary-coercible on Postgres: no table or index rewrite
+    for table, column, length in _COLUMNS:
+        op.alter_column(table, column, existing_type=sa.String(length=length),
+                        type_=sa.String(), existing_nullable=False)
+
+
+def downgrade() -> None:
+    for table, column, length in reversed(_COLUMNS):
+        op.alter_column(table, column, existing_type=sa.String(),
+                        type_=sa.String(length=length), existing_nullable=False)
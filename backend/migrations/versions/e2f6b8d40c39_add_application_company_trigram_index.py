@@ -0,0 +1,38 @@
+"""Add a trigram index for substring company filters on applications
+
+Revision ID: e2f6b8d40c39
+Revises: d5a8e2c49b71
+Create Date: 2026-10-16 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2f6b8d40c39'
+down_revision: Union[str, Sequence[str], None] = 'd5a8e2c49b71'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    # CONCURRENTLY cannot run inside the migration transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_applications_company_trgm',
+            'applications',
+            ['company'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_ops={'company': 'gin_trgm_ops'},
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_applications_company_trgm', table_name='applications', postgresql_concurrently=True)
@@ -14,7 +14,7 @@ from pathlib import Path
 # This must be the very first thing to prevent database connection attempts
 os.environ['TESTING'] = '1'
 
-from app.core.database import Base, get_db, engine
+from app.core.database import Base, get_db, get_readonly_db, engine
 
 # Enable foreign keys for SQLite (when using test engine)
 @event.listens_for(engine, "connect")
@@ -80,6 +80,7 @@ def client(db: Session, tmp_path: Path, monkeypatch) -> Generator[TestClient, No
         return MockPDFService()
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_readonly_db] = override_get_db
     app.dependency_overrides[get_storage] = override_get_storage
     app.dependency_overrides[get_pdf_service] = override_get_pdf_service
 
@@ -161,6 +162,14 @@ def mock_ai_service(monkeypatch):
         mock_generate_cover_letter
     )
 
+    async def mock_agenerate_cover_letter(*args, **kwargs):
+        return "This is a mock AI-generated cover letter."
+
+    monkeypatch.setattr(
+        "app.services.ai_service.AIGeneratorClient.agenerate_cover_letter",
+        mock_agenerate_cover_letter
+    )
+
     def mock_rewrite_resume(*args, **kwargs):
         return "This is a mock AI-generated resume."
 
@@ -169,6 +178,14 @@ def mock_ai_service(monkeypatch):
         mock_rewrite_resume
     )
 
+    async def mock_arewrite_resume(*args, **kwargs):
+        return "This is a mock AI-generated resume."
+
+    monkeypatch.setattr(
+        "app.services.ai_service.AIGeneratorClient.arewrite_resume",
+        mock_arewrite_resume
+    )
+
 @pytest.fixture(autouse=True)
 def mock_redis(monkeypatch):
     """Replace redis client with a fake one."""
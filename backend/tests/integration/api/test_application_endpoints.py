@@ -1,6 +1,10 @@
+from unittest.mock import AsyncMock
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 from app.models.application import Application
+from app.models.cover_letter import CoverLetterVersion
+from app.models.resume import ResumeVersion
+from app.services.ai_service import AIGeneratorClient
 
 def test_create_application_with_valid_data(client: TestClient, auth_headers: dict, db: Session):
     # Create a resume to associate the application with
@@ -62,6 +66,118 @@ def test_get_applications_for_user(client: TestClient, auth_headers: dict, db: S
     assert data["applications"][0]["company"] == application_data["company"]
 
 
+def test_get_applications_with_cursor(client: TestClient, auth_headers: dict, db: Session):
+    response = client.post("/api/v1/resumes", headers=auth_headers, json={"title": "CV", "markdown": "content"})
+    resume = response.json()
+    dates = ["2024-01-03", "2024-01-02", "2024-01-02", None]
+    for i, applied_date in enumerate(dates):
+        response = client.post("/api/v1/applications", headers=auth_headers, json={
+            "resume_id": resume["id"],
+            "resume_version_id": resume["versions"][0]["id"],
+            "company": f"Company {i}",
+            "position": "Engineer",
+            "applied_date": applied_date,
+        })
+        assert response.status_code == 201
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"per_page": 2, **({"cursor": cursor} if cursor else {})}
+        data = client.get("/api/v1/applications", headers=auth_headers, params=params).json()
+        assert data["total"] == 4
+        seen.extend(app["id"] for app in data["applications"])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+
+    assert len(seen) == len(set(seen)) == 4
+    first_page = client.get("/api/v1/applications", headers=auth_headers, params={"per_page": 4}).json()
+    assert [app["id"] for app in first_page["applications"]] == seen
+
+
+def test_get_applications_rejects_bad_cursor(client: TestClient, auth_headers: dict, db: Session):
+    response = client.get("/api/v1/applications", headers=auth_headers, params={"cursor": "not-a-cursor"})
+    assert response.status_code == 422
+
+
+def test_search_applications_embeds_cover_letter_version(client: TestClient, auth_headers: dict, db: Session):
+    resume = client.post("/api/v1/resumes", headers=auth_headers, json={
+        "title": "My First Resume",
+        "markdown": "This is the content of my first resume.",
+    }).json()
+    cover_letter = client.post("/api/v1/cover-letters", headers=auth_headers, json={
+        "title": "My First Cover Letter",
+        "content": "This is the content of my first cover letter.",
+    }).json()
+    for company in ("Acme One", "Acme Two"):
+        response = client.post("/api/v1/applications", headers=auth_headers, json={
+            "resume_id": resume["id"],
+            "resume_version_id": resume["versions"][0]["id"],
+            "cover_letter_id": cover_letter["id"],
+            "cover_letter_version_id": cover_letter["versions"][0]["id"],
+            "company": company,
+            "position": "Test Position",
+            "status": "Applied",
+        })
+        assert response.status_code == 201
+    db.expire_all()
+
+    response = client.get("/api/v1/applications/search?q=Acme", headers=auth_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 2
+    for application in data["applications"]:
+        assert application["cover_letter_version"]["markdown_content"] == cover_letter["versions"][0]["markdown_content"]
+
+
+def test_create_application_customizes_with_ai(client: TestClient, auth_headers: dict, db: Session,
+                                               mock_ai_service, monkeypatch):
+    # Wrap the mocked async AI calls so the test can see they were awaited
+    arewrite_resume = AsyncMock(side_effect=AIGeneratorClient.arewrite_resume)
+    agenerate_cover_letter = AsyncMock(side_effect=AIGeneratorClient.agenerate_cover_letter)
+    monkeypatch.setattr(AIGeneratorClient, "arewrite_resume", arewrite_resume)
+    monkeypatch.setattr(AIGeneratorClient, "agenerate_cover_letter", agenerate_cover_letter)
+    resume = client.post("/api/v1/resumes", headers=auth_headers, json={
+        "title": "My First Resume",
+        "markdown": "This is the content of my first resume.",
+    }).json()
+    cover_letter = client.post("/api/v1/cover-letters", headers=auth_headers, json={
+        "title": "My First Cover Letter",
+        "content": "This is the content of my first cover letter.",
+    }).json()
+
+    application_data = {
+        "resume_id": resume["id"],
+        "resume_version_id": resume["versions"][0]["id"],
+        "cover_letter_id": cover_letter["id"],
+        "company": "Acme",
+        "position": "Test Position",
+        "job_description": "Build things.",
+        "customize_with_ai": True,
+    }
+    response = client.post("/api/v1/applications", headers=auth_headers, json=application_data)
+
+    assert response.status_code == 201
+    arewrite_resume.assert_awaited_once()
+    agenerate_cover_letter.assert_awaited_once()
+    application = db.get(Application, response.json()["id"])
+    resume_version = db.get(ResumeVersion, application.customized_resume_version_id)
+    assert resume_version.version.endswith(" - Acme")
+    assert resume_version.markdown_content == "This is a mock AI-generated resume."
+    cover_letter_version = db.get(CoverLetterVersion, application.cover_letter_version_id)
+    assert cover_letter_version.version == "v2 - Acme"
+    assert cover_letter_version.markdown_content == "This is a mock AI-generated cover letter."
+
+    # A second application for the same company reuses both versions without calling the AI
+    response = client.post("/api/v1/applications", headers=auth_headers, json=application_data)
+    assert response.status_code == 201
+    assert response.json()["customized_resume_version_id"] == resume_version.id
+    assert response.json()["cover_letter_version_id"] == cover_letter_version.id
+    arewrite_resume.assert_awaited_once()
+    agenerate_cover_letter.assert_awaited_once()
+
+
 def test_get_application_by_id(client: TestClient, auth_headers: dict, db: Session):
     # Create a resume and an application
     resume_data = {
@@ -233,6 +349,8 @@ def test_get_application_stats(client: TestClient, auth_headers: dict, db: Sessi
     data = response.json()
     assert data["total"] == 1
     assert data["applied"] == 1
+    assert data["interviewing"] == 0
+    assert data["offers"] == 0
 
 
 def test_get_status_options(client: TestClient, auth_headers: dict):
@@ -1,6 +1,9 @@
+import time
+import jwt
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 from app.models.user import User
+from app.config.settings import settings
 import pytest
 
 def test_register_user(client: TestClient, db: Session, sample_user_data):
@@ -53,4 +56,29 @@ def test_logout(client: TestClient, authenticated_user):
 
     # Verify the token is no longer valid by accessing a protected route
     profile_response = client.get("/api/v1/users/me", headers=headers)
-    assert profile_response.status_code == 401
\ No newline at end of file
+    assert profile_response.status_code == 401
+
+
+def test_logout_token_without_jti(client: TestClient, authenticated_user):
+    # Access tokens issued before jti claims existed are still accepted until they expire
+    now = int(time.time())
+    legacy_token = jwt.encode(
+        {"sub": str(authenticated_user["user_id"]), "exp": now + 600, "iat": now, "type": "access"},
+        settings.jwt_secret,
+        algorithm=settings.jwt_algorithm,
+    )
+    headers = {"Authorization": f"Bearer {legacy_token}"}
+    assert client.get("/api/v1/users/me", headers=headers).status_code == 200
+
+    response = client.post("/api/v1/auth/logout", headers=headers)
+    assert response.status_code == 204
+    assert client.get("/api/v1/users/me", headers=headers).status_code == 401
+
+
+def test_login_malformed_password(client: TestClient, db: Session, sample_user_data):
+    client.post("/api/v1/auth/register", json=sample_user_data)
+    response = client.post(
+        "/api/v1/auth/login",
+        json={"email": sample_user_data["email"], "password": "x" * 1000},
+    )
+    assert response.status_code == 401
@@ -1,3 +1,4 @@
+import json
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
@@ -55,6 +56,34 @@ def test_get_all_cover_letters(client: TestClient, authenticated_user: dict, ses
     data = response.json()
     assert len(data) == 3
 
+def test_list_cover_letters_one_row_per_cover_letter(client: TestClient, auth_headers: dict, db: Session):
+    """
+    GIVEN: A cover letter with more than one original version
+    WHEN:  GET /api/v1/cover-letters is called
+    THEN:  The cover letter is listed once, labelled with its newest version
+    """
+    # Arrange
+    cover_letter = client.post("/api/v1/cover-letters", headers=auth_headers, json={
+        "title": "My First Cover Letter",
+        "content": "This is the content of my first cover letter.",
+    }).json()
+    response = client.post(f"/api/v1/cover-letters/{cover_letter['id']}/versions", headers=auth_headers, json={
+        "content": "A second take on my cover letter.",
+    })
+    assert response.status_code == 201
+    second_version = response.json()["version"]
+
+    # Act
+    response = client.get("/api/v1/cover-letters", headers=auth_headers)
+
+    # Assert
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data) == 1
+    assert data[0]["id"] == cover_letter["id"]
+    assert data[0]["user_id"] == cover_letter["user_id"]
+    assert data[0]["version"] == second_version
+
 def test_get_cover_letter_by_id(client: TestClient, authenticated_user: dict, session: Session):
     """
     GIVEN: An authenticated user and a cover letter ID
@@ -386,4 +415,92 @@ def test_download_cover_letter_version_as_pdf(client: TestClient, authenticated_
     assert response.status_code == 200
     assert response.headers["content-type"] == "application/pdf"
     assert response.headers["content-disposition"].startswith("attachment; filename=")
-    assert response.content == b"mock pdf content"
\ No newline at end of file
+    assert response.content == b"mock pdf content"
+
+def test_list_templates_not_modified(client: TestClient, db: Session):
+    """
+    GIVEN: A client that already fetched the template list
+    WHEN:  GET /api/v1/cover-letters/templates is repeated with If-None-Match
+    THEN:  A 304 Not Modified should be returned without a body
+    """
+    # Arrange
+    first = client.get("/api/v1/cover-letters/templates")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+
+    # Act
+    response = client.get("/api/v1/cover-letters/templates", headers={"If-None-Match": etag})
+
+    # Assert
+    assert response.status_code == 304
+    assert response.content == b""
+
+def test_generate_cover_letter_stream(client: TestClient, authenticated_user: dict, session: Session, monkeypatch):
+    """
+    GIVEN: An authenticated user with a resume and an AI service that streams text
+    WHEN:  POST /api/v1/cover-letters/generate/stream is called
+    THEN:  Text chunks should be streamed as SSE events, then the saved cover letter
+    """
+    # Arrange
+    def mock_stream_cover_letter(*args, **kwargs):
+        yield "Dear hiring team, "
+        yield "I am interested."
+
+    monkeypatch.setattr(
+        "app.services.ai_service.AIGeneratorClient.stream_cover_letter",
+        mock_stream_cover_letter
+    )
+    resume_response = client.post("/api/v1/resumes", headers=authenticated_user["headers"], json={
+        "title": "Streaming Resume",
+        "markdown": "Resume content.",
+    })
+    assert resume_response.status_code == 201
+    generate_data = {
+        "resume_id": resume_response.json()["id"],
+        "job_description": "A job description",
+        "company": "A company",
+        "position": "A position",
+        "title": "My Streamed Cover Letter"
+    }
+
+    # Act
+    response = client.post("/api/v1/cover-letters/generate/stream", headers=authenticated_user["headers"], json=generate_data)
+
+    # Assert
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [frame.split("\n", 1) for frame in response.text.strip().split("\n\n")]
+    assert [name for name, _ in events] == ["event: chunk", "event: chunk", "event: done"]
+    done = json.loads(events[-1][1][len("data: "):])
+    assert done["title"] == generate_data["title"]
+    assert done["versions"][0]["markdown_content"] == "Dear hiring team, I am interested."
+    assert session.query(CoverLetter).filter(CoverLetter.id == done["id"]).first() is not None
+
+def test_list_templates_served_from_cache(client: TestClient, db: Session, monkeypatch):
+    """
+    GIVEN: A template list that has already been served once
+    WHEN:  GET /api/v1/cover-letters/templates is repeated without If-None-Match
+    THEN:  The same body should be returned without querying the templates again
+    """
+    # Arrange
+    from app.models.cover_letter import CoverLetterTemplate
+    from app.services.cover_letter_service import CoverLetterService, invalidate_templates_etag
+    invalidate_templates_etag()
+    db.add(CoverLetterTemplate(name="Formal", content_template="Dear {company}"))
+    db.commit()
+    first = client.get("/api/v1/cover-letters/templates")
+    assert first.status_code == 200
+    assert first.json()[0]["name"] == "Formal"
+
+    # Act
+    def fail_list_templates(*args, **kwargs):
+        raise AssertionError("templates should come from the cache")
+
+    monkeypatch.setattr(CoverLetterService, "list_templates", fail_list_templates)
+    response = client.get("/api/v1/cover-letters/templates")
+    invalidate_templates_etag()
+
+    # Assert
+    assert response.status_code == 200
+    assert response.content == first.content
+    assert response.headers["etag"] == first.headers["etag"]
@@ -290,4 +290,25 @@ def test_download_resume_pdf(client: TestClient, auth_headers: dict, db: Session
     response = client.get(f"/api/v1/resumes/{resume_id}/download", headers=auth_headers)
     assert response.status_code == 200
     assert response.headers["content-type"] == "application/pdf"
-    assert response.content == b"mock pdf content"
\ No newline at end of file
+    assert response.content == b"mock pdf content"
+
+
+def test_preview_resume_pdf_with_query_token(client: TestClient, authenticated_user: dict):
+    # Create a resume
+    resume_data = {
+        "title": "My Previewable Resume",
+        "markdown": "This is the content of my previewable resume.",
+    }
+    response = client.post("/api/v1/resumes", headers=authenticated_user["headers"], json=resume_data)
+    assert response.status_code == 201
+    resume_id = response.json()["id"]
+
+    # Preview the resume with the token in the query string, as the browser viewer does
+    response = client.get(f"/api/v1/resumes/{resume_id}/preview", params={"token": authenticated_user["token"]})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/pdf"
+    assert response.content == b"mock pdf content"
+
+    # Without any credentials the preview is rejected
+    response = client.get(f"/api/v1/resumes/{resume_id}/preview")
+    assert response.status_code == 401
@@ -0,0 +1,42 @@
+import pytest
+from fastapi.testclient import TestClient
+
+# Mark all tests in this module as integration tests
+pytestmark = pytest.mark.integration
+
+def test_get_user_stats(client: TestClient, authenticated_user: dict):
+    # Create a resume
+    response = client.post("/api/v1/resumes", headers=authenticated_user["headers"], json={
+        "title": "Stats Resume",
+        "markdown": "Content.",
+    })
+    assert response.status_code == 201
+
+    # Get the stats
+    response = client.get("/api/v1/users/stats", headers=authenticated_user["headers"])
+    assert response.status_code == 200
+    data = response.json()
+    assert data["user_id"] == authenticated_user["user_id"]
+    assert data["resumes"] == 1
+    assert data["applications"] == {
+        "total": 0,
+        "applied": 0,
+        "interviewing": 0,
+        "rejected": 0,
+        "offers": 0
+    }
+
+
+def test_update_current_user(client: TestClient, authenticated_user: dict):
+    response = client.put("/api/v1/users/me", headers=authenticated_user["headers"], json={
+        "username": "renamed_user",
+    })
+    assert response.status_code == 200
+    data = response.json()
+    assert data["id"] == authenticated_user["user_id"]
+    assert data["username"] == "renamed_user"
+    assert "hashed_password" not in data
+
+    response = client.get("/api/v1/users/me", headers=authenticated_user["headers"])
+    assert response.status_code == 200
+    assert response.json()["username"] == "renamed_user"
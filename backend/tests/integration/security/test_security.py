@@ -25,3 +25,35 @@ def test_xss_prevention_on_create_resume(client: TestClient, auth_headers: dict)
     assert data["title"] == "<script>alert('XSS')</script>"
 
 
+
+def test_security_headers_on_response(client: TestClient):
+    response = client.get("/health")
+    assert response.headers["x-content-type-options"] == "nosniff"
+    assert response.headers["x-frame-options"] == "DENY"
+    assert response.headers["strict-transport-security"].startswith("max-age=")
+
+def test_health_probe_skips_rate_limiting(client: TestClient, monkeypatch):
+    from app.core.middleware import SecurityMiddleware
+    async def deny(self, request, client_ip):
+        return False
+    monkeypatch.setattr(SecurityMiddleware, "_check_rate_limits", deny)
+    assert client.get("/health").status_code == 200
+    assert client.get("/api/v1/users/me").status_code == 429
+
+def test_denied_request_spends_no_tier_quota(client: TestClient, monkeypatch):
+    import fakeredis
+    from app.core.middleware import rate_limit_settings
+    from app.core.security import RateLimiter, rate_limiter
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(rate_limit_settings, "is_development", False)
+    monkeypatch.setattr(rate_limit_settings, "write_requests_per_minute", 1)
+    monkeypatch.setattr(rate_limiter, "async_redis", fakeredis.aioredis.FakeRedis(server=server))
+    monkeypatch.setattr(rate_limiter, "backoff", RateLimiter().backoff)
+    login = {"email": "nobody@example.com", "password": "password"}
+
+    client.post("/api/v1/auth/login", json=login)
+    assert client.post("/api/v1/auth/login", json=login).status_code == 429
+    assert client.post("/api/v1/auth/login", json=login).status_code == 429
+
+    # Only the first request got past the write limit and counted against the auth tier
+    assert fakeredis.FakeRedis(server=server).get("auth:testclient") == b"1"
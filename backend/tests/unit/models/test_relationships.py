@@ -0,0 +1,43 @@
+import pytest
+from sqlalchemy.exc import InvalidRequestError
+from app.models.user import User
+from app.models.resume import Resume, ResumeVersion
+
+
+def test_application_collections_must_be_loaded_explicitly(db):
+    user = User(username="owner", email="owner@example.com", hashed_password="x")
+    resume = Resume(user=user, title="CV")
+    version = ResumeVersion(resume=resume, version="v1", markdown_content="# CV")
+    db.add_all([user, resume, version])
+    db.commit()
+    db.expire_all()
+
+    with pytest.raises(InvalidRequestError):
+        db.get(Resume, resume.id).applications
+    with pytest.raises(InvalidRequestError):
+        db.get(ResumeVersion, version.id).applications
+
+
+def test_deleting_resume_removes_versions_in_database(db):
+    user = User(username="owner", email="owner@example.com", hashed_password="x")
+    resume = Resume(user=user, title="CV", versions=[ResumeVersion(version="v1", markdown_content="# CV")])
+    db.add_all([user, resume])
+    db.commit()
+    db.expire_all()
+
+    db.delete(db.get(Resume, resume.id))
+    db.commit()
+    assert db.query(ResumeVersion).count() == 0
+
+
+def test_onupdate_timestamp_is_returned_by_the_update(db):
+    user = User(username="owner", email="owner@example.com", hashed_password="x")
+    resume = Resume(user=user, title="CV")
+    db.add_all([user, resume])
+    db.flush()
+
+    resume.title = "Updated CV"
+    db.flush()
+
+    # Populated from UPDATE ... RETURNING, so reading it needs no follow-up SELECT
+    assert "updated_at" in resume.__dict__
@@ -1,5 +1,5 @@
 import pytest
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 from app.services.ai_service import AIGeneratorClient
 
 @pytest.fixture
@@ -43,3 +43,35 @@ def test_generate_cover_letter(groq_client_mock):
     # Assert
     groq_client_mock.chat.completions.create.assert_called_once()
     assert result == "Generated cover letter"
+
+@pytest.mark.asyncio
+async def test_arewrite_resume(groq_client_mock):
+    # Arrange
+    with patch('app.services.ai_service.AsyncGroq') as mock_async_groq:
+        async_client = MagicMock()
+        mock_response = MagicMock()
+        mock_response.choices[0].message.content = " Rewritten resume "
+        async_client.chat.completions.create = AsyncMock(return_value=mock_response)
+        mock_async_groq.return_value = async_client
+        client = AIGeneratorClient()
+
+        # Act
+        result = await client.arewrite_resume("## Experience", "Software Engineer", "Keep it short")
+
+    # Assert
+    async_client.chat.completions.create.assert_awaited_once()
+    assert "Keep it short" in async_client.chat.completions.create.call_args.kwargs["messages"][1]["content"]
+    groq_client_mock.chat.completions.create.assert_not_called()
+    assert result == "Rewritten resume"
+
+def test_clients_share_pooled_http_client():
+    # Arrange
+    from app.services.ai_service import get_http_client
+    with patch('app.services.ai_service.Groq') as mock_groq:
+        # Act
+        AIGeneratorClient()
+        AIGeneratorClient()
+
+    # Assert
+    pooled = get_http_client()
+    assert [call.kwargs["http_client"] for call in mock_groq.call_args_list] == [pooled, pooled]
@@ -1,6 +1,10 @@
+import hashlib
+import time
 import pytest
-from datetime import timedelta
-from app.core.security import AuthService
+from datetime import datetime, timedelta
+import fakeredis
+from app.core import security
+from app.core.security import AuthService, FileValidator, RateLimiter, TokenBlacklist
 from app.config.settings import settings
 
 def test_hash_and_verify_password():
@@ -27,6 +31,18 @@ def test_token_expiry():
     payload = AuthService.verify_token(token)
     assert payload is None
 
+def test_access_token_timestamps_are_integers():
+    token = AuthService.create_access_token({"sub": "123"}, expires_delta=timedelta(minutes=5))
+    payload = AuthService.verify_token(token)
+    assert isinstance(payload["iat"], int)
+    assert payload["exp"] - payload["iat"] == 300
+
+def test_blacklist_accepts_exp_claim():
+    client = fakeredis.FakeRedis()
+    blacklist = TokenBlacklist(client)
+    blacklist.add_jti("claim", int(time.time()) + 60)
+    assert 0 < client.ttl("blacklisted_jti:claim") <= 60
+
 def test_create_and_verify_refresh_token():
     data = {"sub": "123", "username": "testuser"}
     token, _ = AuthService.create_refresh_token(data)
@@ -50,4 +66,221 @@ def test_revoke_token():
 
     # Finally, verify the token is no longer valid
     payload = AuthService.verify_token(token)
-    assert payload is None
\ No newline at end of file
+    assert payload is None
+
+def test_revoke_token_by_jti():
+    data = {"sub": "123"}
+    token = AuthService.create_access_token(data)
+    payload = AuthService.verify_token(token)
+    assert payload is not None
+
+    AuthService.revoke_token_by_jti(payload["jti"], payload["exp"])
+
+    assert AuthService.verify_token(token) is None
+
+
+def test_is_password_well_formed():
+    assert AuthService.is_password_well_formed("password")
+    assert not AuthService.is_password_well_formed("")
+    assert not AuthService.is_password_well_formed("pass\x00word")
+    assert not AuthService.is_password_well_formed("x" * (AuthService.MAX_PASSWORD_LENGTH + 1))
+
+def test_rate_limiter_is_allowed_many():
+    limiter = RateLimiter(redis_client=fakeredis.FakeRedis())
+    checks = [("read:1.2.3.4", 2, 60), ("ai:1.2.3.4", 1, 3600)]
+    assert limiter.is_allowed_many(checks) == [True, True]
+    assert limiter.is_allowed_many(checks) == [True, False]
+    assert limiter.is_allowed_many(checks) == [False, False]
+    assert 0 < limiter.redis.ttl("ai:1.2.3.4") <= 3600
+
+@pytest.mark.asyncio
+async def test_rate_limiter_ais_allowed_many():
+    limiter = RateLimiter(redis_client=None, async_redis_client=fakeredis.aioredis.FakeRedis())
+    checks = [("read:1.2.3.4", 1, 60)]
+    assert await limiter.ais_allowed_many(checks) == [True]
+    assert await limiter.ais_allowed_many(checks) == [False]
+    assert 0 < await limiter.async_redis.ttl("read:1.2.3.4") <= 60
+
+@pytest.mark.asyncio
+async def test_async_redis_shares_the_connection_budget(monkeypatch):
+    def blocking_get_redis():
+        raise AssertionError("get_async_redis must not ping synchronously")
+
+    monkeypatch.setattr(security, "get_redis", blocking_get_redis)
+    monkeypatch.setattr(security, "_async_redis_client", None)
+    client = security.get_async_redis()
+    assert security.get_async_redis() is client
+    async_max = client.connection_pool.max_connections
+    assert async_max + security.redis_pool.max_connections <= settings.redis_max_connections
+
+    await security.close_async_redis()
+    assert security._async_redis_client is None
+
+def test_rate_limiter_is_allowed_single_bucket():
+    limiter = RateLimiter(redis_client=fakeredis.FakeRedis())
+    assert limiter.is_allowed("auth:1.2.3.4", 2, 60)
+    assert limiter.is_allowed("auth:1.2.3.4", 2, 60)
+    assert not limiter.is_allowed("auth:1.2.3.4", 2, 60)
+    assert limiter.get_remaining("auth:1.2.3.4", 2) == 0
+
+def test_are_jtis_blacklisted_batches_and_caches():
+    fake_redis = fakeredis.FakeRedis()
+    blacklist = TokenBlacklist(redis_client=fake_redis)
+    fake_redis.setex("blacklisted_jti:revoked", 60, "1")
+
+    assert blacklist.are_jtis_blacklisted(["revoked", "valid"]) == [True, False]
+
+    # Revocations are answered from the local cache without another Redis lookup
+    fake_redis.flushall()
+    assert blacklist.are_jtis_blacklisted(["revoked", "valid"]) == [True, False]
+
+    # Negative answers are not cached, so a revocation from another worker is seen at once
+    fake_redis.setex("blacklisted_jti:valid", 60, "1")
+    assert blacklist.are_jtis_blacklisted(["revoked", "valid"]) == [True, True]
+
+    blacklist.add_jti("valid", datetime.utcnow() + timedelta(minutes=5))
+    assert blacklist.is_jti_blacklisted("valid")
+
+def test_is_blacklisted_checks_new_and_legacy_keys():
+    fake_redis = fakeredis.FakeRedis()
+    blacklist = TokenBlacklist(redis_client=fake_redis)
+    expires_at = datetime.utcnow() + timedelta(minutes=5)
+
+    blacklist.add_token("new-token", expires_at)
+    assert blacklist.is_blacklisted("new-token")
+    assert all(key.startswith(b"bl2:") for key in fake_redis.keys())
+
+    fake_redis.setex(f"blacklisted_token:{hashlib.sha256(b'old-token').hexdigest()}", 60, "1")
+    assert blacklist.is_blacklisted("old-token")
+    assert not blacklist.is_blacklisted("other-token")
+
+def test_validate_file_content_accepts_bytes_and_text():
+    assert FileValidator.validate_file_content(b"# Resume\n<SCRIPT>", "resume.md")
+    assert FileValidator.validate_file_content("# Résumé", "resume.md")
+    with pytest.raises(ValueError):
+        FileValidator.validate_file_content(b"x" * (FileValidator.MAX_FILE_SIZE + 1), "resume.md")
+    with pytest.raises(ValueError):
+        FileValidator.validate_file_content("é" * (FileValidator.MAX_FILE_SIZE // 2 + 1), "resume.md")
+    with pytest.raises(ValueError):
+        FileValidator.validate_file_content(b"  \n", "resume.md")
+
+def test_verify_token_decodes_once_per_request(monkeypatch):
+    token = AuthService.create_access_token({"sub": "123"})
+    decode_calls = []
+    real_decode = security.jwt.decode
+    monkeypatch.setattr(security.jwt, "decode", lambda *a, **kw: decode_calls.append(1) or real_decode(*a, **kw))
+
+    memo = security.begin_token_cache()
+    try:
+        assert AuthService.verify_token(token)["sub"] == "123"
+        assert AuthService.verify_token(token)["sub"] == "123"
+        assert AuthService.verify_token(token, token_type="refresh") is None
+    finally:
+        security.end_token_cache(memo)
+
+    assert len(decode_calls) == 1
+
+def test_legacy_bcrypt_hash_verifies_and_needs_rehash():
+    legacy_hash = security.legacy_pwd_context.hash("secure_password", scheme="bcrypt")
+    assert AuthService.verify_password("secure_password", legacy_hash)
+    assert not AuthService.verify_password("wrong_password", legacy_hash)
+    assert AuthService.password_needs_rehash(legacy_hash)
+    assert not AuthService.password_needs_rehash(AuthService.hash_password("secure_password"))
+
+
+def test_audit_formatter_emits_json():
+    import json
+    import logging
+    record = logging.LogRecord("security_audit", logging.INFO, __file__, 1, "File upload", None, None)
+    record.audit = {"event": "file_upload", "filename": "cv.pdf", "size": 10}
+    event = json.loads(security.AuditJsonFormatter().format(record))
+    assert event["message"] == "File upload"
+    assert event["filename"] == "cv.pdf"
+    assert "timestamp" in event
+
+
+def test_sanitize_markdown():
+    assert FileValidator.sanitize_markdown("# Title\n\nPlain text") == "# Title\n\nPlain text"
+    dirty = '<SCRIPT>alert(1)</script><a href="JavaScript:alert(1)" onclick="x">a</a>'
+    assert FileValidator.sanitize_markdown(dirty) == '<a href="">a</a>'
+    assert FileValidator.sanitize_markdown("java<script></script>script:x") == ""
+
+
+def test_rate_limiter_backs_off_while_redis_is_down():
+    class DownRedis:
+        calls = 0
+        def pipeline(self, transaction=True):
+            DownRedis.calls += 1
+            raise ConnectionError("redis down")
+
+    limiter = RateLimiter(DownRedis())
+    assert limiter.is_allowed("k", 1)
+    assert limiter.is_allowed("k", 1)
+    assert DownRedis.calls == 1
+
+    limiter.backoff._down_until = 0.0
+    assert limiter.is_allowed("k", 1)
+    assert DownRedis.calls == 2
+    assert limiter.backoff._delay == 1.0
+
+
+def test_revocation_is_written_while_backing_off():
+    fake_redis = fakeredis.FakeRedis()
+    blacklist = TokenBlacklist(redis_client=fake_redis)
+    blacklist.backoff.failed("Token blacklist check error", ConnectionError("redis down"))
+    assert not blacklist.backoff.available()
+
+    blacklist.add_jti("during-outage", int(time.time()) + 60)
+    blacklist.add_token("token-during-outage", int(time.time()) + 60)
+    assert fake_redis.exists("blacklisted_jti:during-outage")
+    assert TokenBlacklist(redis_client=fake_redis).is_blacklisted("token-during-outage")
+    assert blacklist.backoff._delay == 0.0
+
+
+def test_revocation_feed_filters_lookups():
+    server = fakeredis.FakeServer()
+    revoked_before = TokenBlacklist(fakeredis.FakeRedis(server=server))
+    revoked_before.add_jti("old", int(time.time()) + 60)
+
+    blacklist = TokenBlacklist(fakeredis.FakeRedis(server=server), local_cache_ttl=0)
+    blacklist.start_revocation_feed()
+    try:
+        deadline = time.monotonic() + 5
+        while blacklist._jti_filter is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert "old" in blacklist._jti_filter
+        assert blacklist.is_jti_blacklisted("old")
+        assert not blacklist.is_jti_blacklisted("fresh")
+
+        TokenBlacklist(fakeredis.FakeRedis(server=server)).add_jti("fresh", int(time.time()) + 60)
+        while "fresh" not in blacklist._jti_filter and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert blacklist.is_jti_blacklisted("fresh")
+    finally:
+        blacklist.stop_revocation_feed()
+    assert blacklist._jti_filter is None
+
+
+def test_get_redis_waits_before_pinging_again(monkeypatch):
+    pings = []
+    def failing_ping(self):
+        pings.append(1)
+        raise ConnectionError("down")
+    monkeypatch.setattr(security.redis.Redis, "ping", failing_ping)
+    monkeypatch.setattr(security, "_redis_client", None)
+    monkeypatch.setattr(security, "_redis_resolved", False)
+    assert security.get_redis() is None
+    assert security.get_redis() is None
+    assert len(pings) == 1
+    assert RateLimiter().redis is None
+
+
+def test_audit_queue_drops_when_full():
+    import logging
+    from app.core.security import DroppingQueueHandler
+    handler = DroppingQueueHandler(capacity=1)
+    record = logging.LogRecord("security_audit", logging.INFO, __file__, 1, "File upload", None, None)
+    handler.handle(record)
+    handler.handle(record)
+    assert handler.queue.qsize() == 1
+    assert handler.dropped == 1
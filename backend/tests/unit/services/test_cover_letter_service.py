@@ -1,7 +1,7 @@
 import pytest
 from unittest.mock import MagicMock, patch
-from app.services.cover_letter_service import CoverLetterService
-from app.models.cover_letter import CoverLetter, CoverLetterVersion
+from app.services.cover_letter_service import CoverLetterService, invalidate_templates_etag
+from app.models.cover_letter import CoverLetter, CoverLetterVersion, CoverLetterTemplate
 from app.core.exceptions import CoverLetterNotFoundError
 
 @pytest.fixture
@@ -41,7 +41,7 @@ def test_get_cover_letter_found(db_session_mock, storage_service_mock):
     cover_letter_id = 1
     expected_cover_letter = CoverLetter(id=cover_letter_id, user_id=user_id, title="Test")
     
-    db_session_mock.query.return_value.filter.return_value.first.return_value = expected_cover_letter
+    db_session_mock.execute.return_value.scalars.return_value.first.return_value = expected_cover_letter
 
     # Act
     result = service.get_cover_letter(user_id, cover_letter_id)
@@ -55,7 +55,7 @@ def test_get_cover_letter_not_found(db_session_mock, storage_service_mock):
     user_id = 1
     cover_letter_id = 1
     
-    db_session_mock.query.return_value.filter.return_value.first.return_value = None
+    db_session_mock.execute.return_value.scalars.return_value.first.return_value = None
 
     # Act & Assert
     with pytest.raises(CoverLetterNotFoundError):
@@ -96,3 +96,94 @@ def test_update_cover_letter(db_session_mock, storage_service_mock):
     db_session_mock.commit.assert_called()
     db_session_mock.refresh.assert_called_with(cover_letter)
     assert result.title == title
+
+def test_list_user_cover_letters_summary(db_session_mock, storage_service_mock):
+    # Arrange
+    service = CoverLetterService(db=db_session_mock, storage_service=storage_service_mock)
+    user_id = 1
+    rows = [(1, 1, "Test 1", False, "v1", None, None)]
+    db_session_mock.query.return_value.filter.return_value.order_by.return_value.all.return_value = rows
+
+    # Act
+    result = service.list_user_cover_letters_summary(user_id)
+
+    # Assert
+    assert result == rows
+
+def test_get_cover_letter_with_versions_not_found(db_session_mock, storage_service_mock):
+    # Arrange
+    service = CoverLetterService(db=db_session_mock, storage_service=storage_service_mock)
+    db_session_mock.query.return_value.options.return_value.filter.return_value.first.return_value = None
+
+    # Act & Assert
+    with pytest.raises(CoverLetterNotFoundError):
+        service.get_cover_letter_with_versions(1, 1)
+
+def test_get_template_cached(db_session_mock, storage_service_mock):
+    # Arrange
+    invalidate_templates_etag()
+    service = CoverLetterService(db=db_session_mock, storage_service=storage_service_mock)
+    template = CoverLetterTemplate(id=1, name="Formal", content_template="Dear {company}")
+    db_session_mock.query.return_value.filter.return_value.first.return_value = template
+
+    # Act
+    first = service.get_template(1)
+    second = service.get_template(1)
+
+    # Assert
+    assert first is second is template
+    db_session_mock.query.assert_called_once()
+    db_session_mock.expunge.assert_called_once_with(template)
+    invalidate_templates_etag()
+
+def test_templates_etag_refresh_drops_stale_templates(db_session_mock, storage_service_mock, monkeypatch):
+    # Arrange
+    import app.services.cover_letter_service as cls_module
+    invalidate_templates_etag()
+    service = CoverLetterService(db=db_session_mock, storage_service=storage_service_mock)
+    template = CoverLetterTemplate(id=1, name="Formal", content_template="Dear {company}")
+    db_session_mock.query.return_value.filter.return_value.first.return_value = template
+    rows = db_session_mock.query.return_value.order_by.return_value
+    rows.all.return_value = [(1, "2024-01-01")]
+    first_etag = service.get_templates_etag()
+    service.get_template(1)
+
+    # Act
+    rows.all.return_value = [(1, "2024-02-01")]
+    unchanged_etag = service.get_templates_etag()
+    monkeypatch.setattr(cls_module, "_templates_etag_checked_at", 0.0)
+    monkeypatch.setattr(cls_module, "_TEMPLATES_ETAG_TTL", -1)
+    refreshed_etag = service.get_templates_etag()
+
+    # Assert
+    assert unchanged_etag == first_etag
+    assert refreshed_etag != first_etag
+    assert 1 not in cls_module._template_cache
+    invalidate_templates_etag()
+
+def test_delete_cover_letter_not_found(db_session_mock, storage_service_mock):
+    # Arrange
+    service = CoverLetterService(db=db_session_mock, storage_service=storage_service_mock)
+    db_session_mock.execute.return_value.first.return_value = None
+    db_session_mock.execute.return_value.scalar.return_value = None
+
+    # Act & Assert
+    with pytest.raises(CoverLetterNotFoundError):
+        service.delete_cover_letter(1, 1)
+    db_session_mock.commit.assert_not_called()
+
+def test_list_templates_windowed_total(db_session_mock, storage_service_mock):
+    # Arrange
+    service = CoverLetterService(db=db_session_mock, storage_service=storage_service_mock)
+    template = CoverLetterTemplate(id=1, name="Formal", content_template="Dear {company}")
+    row = MagicMock(total=3)
+    row.__iter__.return_value = iter((template, 3))
+    db_session_mock.query.return_value.order_by.return_value.offset.return_value.limit.return_value.all.return_value = [row]
+
+    # Act
+    templates, total = service.list_templates(skip=0, limit=1)
+
+    # Assert
+    assert templates == [template]
+    assert total == 3
+    db_session_mock.query.assert_called_once()
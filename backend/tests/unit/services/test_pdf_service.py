@@ -42,3 +42,52 @@ def test_generate_cover_letter_pdf(weasyprint_renderer_mock, storage_service_moc
     # Assert
     weasyprint_renderer_mock.render_from_html.assert_called_once()
     assert result == b"cover_letter_pdf_content"
+
+def test_render_resume_pdf_cached_renders_once():
+    # Arrange
+    from app.services.pdf_service import PDFCache, render_resume_pdf_cached
+    pdf_service_mock = MagicMock()
+    pdf_service_mock.generate_resume_pdf.return_value = b"resume_pdf_content"
+
+    with patch('app.services.pdf_service.pdf_cache', PDFCache(redis_client=None)):
+        # Act
+        first = render_resume_pdf_cached(pdf_service_mock, "## Test", "modern")
+        second = render_resume_pdf_cached(pdf_service_mock, "## Test", "modern")
+
+    # Assert
+    assert first == second == b"resume_pdf_content"
+    pdf_service_mock.generate_resume_pdf.assert_called_once_with("## Test", "modern")
+
+def test_pdf_cache_falls_back_to_memory_while_redis_backs_off():
+    # Arrange
+    from app.services.pdf_service import PDFCache
+    redis_mock = MagicMock()
+    redis_mock.setex.side_effect = ConnectionError("redis down")
+    cache = PDFCache(redis_client=redis_mock)
+
+    # Act
+    cache.set("pdf:key", b"resume_pdf_content")
+    cached = cache.get("pdf:key")
+
+    # Assert
+    assert cached == b"resume_pdf_content"
+    redis_mock.setex.assert_called_once()
+    redis_mock.get.assert_not_called()
+
+def test_pdf_cache_key_follows_template_html():
+    # Arrange
+    from app.services.pdf_service import PDFCache
+    from app.services.html_renderer_service import HTMLRenderer
+    renderer = HTMLRenderer()
+
+    # Act
+    with patch('app.services.pdf_service.html_renderer', renderer), \
+         patch.object(renderer, '_load_template', return_value="<html>v1</html>"):
+        before = PDFCache.make_key("## Test", "modern")
+    renderer._template_digests.clear()
+    with patch('app.services.pdf_service.html_renderer', renderer), \
+         patch.object(renderer, '_load_template', return_value="<html>v2</html>"):
+        after = PDFCache.make_key("## Test", "modern")
+
+    # Assert
+    assert before != after
@@ -0,0 +1,128 @@
+import fakeredis
+from unittest.mock import MagicMock
+from app.models.user import User
+from app.services.user_service import UserService, UserCache
+from app.schemas.user import UserUpdate
+
+def test_user_cache_round_trip():
+    # Arrange
+    cache = UserCache("user:stats", 60, redis_client=fakeredis.FakeRedis())
+
+    # Act
+    cache.set(1, b'{"id": 1}')
+
+    # Assert
+    assert cache.get(1) == b'{"id": 1}'
+    cache.invalidate(1)
+    assert cache.get(1) is None
+
+def test_user_cache_without_redis():
+    # Arrange
+    cache = UserCache("user:stats", 60, redis_client=None)
+
+    # Act
+    cache.set(1, b'{"id": 1}')
+
+    # Assert
+    assert cache.get(1) is None
+
+def test_update_user_invalidates_stats_cache(monkeypatch):
+    # Arrange
+    cache = UserCache("user:stats", 60, redis_client=fakeredis.FakeRedis())
+    monkeypatch.setattr("app.services.user_service.user_stats_cache", cache)
+    cache.set(1, b'{"username": "old"}')
+    db_session_mock = MagicMock()
+    user = User(id=1, username="old", email="old@example.com")
+    db_session_mock.get.return_value = user
+    db_session_mock.query.return_value.filter.return_value.first.return_value = None
+    service = UserService(db=db_session_mock)
+
+    # Act
+    service.update_user(1, UserUpdate(username="new"))
+
+    # Assert
+    assert user.username == "new"
+    assert cache.get(1) is None
+
+def test_get_user_stats_single_query():
+    # Arrange
+    db_session_mock = MagicMock()
+    row = MagicMock()
+    row._mapping = {"resumes": 2, "total": 3, "applied": 1, "interviewing": 1, "rejected": 0, "offer": 1, "withdrawn": 0, "recent_month": 1}
+    db_session_mock.execute.return_value.one.return_value = row
+    service = UserService(db=db_session_mock)
+
+    # Act
+    stats = service.get_user_stats(1)
+
+    # Assert
+    assert stats == row._mapping
+    db_session_mock.execute.assert_called_once()
+    db_session_mock.query.assert_not_called()
+
+def test_get_user_by_id_uses_identity_map():
+    # Arrange
+    db_session_mock = MagicMock()
+    user = User(id=1, username="user", email="user@example.com")
+    db_session_mock.get.return_value = user
+    service = UserService(db=db_session_mock)
+
+    # Act
+    result = service.get_user_by_id(1)
+
+    # Assert
+    assert result is user
+    db_session_mock.get.assert_called_once_with(User, 1)
+    db_session_mock.query.assert_not_called()
+
+def test_authenticate_user_upgrades_legacy_hash():
+    # Arrange
+    from app.core.security import AuthService, legacy_pwd_context
+    db_session_mock = MagicMock()
+    user = User(id=1, username="user", email="user@example.com", is_active=True,
+                hashed_password=legacy_pwd_context.hash("secure_password", scheme="bcrypt"))
+    db_session_mock.query.return_value.filter.return_value.first.return_value = user
+    service = UserService(db=db_session_mock)
+
+    # Act
+    result = service.authenticate_user("user@example.com", "secure_password")
+
+    # Assert
+    assert result is user
+    assert user.hashed_password.startswith("$argon2")
+    assert AuthService.verify_password("secure_password", user.hashed_password)
+    db_session_mock.commit.assert_called_once()
+
+def test_user_cache_backs_off_while_redis_is_down():
+    # Arrange
+    redis_mock = MagicMock()
+    redis_mock.get.side_effect = ConnectionError("redis down")
+    cache = UserCache("user:stats", 60, redis_client=redis_mock)
+
+    # Act
+    first = cache.get(1)
+    second = cache.get(1)
+    cache.set(1, b'{"id": 1}')
+    cache.invalidate(1)
+
+    # Assert
+    assert first is None and second is None
+    redis_mock.get.assert_called_once()
+    redis_mock.setex.assert_not_called()
+    redis_mock.delete.assert_called_once_with("user:stats:1")
+
+def test_user_service_closes_only_the_session_it_opened(monkeypatch):
+    # Arrange
+    opened = MagicMock()
+    monkeypatch.setattr("app.core.database.SessionLocal", lambda: opened)
+    injected = MagicMock()
+
+    # Act
+    with UserService() as service:
+        assert service._get_db() is service._get_db() is opened
+    with UserService(db=injected) as service:
+        service._get_db()
+
+    # Assert
+    opened.close.assert_called_once()
+    injected.close.assert_not_called()